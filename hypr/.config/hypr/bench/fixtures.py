@@ -0,0 +1,216 @@
+# Fake environment for the benchmarks: stub hyprctl/playerctl executables,
+# a synthetic /sys/class/drm tree and an in-process Hyprland command socket.
+# Everything lives under one temporary directory.
+
+import os
+import json
+import socket
+import struct
+import threading
+
+MONITORS = [
+    # (connector, mode, refresh, scale, serial)
+    ("eDP-1", (2880, 1800), 90.0, 2.0, None),
+    ("DP-3", (2560, 1440), 143.9, 1.25, "3CQ1170C5P"),
+    ("HDMI-A-1", (3840, 2160), 60.0, 1.5, "V3K0N1234"),
+]
+
+PLAYERS = [
+    # (player, status, title)
+    ("spotify", "playing", "Song"),
+    ("firefox", "paused", "Video"),
+]
+
+# Every line starts with the parent's pid, so a benchmark can tell its own
+# spawns (which it counts itself) from those of the processes it started
+STUB = """#!/bin/sh
+echo "$PPID $0 $*" >> "{log}"
+{body}
+"""
+
+HYPRCTL_BODY = """case "$*" in
+  "-j monitors"*|"monitors -j"*) cat "{monitors}" ;;
+  "-j workspaces"*|"workspaces -j"*) cat "{workspaces}" ;;
+  *) echo ok ;;
+esac
+"""
+
+PLAYERCTL_BODY = """case "$*" in
+  *--follow*) cat "{metadata}"; exec sleep 3600 ;;
+  *metadata*) cat "{metadata}" ;;
+esac
+"""
+
+def descriptor(tag, text):
+    # 18-byte display descriptor holding a 13-byte string
+    payload = text.encode("ascii")[:13]
+    if len(payload) < 13:
+        payload += b"\n" + b" " * (12 - len(payload))
+    return b"\0\0\0" + bytes([tag, 0]) + payload
+
+def detailed_timing(width, height, refresh):
+    # Simple CVT-ish blanking; enough for the decoder to recover the mode.
+    # The pixel clock field tops out at 655.35 MHz
+    h_blank, v_blank = 160, 60
+    clock = round((width + h_blank) * (height + v_blank) * refresh / 10000)
+    return struct.pack(
+        "<HBBBBBB", clock, width & 0xFF, h_blank & 0xFF, ((width >> 8) << 4) | (h_blank >> 8),
+        height & 0xFF, v_blank & 0xFF, ((height >> 8) << 4) | (v_blank >> 8),
+    ) + bytes(10)
+
+def checksummed(block):
+    return block[:127] + bytes([(-sum(block[:127])) % 256])
+
+def make_edid(width, height, refresh, serial=None, model="BENCH", manufacturer="BNC", product=1):
+    # EDID 1.4 base block plus a CTA-861 and a DisplayID extension
+    mfg = sum((ord(c) - ord("A") + 1) << shift for c, shift in zip(manufacturer, (10, 5, 0)))
+    base = bytearray(128)
+    base[0:8] = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+    base[8:10] = struct.pack(">H", mfg)
+    base[10:16] = struct.pack("<HI", product, product * 7919)
+    base[18:20] = bytes([1, 4])
+    base[21:23] = bytes([60, 34])
+    base[38:54] = bytes([0x01, 0x01] * 8)
+    descriptors = [detailed_timing(width, height, refresh), descriptor(0xFC, model)]
+    descriptors.append(descriptor(0xFF, serial) if serial else descriptor(0xFE, "no serial"))
+    descriptors.append(descriptor(0x10, ""))
+    base[54:126] = b"".join(descriptors)
+    base[126] = 2
+
+    cta = bytearray(128)
+    cta[0:4] = bytes([0x02, 3, 0, 0])
+    blocks = bytes([0x40 | 4, 0x90, 16, 4, 97])  # video: native 1080p60, 720p, 2160p60
+    blocks += bytes([0x60 | 3, 0x03, 0x0C, 0x00])  # HDMI vendor block
+    blocks += bytes([0xE0 | 6, 6, 0x0D, 1, 0x5A, 0x48, 0x10])  # HDR static metadata
+    cta[4:4 + len(blocks)] = blocks
+    cta[2] = 4 + len(blocks)
+    cta[cta[2]:cta[2] + 18] = detailed_timing(1920, 1080, 60)
+
+    displayid = bytearray(128)
+    displayid[0:5] = bytes([0x70, 0x12, 23, 0, 0])
+    h_blank, v_blank = 160, 60
+    clock = (width + h_blank) * (height + v_blank) * refresh / 10000
+    timing = int(clock - 1).to_bytes(3, "little") + bytes([0x80])
+    timing += struct.pack("<HHHH", width - 1, h_blank - 1, 47, 31)
+    timing += struct.pack("<HHHH", height - 1, v_blank - 1, 2, 4)
+    displayid[5:8] = bytes([0x03, 0, 20])
+    displayid[8:28] = timing
+
+    return b"".join(checksummed(bytes(b)) for b in (base, cta, displayid))
+
+def hyprctl_monitors():
+    monitors = []
+    x = 0
+    for i, (name, (width, height), refresh, scale, serial) in enumerate(MONITORS):
+        monitors.append({
+            "id": i, "name": name, "description": f"Bench {name}", "make": "Bench", "model": name,
+            "serial": serial or "", "width": width, "height": height, "refreshRate": refresh,
+            "x": x, "y": 0, "scale": scale, "transform": 0, "focused": i == 0, "disabled": False,
+            "activeWorkspace": {"id": i + 1, "name": str(i + 1)},
+            "availableModes": [f"{width}x{height}@{refresh:.2f}Hz"],
+        })
+        x += round(width / scale)
+    return monitors
+
+def hyprctl_workspaces():
+    # Every monitor's block of ten half populated, plus a stray workspace on
+    # the wrong monitor and a special one
+    workspaces = []
+    for i, (name, *_) in enumerate(MONITORS):
+        for n in range(i * 10 + 1, i * 10 + 6):
+            workspaces.append({"id": n, "name": str(n), "monitor": name, "monitorID": i, "windows": 1})
+    workspaces.append({"id": 16, "name": "16", "monitor": MONITORS[0][0], "monitorID": 0, "windows": 2})
+    workspaces.append({"id": -98, "name": "special:scratch", "monitor": MONITORS[0][0], "monitorID": 0, "windows": 1})
+    return workspaces
+
+def write_sysfs(root, extra_connectors=0):
+    # card1-<connector>/edid for every monitor, plus empty (disconnected) ones
+    drm = os.path.join(root, "drm")
+    for name, (width, height), refresh, _, serial in MONITORS:
+        os.makedirs(os.path.join(drm, f"card1-{name}"), exist_ok=True)
+        with open(os.path.join(drm, f"card1-{name}", "edid"), "wb") as f:
+            f.write(make_edid(width, height, refresh, serial, model=name))
+    for i in range(extra_connectors):
+        os.makedirs(os.path.join(drm, f"card1-DP-{10 + i}"), exist_ok=True)
+        open(os.path.join(drm, f"card1-DP-{10 + i}", "edid"), "wb").close()
+    os.makedirs(os.path.join(drm, "card1"), exist_ok=True)
+    return drm
+
+def write_stubs(root):
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    log = os.path.join(root, "spawns.log")
+
+    monitors = os.path.join(root, "monitors.json")
+    with open(monitors, "w") as f:
+        json.dump(hyprctl_monitors(), f)
+
+    workspaces = os.path.join(root, "workspaces.json")
+    with open(workspaces, "w") as f:
+        json.dump(hyprctl_workspaces(), f)
+
+    metadata = os.path.join(root, "metadata.txt")
+    with open(metadata, "w") as f:
+        for player, status, title in PLAYERS:
+            fields = [player, status, "200000000", "1000000", "Artist", title, "Album",
+                      f"file://{os.path.join(root, 'cover.jpg')}"]
+            f.write("\x1f".join(fields) + "\n")
+
+    for name, body in (("hyprctl", HYPRCTL_BODY.format(monitors=monitors, workspaces=workspaces)),
+                       ("playerctl", PLAYERCTL_BODY.format(metadata=metadata))):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(STUB.format(log=log, body=body))
+        os.chmod(path, 0o755)
+    return bin_dir, log
+
+def write_cover(root):
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    path = os.path.join(root, "cover.jpg")
+    Image.new("RGB", (640, 640), (200, 80, 40)).save(path, quality=90)
+    return path
+
+def count_spawns(log, exclude_parent=None):
+    try:
+        with open(log) as f:
+            return sum(1 for line in f if line.split(" ", 1)[0] != str(exclude_parent))
+    except FileNotFoundError:
+        return 0
+
+class FakeHyprland:
+    # Serves j/monitors and j/workspaces and acknowledges everything else,
+    # like .socket.sock
+    def __init__(self, runtime_dir, signature="bench"):
+        self.dir = os.path.join(runtime_dir, "hypr", signature)
+        self.signature = signature
+        self.path = os.path.join(self.dir, ".socket.sock")
+        self.requests = []
+        self.replies = {
+            "j/monitors": json.dumps(hyprctl_monitors()).encode(),
+            "j/workspaces": json.dumps(hyprctl_workspaces()).encode(),
+        }
+
+    def start(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        self.sock.listen(16)
+        threading.Thread(target=self.serve, daemon=True).start()
+        return self
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                request = conn.recv(65536).decode()
+                self.requests.append(request)
+                conn.sendall(self.replies.get(request, b"ok"))
+
+    def stop(self):
+        self.sock.close()
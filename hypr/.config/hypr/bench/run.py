@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# End-to-end benchmarks for the music widget and hyprmoncon against fake
+# hyprctl/playerctl executables, a fake Hyprland socket and a synthetic
+# /sys/class/drm tree. For every scenario it reports wall time (median and
+# best of BENCH_RUNS), processes spawned per run (the audit hook counts this
+# process's own spawns, the stub binaries' log those of its children, so every
+# spawn is counted once) and peak Python allocations in this process.
+#
+#   run.py [--json] [FILTER...]    only scenarios whose name contains a FILTER
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HYPRMONCON = os.path.join(HERE, "..", "hyprmoncon", "src")
+MUSIC = os.path.join(HERE, "..", "music")
+sys.path[:0] = [HERE, HYPRMONCON, MUSIC]
+
+import fixtures
+
+RUNS = int(os.environ.get("BENCH_RUNS", 20))
+LAYOUT_COUNTS = [int(n) for n in os.environ.get("BENCH_LAYOUTS", "1,10,100,1000").split(",")]
+
+spawns = 0
+
+def audit(event, args):
+    # subprocess may spawn through os.posix_spawn, which raises its own event
+    # after subprocess.Popen's; os.exec replaces the process, spawning nothing
+    global spawns
+    if event in ("subprocess.Popen", "os.fork", "os.system"):
+        spawns += 1
+
+class Environment:
+    # Everything a scenario may touch, rooted in one temporary directory
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="hypr-bench-")
+        self.bin_dir, self.spawn_log = fixtures.write_stubs(self.root)
+        self.drm = fixtures.write_sysfs(self.root, extra_connectors=6)
+        fixtures.write_cover(self.root)
+        self.runtime = os.path.join(self.root, "run")
+        os.makedirs(self.runtime)
+        self.hyprland = fixtures.FakeHyprland(self.runtime).start()
+        self.server = None
+
+        os.environ.update({
+            "PATH": self.bin_dir + os.pathsep + os.environ.get("PATH", ""),
+            "XDG_RUNTIME_DIR": self.runtime,
+            "XDG_CACHE_HOME": os.path.join(self.root, "cache"),
+            "XDG_STATE_HOME": os.path.join(self.root, "state"),
+            "HYPRLAND_INSTANCE_SIGNATURE": self.hyprland.signature,
+            "MUSIC_BACKEND": "playerctl",
+            "MUSIC_SOCKET": os.path.join(self.runtime, "hypr-music.sock"),
+            "MUSIC_PROGRESS_INTERVAL": "0",
+            "MUSIC_POSITION_RESYNC": "0",
+        })
+
+    def without_socket(self):
+        # ipc falls back to hyprctl when there is no Hyprland instance
+        return SocketlessHyprland()
+
+    def start_widget_server(self):
+        if self.server is None:
+            self.server = subprocess.Popen(
+                [sys.executable, os.path.join(MUSIC, "widget.py"), "--serve"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, start_new_session=True,
+            )
+            import client
+            deadline = time.monotonic() + 5
+            while True:
+                try:
+                    client.connect(autostart=False).close()
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.02)
+
+    def close(self):
+        if self.server is not None:
+            # playerctl --follow runs in the server's session
+            os.killpg(self.server.pid, 15)
+            self.server.wait()
+        self.hyprland.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+class SocketlessHyprland:
+    def __enter__(self):
+        self.signature = os.environ.pop("HYPRLAND_INSTANCE_SIGNATURE")
+
+    def __exit__(self, *exc):
+        os.environ["HYPRLAND_INSTANCE_SIGNATURE"] = self.signature
+
+def measure(env, func, runs=RUNS):
+    func()  # warm-up: imports, caches, server state
+
+    times = []
+    pid = os.getpid()
+    spawns_before, logged_before = spawns, fixtures.count_spawns(env.spawn_log, pid)
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    spawned = spawns - spawns_before + fixtures.count_spawns(env.spawn_log, pid) - logged_before
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "spawns": spawned / runs,
+        "peak_kib": peak / 1024,
+    }
+
+def run_widget(*args):
+    return subprocess.run([sys.executable, os.path.join(MUSIC, *args[:1])] + list(args[1:]),
+                          capture_output=True, text=True, check=True).stdout
+
+def widget_scenarios(env):
+    from players import PlayerctlBackend
+    from registry import PlayerRegistry
+    from widget import render_modules
+    import client
+
+    backend = PlayerctlBackend()
+
+    async def poll():
+        registry = PlayerRegistry.from_env()
+        registry.load(await backend.snapshot())
+        return render_modules(registry.current())
+
+    def server_get():
+        with client.request("get text", autostart=False) as f:
+            return f.read()
+
+    env.start_widget_server()
+    return [
+        ("widget poll: in-process snapshot + render", lambda: asyncio.run(poll())),
+        ("widget poll: widget.py one-shot", lambda: run_widget("widget.py")),
+        ("widget poll: server get (socket)", server_get),
+        ("widget poll: client.py --once", lambda: run_widget("client.py", "text", "--once")),
+    ]
+
+def probe_scenarios(env):
+    import ipc
+
+    def via_hyprctl():
+        with env.without_socket():
+            return ipc.get_monitors()
+
+    return [
+        ("monitor probe: socket", ipc.get_monitors),
+        ("monitor probe: hyprctl fallback", via_hyprctl),
+    ]
+
+def edid_scenarios(env):
+    import edid
+
+    blob = fixtures.make_edid(3840, 2160, 60.0, "V3K0N1234")
+
+    def cold():
+        edid._decoded.clear()
+        return edid.decode_edid(blob)
+
+    return [
+        ("edid decode: cold (3 blocks)", cold),
+        ("edid decode: memoized", lambda: edid.decode_edid(blob)),
+        ("edid decode: monitor_id", lambda: edid.monitor_id(blob)),
+        ("edid decode: read_monitor_ids (sysfs)", lambda: edid.read_monitor_ids(env.drm)),
+        ("edid decode: read_monitor_edids (sysfs)", lambda: edid.read_monitor_edids(env.drm)),
+    ]
+
+def stored_layouts(count):
+    # count layouts of one to four monitors; the last one is the connected set,
+    # arranged right to left so applying it always changes every position
+    layouts = {}
+    for i in range(count - 1):
+        layouts[f"layout-{i}"] = [
+            {"name": f"DP-{j}", "monitor": f"ser:BENCH{i}-{j}", "width": 1920, "height": 1080,
+             "x": 1920 * j, "y": 0, "scale": 1, "transform": 0, "primary": j == 0}
+            for j in range(1 + i % 4)
+        ]
+    connected = []
+    x = 0
+    for name, (width, height), refresh, scale, serial in reversed(fixtures.MONITORS):
+        connected.append({"name": name, "monitor": None, "width": width, "height": height,
+                          "refresh_rate": refresh, "x": x, "y": 0, "scale": scale,
+                          "transform": 0, "primary": name == "eDP-1"})
+        x += round(width / scale)
+    layouts["connected"] = connected
+    return layouts
+
+def write_layouts(env, count):
+    import edid
+    from layouts import LayoutStore
+
+    layouts = stored_layouts(count)
+    ids = edid.read_monitor_ids(env.drm)
+    for entry in layouts["connected"]:
+        entry["monitor"] = ids[entry["name"]]
+    path = os.path.join(env.root, f"layouts-{count}", "layout.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    store = LayoutStore(path)
+    store.update(layouts)
+
+    # The same file without its sidecar index, as after a hand edit
+    plain = os.path.join(env.root, f"layouts-{count}-plain", "layout.json")
+    os.makedirs(os.path.dirname(plain), exist_ok=True)
+    shutil.copyfile(path, plain)
+    return path, plain, ids
+
+def matching_scenarios(env):
+    from layouts import LayoutStore, fingerprint
+
+    scenarios = []
+    for count in LAYOUT_COUNTS:
+        path, plain, ids = write_layouts(env, count)
+        connected = list(ids.values())
+        partial = connected[1:]
+        warm = LayoutStore(path).load()
+
+        def full_parse(path=plain, connected=connected):
+            # What matching costs without the store: parse everything, compare
+            with open(path) as f:
+                layouts = json.load(f)
+            wanted = fingerprint(connected)
+            for name, layout in layouts.items():
+                if fingerprint(m["monitor"] for m in layout) == wanted:
+                    return name
+
+        scenarios += [
+            (f"match {count:>4} layouts: cold load + match (sidecar)",
+             lambda path=path, c=connected: LayoutStore(path).load().best_match(c)),
+            (f"match {count:>4} layouts: cold load + match (no sidecar)",
+             lambda path=plain, c=connected: LayoutStore(path).load().best_match(c)),
+            (f"match {count:>4} layouts: json.load + scan", full_parse),
+            (f"match {count:>4} layouts: loaded store, exact",
+             lambda store=warm, c=connected: store.best_match(c)),
+            (f"match {count:>4} layouts: loaded store, partial",
+             lambda store=warm, c=partial: store.best_match(c, partial=True)),
+        ]
+    return scenarios
+
+def apply_scenarios(env):
+    from apply import apply_matching
+    from reconfigure import reconfigure
+    from layouts import LayoutStore
+    import edid
+
+    path, _, _ = write_layouts(env, 100)
+
+    def full_apply():
+        # Cold like a hotplug: read the store and sysfs, query, batch the rules
+        store = LayoutStore(path).load()
+        result = apply_matching(store, edid.read_monitor_ids(env.drm))
+        assert result is not None and result.applied
+        return result
+
+    def via_hyprctl():
+        with env.without_socket():
+            return full_apply()
+
+    def reload():
+        # hyprland.conf's exec on every config reload
+        store = LayoutStore(path).load()
+        result = reconfigure(store, edid.read_monitor_ids(env.drm), rules_path=os.devnull)
+        assert result.apply_result is not None and result.apply_result.applied
+        return result
+
+    def reload_via_hyprctl():
+        with env.without_socket():
+            return reload()
+
+    return [
+        ("full apply: socket", full_apply),
+        ("full apply: hyprctl fallback", via_hyprctl),
+        ("full apply: reconfigure pipeline", reload),
+        ("full apply: reconfigure via hyprctl", reload_via_hyprctl),
+    ]
+
+GROUPS = [widget_scenarios, probe_scenarios, edid_scenarios, matching_scenarios, apply_scenarios]
+
+def main(args):
+    as_json = "--json" in args
+    filters = [a for a in args if a != "--json"]
+
+    env = Environment()
+    sys.addaudithook(audit)
+    results = []
+    try:
+        for group in GROUPS:
+            for name, func in group(env):
+                if filters and not any(f in name for f in filters):
+                    continue
+                result = dict(name=name, **measure(env, func))
+                results.append(result)
+                if not as_json:
+                    print(f"{name:<52} {result['median_ms']:9.3f} {result['min_ms']:9.3f} "
+                          f"{result['spawns']:6.1f} {result['peak_kib']:9.1f}", flush=True)
+    finally:
+        env.close()
+
+    if as_json:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    if "--json" not in sys.argv[1:]:
+        print(f"{'scenario':<52} {'median':>9} {'min':>9} {'spawns':>6} {'peak KiB':>9}   (ms, per run)")
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Layout model operations on video-wall sized layouts
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from model import Layout, Output
+
+SIZES = [int(n) for n in os.environ.get("BENCH_SIZES", "16,100,400,1024").split(",")]
+
+def video_wall(count):
+    # Square-ish grid of 1080p panels, plus one overlapping output to find
+    columns = max(1, int(count ** 0.5))
+    entries = []
+    for i in range(count - 1):
+        entries.append({
+            "name": f"DP-{i}", "monitor": f"hsh:{i % 7:016x}",
+            "width": 1920, "height": 1080,
+            "x": 1920 * (i % columns) + 500, "y": 1080 * (i // columns) + 300,
+            "scale": 1, "transform": 0, "primary": i == 0,
+        })
+    entries.append({"name": "HDMI-A-1", "monitor": "ser:X", "width": 1920, "height": 1080, "x": 1000, "y": 800})
+    return entries
+
+def brute_overlaps(layout):
+    outputs = layout.outputs
+    return [(a.name, b.name) for i, a in enumerate(outputs) for b in outputs[i + 1:] if a.overlaps(b)]
+
+def best_of(func, runs=5):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bytes_per_output(count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    outputs = [Output(f"DP-{i}", "ser:X", 1920, 1080) for i in range(count)]
+    size = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    del outputs
+    return size
+
+if __name__ == "__main__":
+    print(f"{'outputs':>8} {'from_json':>10} {'to_json':>8} {'lookup':>8} {'bbox':>7} "
+          f"{'normalize':>9} {'adjacency':>9} {'overlaps':>8} {'brute':>8}   (ms, best of 5)")
+    for count in SIZES:
+        entries = video_wall(count)
+        layout = Layout.from_json(entries)
+        names = [e["name"] for e in entries]
+
+        # The sweep must agree with the pairwise check
+        assert sorted(map(sorted, layout.overlaps())) == sorted(map(sorted, brute_overlaps(layout)))
+
+        print(f"{count:>8} "
+              f"{best_of(lambda: Layout.from_json(entries)):>10.2f} "
+              f"{best_of(layout.to_json):>8.2f} "
+              f"{best_of(lambda: [layout.get(n) for n in names] and [layout.find('ser:X')]):>8.2f} "
+              f"{best_of(layout.bounding_box):>7.2f} "
+              f"{best_of(lambda: Layout.from_json(entries).normalize()):>9.2f} "
+              f"{best_of(layout.adjacency):>9.2f} "
+              f"{best_of(layout.overlaps):>8.2f} "
+              f"{best_of(lambda: brute_overlaps(layout), runs=1):>8.2f}")
+    print(f"\n{bytes_per_output(10000):.0f} bytes per Output")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# Constraint solver vs. brute-force placement on video walls
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from model import Layout, Output
+from solver import Constraint, solve, offset, infer_constraints
+
+SIZES = [int(n) for n in os.environ.get("BENCH_SIZES", "4,16,36,64,256,1024").split(",")]
+BRUTE_LIMIT = int(os.environ.get("BENCH_BRUTE_LIMIT", 64))
+
+def video_wall(count):
+    # Rows of panels chained left to right, each row hanging below the previous
+    # one; every other row is rotated, scaled panels to exercise logical sizes
+    columns = max(1, int(count ** 0.5))
+    layout = Layout()
+    for i in range(count):
+        rotated = i // columns % 2
+        layout.add(Output(f"DP-{i}", f"ser:{i}", 2560 if rotated else 1920, 1440 if rotated else 1080,
+                          scale=1.333333 if rotated else 1, transform=1 if rotated else 0, primary=i == 0))
+    constraints = []
+    for i in range(1, count):
+        if i % columns:
+            constraints.append(Constraint("left-of", f"DP-{i - 1}", f"DP-{i}"))
+        else:
+            constraints.append(Constraint("above", f"DP-{i - columns}", f"DP-{i}"))
+    return layout, constraints
+
+def brute_force(layout, constraints):
+    # Place outputs one at a time, trying every position next to what is placed
+    # already until one satisfies its constraints and overlaps nothing
+    sizes = {o.name: o.logical_size() for o in layout}
+    placed = {}
+    for output in layout:
+        w, h = sizes[output.name]
+        xs = sorted({0} | {x for x, _ in placed.values()} | {x + sizes[n][0] for n, (x, _) in placed.items()})
+        ys = sorted({0} | {y for _, y in placed.values()} | {y + sizes[n][1] for n, (_, y) in placed.items()})
+        for x in xs:
+            if output.name in placed:
+                break
+            for y in ys:
+                ok = True
+                for constraint in constraints:
+                    a, b, (dx, dy) = offset(constraint, sizes)
+                    if b == output.name and a in placed:
+                        ok = placed[a] == (x - dx, y - dy)
+                    elif a == output.name and b in placed:
+                        ok = placed[b] == (x + dx, y + dy)
+                    if not ok:
+                        break
+                if ok:
+                    for n, (px, py) in placed.items():
+                        if px < x + w and x < px + sizes[n][0] and py < y + h and y < py + sizes[n][1]:
+                            ok = False
+                            break
+                if ok:
+                    placed[output.name] = (x, y)
+                    break
+    return placed
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+if __name__ == "__main__":
+    print(f"{'outputs':>8} {'solve':>9} {'infer':>9} {'brute':>10}   (ms)")
+    for count in SIZES:
+        layout, constraints = video_wall(count)
+        _, solve_ms = timed(lambda: solve(layout, constraints))
+        solved = {o.name: (o.x, o.y) for o in layout}
+        _, infer_ms = timed(lambda: infer_constraints(layout))
+
+        brute = "-"
+        if count <= BRUTE_LIMIT:
+            placed, brute_ms = timed(lambda: brute_force(layout, constraints))
+            assert placed == solved, "brute force disagrees with the solver"
+            brute = f"{brute_ms:.2f}"
+        print(f"{count:>8} {solve_ms:>9.2f} {infer_ms:>9.2f} {brute:>10}")
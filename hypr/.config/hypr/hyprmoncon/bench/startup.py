@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Cold start of the headless CLI vs. the Tk editor's import path. Creating
+# the Tk window needs a display: $DISPLAY, else a private Xvfb if installed,
+# else that row is reported as skipped.
+
+import os
+import sys
+import time
+import shutil
+import statistics
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+RUNS = int(os.environ.get("BENCH_RUNS", 15))
+XVFB_DISPLAY = ":97"
+# Installed modules run from cached bytecode; without it every run would
+# time compiling them instead
+ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+HEADLESS = ["cli", "apply", "reconfigure", "history", "daemon", "solver"]
+GUI_IMPORTS = "import tkinter as tk, monitor, load, save, monitorSniffer"
+GUI_WINDOW = GUI_IMPORTS + "\ntk.Tk().destroy()"
+
+def cold(args, env=ENV):
+    times = []
+    subprocess.run([sys.executable] + args, cwd=SRC, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=SRC, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def start_xvfb():
+    # None when there is no X server to be had
+    if shutil.which("Xvfb") is None:
+        return None
+    server = subprocess.Popen(["Xvfb", XVFB_DISPLAY, "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    env = dict(ENV, DISPLAY=XVFB_DISPLAY)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        probe = subprocess.run([sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"],
+                               env=env, stderr=subprocess.DEVNULL)
+        if probe.returncode == 0:
+            return server
+        time.sleep(0.1)
+    server.terminate()
+    return None
+
+def row(label, ms):
+    print(f"{label:<28} {ms:7.1f} ms")
+
+if __name__ == "__main__":
+    sys.path.insert(0, SRC)
+    for name in HEADLESS:
+        __import__(name)
+    for gui in ("tkinter", "var", "projection"):
+        assert gui not in sys.modules, f"headless modules pulled in {gui}"
+
+    row("python -c pass", cold(["-c", "pass"]))
+    row("cli.py --help", cold(["cli.py", "--help"]))
+    row("cli.py list", cold(["cli.py", "list"]))
+    row("cli.py reconfigure imports", cold(["-c", "import cli, reconfigure"]))
+    row("editor imports", cold(["-c", GUI_IMPORTS]))
+
+    xvfb = None
+    env = ENV
+    if not os.environ.get("DISPLAY"):
+        xvfb = start_xvfb()
+        env = dict(ENV, DISPLAY=XVFB_DISPLAY)
+    try:
+        if os.environ.get("DISPLAY") or xvfb is not None:
+            row("editor imports + Tk window", cold(["-c", GUI_WINDOW], env))
+        else:
+            print(f"{'editor imports + Tk window':<28} skipped: no $DISPLAY and no Xvfb")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
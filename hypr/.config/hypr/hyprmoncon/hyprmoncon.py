@@ -26,32 +26,17 @@ snap_threshold = 15
 SCALE_FACTOR = 8  # Changed from 10 to make 1920 fit better
 
 def get_connected_monitors():
-    result = subprocess.run(["hyprctl", "monitors"], capture_output=True, text=True)
-    lines = result.stdout.splitlines()
+    result = subprocess.run(["hyprctl", "-j", "monitors"], capture_output=True, text=True)
     parsed_monitors = []
-    current = {}
-    
-    for line in lines:
-        if "Monitor" in line:
-            if current:
-                parsed_monitors.append(current)
-            current = {}
-            current["name"] = line.split("Monitor")[1].strip().split(" ")[0]
-        elif " at " in line:
-            parts = line.strip().split(" at ")
-            res_part = parts[0].split("@")[0]
-            pos_part = parts[1]
-            width, height = res_part.split("x")
-            x, y = pos_part.split("x")
-            current["width"] = int(width)
-            current["height"] = int(height)
-            current["x"] = int(x)
-            current["y"] = int(y)
-        elif "ID" in line:
-            current["serial"] = line.strip().split()[-1]
-    
-    if current:
-        parsed_monitors.append(current)
+    for m in json.loads(result.stdout or "[]"):
+        parsed_monitors.append({
+            "name": m["name"],
+            "serial": m.get("serial", ""),
+            "width": m["width"],
+            "height": m["height"],
+            "x": m["x"],
+            "y": m["y"],
+        })
     return parsed_monitors
 
 def create_monitor(canvas, info, index, loaded=False):
@@ -214,7 +199,6 @@ def load_layout():
     
     # Create new monitors from layout
     for index, m_info in enumerate(data["monitors"]):
-        print(m_info)
         create_monitor(canvas, m_info, index, True)
     
     status_label.config(text=f"Layout {layout_name}.json loaded")
@@ -1,9 +1,13 @@
 import tkinter as tk
 import var
-from load import load_layout
+import viewport
+from load import load_layout, show_layout
+from preview import LivePreview
 from save import save_layout
+from arrange import arrange_layout
 from monitorSniffer import get_connected_monitors
-from monitor import create_monitor
+from model import Layout
+from solver import solve, chain
 
 root = tk.Tk()
 root.title("Hyprland Monitor Layout Tool")
@@ -17,9 +21,60 @@ tk.Label(control_frame, text="Layout Name:").pack(side=tk.LEFT)
 name_entry = tk.Entry(control_frame, width=20)
 name_entry.pack(side=tk.LEFT, padx=5)
 
+def on_save():
+    layout_name = name_entry.get().strip()
+    if layout_name:
+        status_label.config(text=save_layout(layout_name))
+        # A saved layout is kept on screen; cancelling comes back to it
+        if var.preview is not None:
+            var.preview.commit()
+
+def on_load():
+    layout_name = name_entry.get().strip()
+    if layout_name:
+        status_label.config(text=load_layout(canvas, layout_name))
+        if var.preview is not None:
+            var.preview.changed()
+
+def on_arrange():
+    status_label.config(text=arrange_layout(canvas))
+    if var.preview is not None:
+        var.preview.changed()
+
+def on_preview():
+    if preview_enabled.get():
+        try:
+            var.preview = LivePreview(canvas)
+        except (OSError, ValueError) as e:
+            preview_enabled.set(False)
+            status_label.config(text=f"Live preview unavailable: {e}")
+            return
+        status_label.config(text="Live preview on: changes are applied while dragging, Esc reverts")
+    else:
+        var.preview.revert()
+        var.preview = None
+        status_label.config(text="Live preview off: configuration reverted")
+
+def on_cancel(event):
+    if var.preview is not None:
+        var.preview.cancel()
+        status_label.config(text="Edit cancelled: configuration reverted")
+
+def on_close():
+    # Don't leave an unsaved preview behind
+    if var.preview is not None:
+        var.preview.revert()
+    root.destroy()
+
 # Buttons
-tk.Button(control_frame, text="Save Layout", command=save_layout).pack(side=tk.LEFT, padx=5)
-tk.Button(control_frame, text="Load Layout", command=load_layout).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="Save Layout", command=on_save).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="Load Layout", command=on_load).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="Arrange", command=on_arrange).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="Fit", command=lambda: viewport.fit(canvas)).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="+", command=lambda: viewport.zoom(canvas, viewport.ZOOM_STEP)).pack(side=tk.LEFT)
+tk.Button(control_frame, text="−", command=lambda: viewport.zoom(canvas, 1 / viewport.ZOOM_STEP)).pack(side=tk.LEFT)
+preview_enabled = tk.BooleanVar(value=False)
+tk.Checkbutton(control_frame, text="Live preview", variable=preview_enabled, command=on_preview).pack(side=tk.LEFT, padx=5)
 
 # Status label
 status_label = tk.Label(root, text="", fg="blue")
@@ -54,12 +109,17 @@ hscroll.grid(row=1, column=0, sticky="ew")
 canvas_frame.grid_rowconfigure(0, weight=1)
 canvas_frame.grid_columnconfigure(0, weight=1)
 
-# Set canvas scroll region (adjust based on your monitor layout)
-canvas.config(scrollregion=(0, 0, var.canvas_width/var.SCALE_FACTOR, var.canvas_height/var.SCALE_FACTOR))
+# Ctrl+wheel or Ctrl +/- zooms, wheel/Shift+wheel or middle-drag pans, Ctrl+0 fits
+viewport.bind(canvas)
 
 # Initialize with connected monitors
-connected = get_connected_monitors()
-for index, info in enumerate(connected):
-    create_monitor(canvas, info, index)
+connected = Layout.from_json(get_connected_monitors())
+if connected.outputs:
+    # Side by side in connector order, first one primary
+    connected.outputs[0].primary = True
+    solve(connected, chain([o.name for o in connected]))
+show_layout(canvas, connected.to_json())
 
+root.bind("<Escape>", on_cancel)
+root.protocol("WM_DELETE_WINDOW", on_close)
 root.mainloop()
\ No newline at end of file
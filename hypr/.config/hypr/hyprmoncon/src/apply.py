@@ -0,0 +1,142 @@
+import time
+
+import ipc
+import tracing
+from edid import read_monitor_ids, read_monitor_edids
+from model import Layout
+
+REFRESH_TOLERANCE = 0.5
+SCALE_TOLERANCE = 0.01
+
+def format_number(value):
+    return f"{round(float(value), 3):g}"
+
+def refresh_for(output, current):
+    # Layouts saved before refresh rates were recorded keep the live rate when
+    # the resolution is unchanged; otherwise Hyprland picks the mode itself
+    if output.refresh_rate:
+        return output.refresh_rate
+    if current and (current.width, current.height) == (output.width, output.height):
+        return current.refresh_rate
+    return None
+
+def monitor_rule(output, refresh):
+    mode = f"{output.width}x{output.height}"
+    if refresh:
+        mode += f"@{format_number(refresh)}"
+    rule = f"{output.name},{mode},{output.x}x{output.y},{format_number(output.scale)}"
+    return rule + f",transform,{output.transform}"
+
+def needs_update(output, refresh, current):
+    if current is None or current.disabled:
+        return True
+    return (
+        (current.width, current.height) != (output.width, output.height)
+        or (current.x, current.y) != (output.x, output.y)
+        or abs(current.scale - output.scale) > SCALE_TOLERANCE
+        or current.transform != output.transform
+        or (refresh is not None and abs(current.refresh_rate - refresh) > REFRESH_TOLERANCE)
+    )
+
+class ApplyResult:
+    def __init__(self, layout_name, layout, before):
+        self.layout_name = layout_name
+        self.layout = layout
+        # Live monitors (ipc.MonitorInfo) as they were before applying
+        self.before = before
+        self.applied = False
+        # No saved layout matched; the layout was built by auto_align
+        self.auto_aligned = False
+        # Everything sent (or, on a dry run, that would be) in the one batch
+        self.commands = []
+        self.dry_run = False
+        # Batched requests sent: 1, or 0 when nothing changed or on a dry run
+        self.requests = 0
+        # (monitor name, "changed"/"unchanged", rule, planning ms)
+        self.monitors = []
+        self.request_ms = 0.0
+        self.total_ms = 0.0
+
+    def sent(self):
+        if self.dry_run:
+            return "dry run"
+        if not self.requests:
+            return "0 requests"
+        return f"{self.requests} request in {self.request_ms:.1f} ms"
+
+    @property
+    def changed(self):
+        return [name for name, action, _, _ in self.monitors if action == "changed"]
+
+    def report(self):
+        if self.auto_aligned:
+            header = "⚠️ No matching layout found, auto-aligned"
+        else:
+            header = f"✅ Loaded layout: {self.layout_name}"
+        lines = [f"{header} ({self.total_ms:.1f} ms, {len(self.changed)} changed, {self.sent()})"]
+        for name, action, rule, ms in self.monitors:
+            lines.append(f"  {name:<10} {action:<9} {ms:6.2f} ms  {rule}")
+        return "\n".join(lines)
+
+def apply_layout(layout_name, layout, current_monitors=None, dry_run=False, then=()):
+    # then: further compositor commands sent after the monitor rules in the same batch
+    start = time.perf_counter()
+    if current_monitors is None:
+        current_monitors = ipc.get_monitors()
+    current = {m.name: m for m in current_monitors}
+
+    result = ApplyResult(layout_name, layout, current_monitors)
+    result.dry_run = dry_run
+    commands = []
+    for output in Layout.from_json(layout):
+        t = time.perf_counter()
+        live = current.get(output.name)
+        refresh = refresh_for(output, live)
+        rule = monitor_rule(output, refresh)
+        # Only reconfigure outputs whose configuration actually differs
+        if needs_update(output, refresh, live):
+            commands.append(f"keyword monitor {rule}")
+            action = "changed"
+        else:
+            action = "unchanged"
+        result.monitors.append((output.name, action, rule, (time.perf_counter() - t) * 1000))
+
+    result.commands = commands + list(then)
+    if result.commands and not dry_run:
+        t = time.perf_counter()
+        with tracing.span("compositor.apply"):
+            ipc.batch(result.commands)
+        result.applied = bool(commands)
+        result.requests = 1
+        result.request_ms = (time.perf_counter() - t) * 1000
+
+    result.total_ms = (time.perf_counter() - start) * 1000
+    return result
+
+def auto_align(current_monitors=None, edids=None, dry_run=False, then=()):
+    # No saved layout fits: every enabled monitor at the native mode its EDID
+    # reports, side by side in connector order, and the displays woken up
+    from solver import solve, chain
+    if current_monitors is None:
+        current_monitors = ipc.get_monitors()
+    if edids is None:
+        edids = read_monitor_edids()
+    layout = Layout.from_monitors([m for m in current_monitors if not m.disabled], {})
+    for output in layout:
+        edid = edids.get(output.name)
+        mode = edid.native_mode if edid else None
+        if mode is not None and not mode.interlaced:
+            output.width, output.height, output.refresh_rate = mode.width, mode.height, mode.refresh
+    solve(layout, chain([o.name for o in layout]))
+    result = apply_layout("auto-aligned", layout.to_json(), current_monitors,
+                          dry_run=dry_run, then=["dispatch dpms on", *then])
+    result.auto_aligned = True
+    return result
+
+def apply_matching(store, monitor_ids=None, dry_run=False):
+    if monitor_ids is None:
+        monitor_ids = read_monitor_ids()
+    layout_name = store.best_match(monitor_ids.values())
+    if layout_name is None:
+        return None
+    return apply_layout(layout_name, store.get(layout_name), dry_run=dry_run)
@@ -0,0 +1,14 @@
+from load import show_layout
+from solver import solve, infer_constraints
+import var
+
+def arrange_layout(canvas):
+    # Close gaps and overlaps left by dragging, keeping each monitor's neighbours
+    try:
+        solve(var.layout, infer_constraints(var.layout))
+    except ValueError as e:
+        return f"Can't arrange layout: {e}"
+    
+    show_layout(canvas, var.layout.to_json())
+    
+    return "Layout arranged"
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# Headless front end for hyprmoncon; never imports tkinter. Every command
+# imports only what it uses, so keybound and scripted calls start fast.
+
+import sys
+import argparse
+
+import paths
+
+def resolve(store, name, monitor_ids, partial=False):
+    if name is None:
+        name = store.best_match(monitor_ids.values(), partial)
+        if name is None:
+            return None, None
+    return name, store.get(name)
+
+def cmd_list(store, args):
+    from edid import read_monitor_ids
+    matched = store.match(read_monitor_ids().values())
+    for name in store.names():
+        marker = "*" if name == matched else " "
+        print(f"{marker} {name} ({len(store.monitor_ids(name))} monitors)")
+    return 0
+
+def cmd_match(store, args):
+    from edid import read_monitor_ids
+    name = store.best_match(read_monitor_ids().values(), args.partial)
+    if name is None:
+        return 1
+    print(name)
+    return 0
+
+def record(result, monitor_ids, confirm=None):
+    # Remember what was replaced so it can be rolled back, optionally asking first
+    if not result.applied:
+        return 0
+    from history import History, confirm_or_revert
+    history = History()
+    entry = history.record(result, monitor_ids)
+    if confirm:
+        reverted = confirm_or_revert(history, entry, confirm)
+        if reverted is not None:
+            print(reverted.report())
+            return 1
+    return 0
+
+def cmd_apply(store, args):
+    from edid import read_monitor_ids
+    from apply import apply_layout, auto_align
+    monitor_ids = read_monitor_ids()
+    name, layout = resolve(store, args.name, monitor_ids, args.partial)
+    if layout is not None:
+        result = apply_layout(name, layout, dry_run=args.dry_run)
+    elif args.name:
+        print(f"❌ Layout {args.name} not found")
+        return 1
+    else:
+        result = auto_align(dry_run=args.dry_run)
+    print(result.report())
+    return record(result, monitor_ids, args.confirm)
+
+def cmd_reconfigure(store, args):
+    from edid import read_monitor_ids
+    from reconfigure import reconfigure
+    monitor_ids = read_monitor_ids()
+    result = reconfigure(store, monitor_ids, dry_run=args.dry_run)
+    print(result.report())
+    if args.dry_run:
+        for command in result.commands:
+            print(f"  {command}")
+    return record(result.apply_result, monitor_ids)
+
+def cmd_rollback(store, args):
+    from edid import read_monitor_ids
+    from apply import apply_layout
+    from history import History, rollback
+    monitor_ids = read_monitor_ids()
+    history = History()
+    try:
+        if args.good:
+            entry = history.last_good(monitor_ids)
+            if entry is None:
+                print("❌ No confirmed configuration for these monitors")
+                return 1
+            result = apply_layout(entry["layout"], entry["applied"], dry_run=args.dry_run)
+            print(result.report())
+            return record(result, monitor_ids)
+        result = rollback(history, monitor_ids, args.force, args.dry_run)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(result.report())
+    return 0
+
+def cmd_history(store, args):
+    from history import History, format_entry
+    for entry in reversed(History().entries()):
+        print(format_entry(entry))
+    return 0
+
+def cmd_save(store, args):
+    import ipc
+    from edid import read_monitor_ids
+    from model import Layout
+    layout = Layout.from_monitors(ipc.get_monitors(), read_monitor_ids()).to_json()
+    store.save(args.name, layout)
+    print(f"✅ Saved layout: {args.name} ({len(layout)} monitors)")
+    return 0
+
+def cmd_diff(store, args):
+    import ipc
+    from edid import read_monitor_ids
+    from apply import apply_layout
+    name, layout = resolve(store, args.name, read_monitor_ids(), args.partial)
+    if layout is None:
+        print(f"❌ Layout {args.name} not found" if args.name else "⚠️ No matching layout found")
+        return 1
+
+    current = ipc.get_monitors()
+    result = apply_layout(name, layout, current, dry_run=True)
+    live = {m.name: m for m in current}
+    print(f"Layout: {name}")
+    for monitor_name, action, rule, _ in result.monitors:
+        m = live.get(monitor_name)
+        if m is None:
+            print(f"+ {monitor_name:<10} {rule}  (not connected)")
+        elif action == "changed":
+            print(f"~ {monitor_name:<10} {rule}")
+            print(f"  {'':<10} was {m.width}x{m.height}@{m.refresh_rate:.2f},{m.x}x{m.y},"
+                  f"{m.scale:g},transform,{m.transform}")
+        else:
+            print(f"  {monitor_name:<10} {rule}")
+    saved = {entry["name"] for entry in layout}
+    for monitor_name in live:
+        if monitor_name not in saved:
+            print(f"- {monitor_name:<10} (not in layout)")
+    # Exit status like diff(1): 1 when applying would change something
+    return 1 if result.changed else 0
+
+def cmd_arrange(store, args):
+    from model import Layout
+    from solver import solve, parse_constraint, infer_constraints
+    if store.get(args.name) is None:
+        print(f"❌ Layout {args.name} not found")
+        return 1
+    layout = Layout.from_json(store.get(args.name))
+    try:
+        if args.constraints:
+            constraints = [parse_constraint(text) for text in args.constraints]
+        else:
+            constraints = infer_constraints(layout)
+        solve(layout, constraints)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for constraint in constraints:
+        print(f"  {constraint}")
+    for output in layout:
+        width, height = output.logical_size()
+        print(f"{output.name:<10} {width}x{height} at {output.x}x{output.y}")
+    if not args.dry_run:
+        store.save(args.name, layout.to_json())
+        print(f"✅ Saved layout: {args.name}")
+    return 0
+
+def cmd_stats(store, args):
+    import json
+    import tracing
+    # Reading the trace shouldn't add a record to it
+    tracing.enabled = False
+    path = args.file or tracing.TRACE_PATH
+    if not path or path == "-":
+        print("❌ No trace file: run with HYPR_TRACE=FILE or pass --file")
+        return 1
+    try:
+        summary = tracing.summarize(tracing.read_records(path))
+    except OSError as e:
+        print(f"❌ Failed to read trace: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    for tool, stats in sorted(summary.items()):
+        print(f"{tool} ({stats['records']} records)")
+        print(f"  {'span':<20} {'count':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for name, s in sorted(stats["spans"].items()):
+            p50 = "-" if s["p50_ms"] is None else f"{s['p50_ms']:.2f}"
+            p95 = "-" if s["p95_ms"] is None else f"{s['p95_ms']:.2f}"
+            print(f"  {name:<20} {s['count']:>7} {s['mean_ms']:>9.2f} {p50:>9} {p95:>9} {s['max_ms']:>9.2f}")
+        for name, value in sorted(stats["counters"].items()):
+            print(f"  {name:<20} {value:>7}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="hyprmoncon", description="Manage Hyprland monitor layouts")
+    parser.add_argument("--layouts", help=f"layout file (default: {paths.LAYOUT_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list saved layouts, * marks the one matching the connected monitors")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("match", help="print the layout matching the connected monitors")
+    p.add_argument("--partial", action="store_true", help="fall back to the closest partial match")
+    p.set_defaults(func=cmd_match)
+
+    p = sub.add_parser("apply", help="apply a layout, by default the matching one")
+    p.add_argument("name", nargs="?")
+    p.add_argument("--partial", action="store_true", help="fall back to the closest partial match")
+    p.add_argument("--dry-run", action="store_true", help="report the changes without applying them")
+    p.add_argument("--confirm", type=int, metavar="SECONDS",
+                   help="ask to keep the new configuration, reverting after SECONDS without a yes")
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser("reconfigure",
+                       help="apply the matching layout and put workspaces back on their monitors in one batch")
+    p.add_argument("--dry-run", action="store_true", help="print the commands without sending them")
+    p.set_defaults(func=cmd_reconfigure)
+
+    p = sub.add_parser("rollback", help="restore the configuration the last apply replaced")
+    p.add_argument("--good", action="store_true",
+                   help="apply the newest confirmed configuration for the connected monitors instead")
+    p.add_argument("--force", action="store_true", help="roll back even if different monitors are connected")
+    p.add_argument("--dry-run", action="store_true", help="report the changes without applying them")
+    p.set_defaults(func=cmd_rollback)
+
+    p = sub.add_parser("history", help="list applied configurations, newest first")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("save", help="save the live monitor configuration as a layout")
+    p.add_argument("name")
+    p.set_defaults(func=cmd_save)
+
+    p = sub.add_parser("diff", help="show what applying a layout would change")
+    p.add_argument("name", nargs="?")
+    p.add_argument("--partial", action="store_true", help="fall back to the closest partial match")
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser("arrange", help="reposition a layout's monitors without gaps or overlaps")
+    p.add_argument("name")
+    p.add_argument("constraints", nargs="*", metavar="CONSTRAINT",
+                   help="'A left-of|right-of B [top|bottom|center]' or 'A above|below B [left|right|center]'; "
+                        "inferred from the saved positions when omitted")
+    p.add_argument("--dry-run", action="store_true", help="print the result without saving it")
+    p.set_defaults(func=cmd_arrange)
+
+    p = sub.add_parser("stats", help="summarize the timings recorded with HYPR_TRACE=FILE")
+    p.add_argument("--file", help="trace file (default: $HYPR_TRACE)")
+    p.add_argument("--json", action="store_true", help="print the summary as JSON")
+    p.set_defaults(func=cmd_stats)
+    return parser
+
+# Commands that never read the layout file
+STORELESS = {cmd_history, cmd_stats}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.func in STORELESS:
+        return args.func(None, args)
+    from layouts import LayoutStore
+    store = LayoutStore(args.layouts) if args.layouts else LayoutStore()
+    try:
+        store.load()
+    except (OSError, ValueError) as e:
+        print(f"❌ Failed to read layouts: {e}")
+        return 1
+    return args.func(store, args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import socket
+import select
+
+import paths
+import ipc
+import tracing
+from edid import DRM_PATH, read_monitor_ids, read_monitor_edids
+from apply import apply_matching, auto_align
+from layouts import LayoutStore
+from history import History
+
+# A dock brings its outputs up within a few hundred ms; apply once after the burst
+DEBOUNCE = 0.2
+RECONNECT_DELAY = 1
+# Consecutive failed connects before giving up on the event socket
+MAX_RECONNECTS = 30
+HOTPLUG_EVENTS = {"monitoradded", "monitoraddedv2", "monitorremoved", "monitorremovedv2"}
+
+class Daemon:
+    def __init__(self, layout_path=paths.LAYOUT_PATH, drm_path=DRM_PATH, debounce=DEBOUNCE):
+        self.drm_path = drm_path
+        self.debounce = debounce
+        self.store = LayoutStore(layout_path)
+        self.history = History()
+
+    def apply(self):
+        try:
+            with tracing.span("apply"):
+                return self.apply_matching()
+        except (OSError, ValueError) as e:
+            # A compositor restarting mid-query; keep listening for the next event
+            print(f"Failed to apply layout: {e}", file=sys.stderr)
+            return None
+
+    def apply_matching(self):
+        try:
+            self.store.load()
+        except (OSError, ValueError) as e:
+            # Keep serving the last good index
+            print(f"Failed to read layouts: {e}", file=sys.stderr)
+
+        monitor_ids = read_monitor_ids(self.drm_path)
+        result = apply_matching(self.store, monitor_ids)
+        if result is None:
+            result = auto_align(edids=read_monitor_edids(self.drm_path))
+
+        print(result.report(), flush=True)
+        if result.applied:
+            try:
+                self.history.record(result, monitor_ids)
+            except OSError as e:
+                print(f"Failed to record history: {e}", file=sys.stderr)
+        return result
+
+    def handle_event(self, line):
+        event, _, _ = line.partition(">>")
+        return event in HOTPLUG_EVENTS
+
+    def listen(self, path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        buffer = b""
+        deadline = None
+        first_event = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                readable, _, _ = select.select([sock], [], [], timeout)
+                if not readable:
+                    deadline = None
+                    self.apply()
+                    # Hotplug-to-applied, debounce window included
+                    tracing.add("hotplug", (time.monotonic() - first_event) * 1000)
+                    tracing.dump()
+                    continue
+
+                chunk = sock.recv(4096)
+                if not chunk:
+                    return  # compositor went away
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if self.handle_event(line.decode(errors="replace")):
+                        # Every hotplug event pushes the apply back by the debounce window
+                        if deadline is None:
+                            first_event = time.monotonic()
+                        deadline = time.monotonic() + self.debounce
+        finally:
+            sock.close()
+
+    def run(self, path=None):
+        path = path or ipc.socket_path(".socket2.sock")
+        if path is None:
+            print("❌ Not running under Hyprland", file=sys.stderr)
+            sys.exit(1)
+
+        # No apply of its own at startup: hyprland.conf's exec runs
+        # `hyprmoncon.sh reconfigure` on every (re)load already
+        failures = 0
+        while True:
+            try:
+                self.listen(path)
+                failures = 0
+            except OSError as e:
+                failures += 1
+                print(f"Event socket error: {e}", file=sys.stderr)
+            # Hyprland removes its instance directory when it exits
+            if not os.path.isdir(os.path.dirname(path)):
+                print("Hyprland has exited, stopping", file=sys.stderr)
+                return
+            if failures >= MAX_RECONNECTS:
+                print(f"❌ Event socket unreachable after {failures} attempts", file=sys.stderr)
+                sys.exit(1)
+            time.sleep(RECONNECT_DELAY)
+
+if __name__ == "__main__":
+    try:
+        Daemon().run()
+    except KeyboardInterrupt:
+        pass
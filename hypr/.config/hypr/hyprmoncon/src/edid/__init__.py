@@ -0,0 +1,379 @@
+import os
+import re
+import struct
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import tracing
+
+DRM_PATH = "/sys/class/drm"
+EDID_BLOCK = 128
+EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+
+CTA_EXTENSION = 0x02
+DISPLAYID_EXTENSION = 0x70
+
+# CTA-861 video identification codes: vic -> (width, height, refresh, interlaced)
+CTA_VICS = {
+    1: (640, 480, 59.94, False),
+    2: (720, 480, 59.94, False),
+    3: (720, 480, 59.94, False),
+    4: (1280, 720, 60.0, False),
+    5: (1920, 1080, 60.0, True),
+    6: (1440, 480, 59.94, True),
+    7: (1440, 480, 59.94, True),
+    14: (1440, 480, 59.94, False),
+    15: (1440, 480, 59.94, False),
+    16: (1920, 1080, 60.0, False),
+    17: (720, 576, 50.0, False),
+    18: (720, 576, 50.0, False),
+    19: (1280, 720, 50.0, False),
+    20: (1920, 1080, 50.0, True),
+    21: (1440, 576, 50.0, True),
+    22: (1440, 576, 50.0, True),
+    29: (1440, 576, 50.0, False),
+    30: (1440, 576, 50.0, False),
+    31: (1920, 1080, 50.0, False),
+    32: (1920, 1080, 24.0, False),
+    33: (1920, 1080, 25.0, False),
+    34: (1920, 1080, 30.0, False),
+    39: (1920, 1080, 50.0, True),
+    40: (1920, 1080, 100.0, True),
+    41: (1280, 720, 100.0, False),
+    46: (1920, 1080, 120.0, True),
+    47: (1280, 720, 120.0, False),
+    60: (1280, 720, 24.0, False),
+    61: (1280, 720, 25.0, False),
+    62: (1280, 720, 30.0, False),
+    63: (1920, 1080, 120.0, False),
+    64: (1920, 1080, 100.0, False),
+    93: (3840, 2160, 24.0, False),
+    94: (3840, 2160, 25.0, False),
+    95: (3840, 2160, 30.0, False),
+    96: (3840, 2160, 50.0, False),
+    97: (3840, 2160, 60.0, False),
+    98: (4096, 2160, 24.0, False),
+    99: (4096, 2160, 25.0, False),
+    100: (4096, 2160, 30.0, False),
+    101: (4096, 2160, 50.0, False),
+    102: (4096, 2160, 60.0, False),
+    117: (3840, 2160, 100.0, False),
+    118: (3840, 2160, 120.0, False),
+}
+
+HDR_EOTFS = ["SDR", "HDR", "PQ", "HLG"]
+
+# Decoded EDIDs by sha256, so identical panels and re-plugs decode once;
+# least recently used first, bounded so a long-running daemon doesn't grow
+DECODED_CACHE_SIZE = 32
+_decoded = OrderedDict()
+
+@dataclass
+class Mode:
+    width: int
+    height: int
+    refresh: float
+    interlaced: bool = False
+    preferred: bool = False
+    native: bool = False
+    source: str = ""
+
+    def key(self):
+        return (self.width, self.height, round(self.refresh, 2), self.interlaced)
+
+@dataclass
+class Edid:
+    hash: str
+    manufacturer_id: str
+    product_code: int
+    serial_number: int
+    serial: str
+    model_name: str
+    version: str
+    width_mm: int
+    height_mm: int
+    checksums_ok: list
+    modes: list = field(default_factory=list)
+    hdr: dict = field(default_factory=dict)
+    extensions: list = field(default_factory=list)
+
+    @property
+    def valid(self):
+        return all(self.checksums_ok)
+
+    @property
+    def preferred_mode(self):
+        return next((m for m in self.modes if m.preferred), self.modes[0] if self.modes else None)
+
+    @property
+    def native_mode(self):
+        # Largest mode the panel flags as native, else the preferred timing
+        native = [m for m in self.modes if m.native]
+        if native:
+            return max(native, key=lambda m: (m.width * m.height, m.refresh))
+        return self.preferred_mode
+
+def decode_text(data):
+    # Descriptor strings are ASCII, terminated by 0x0A and padded with spaces
+    return data.decode("ascii", errors="ignore").replace("\0", "").replace("\n", "").rstrip(" ")
+
+def parse_edid(edid):
+    if len(edid) < EDID_BLOCK:
+        raise ValueError("Invalid EDID length")
+
+    manufacturer_id = ''.join([
+        chr(((edid[8] >> 2) & 0x1F) + ord('A') - 1),
+        chr((((edid[8] & 0x3) << 3) | (edid[9] >> 5)) + ord('A') - 1),
+        chr((edid[9] & 0x1F) + ord('A') - 1)
+    ])
+
+    product_code = struct.unpack('<H', edid[10:12])[0]
+    serial_number = struct.unpack('<I', edid[12:16])[0]
+
+    # Check descriptor blocks for ASCII serial/model info
+    descriptors = [edid[i:i+18] for i in range(54, 126, 18)]
+    model_name = None
+    ascii_serial = None
+
+    for d in descriptors:
+        if d[0:3] != b"\0\0\0":
+            continue  # detailed timing, not a display descriptor
+        if d[3] == 0xFC and model_name is None:  # Model name
+            model_name = decode_text(d[5:18])
+        elif d[3] == 0xFF and ascii_serial is None:  # Serial number
+            ascii_serial = decode_text(d[5:18])
+
+    return {
+        "manufacturer_id": manufacturer_id,
+        "product_code": product_code,
+        "serial_number": serial_number,
+        "serial": ascii_serial,
+        "model_name": model_name,
+    }
+
+def parse_detailed_timing(d, source):
+    clock = struct.unpack("<H", d[0:2])[0] * 10000
+    if clock == 0:
+        return None  # display descriptor, not a timing
+
+    h_active = d[2] | ((d[4] & 0xF0) << 4)
+    h_blank = d[3] | ((d[4] & 0x0F) << 8)
+    v_active = d[5] | ((d[7] & 0xF0) << 4)
+    v_blank = d[6] | ((d[7] & 0x0F) << 8)
+    interlaced = bool(d[17] & 0x80)
+    total = (h_active + h_blank) * (v_active + v_blank)
+    if not total:
+        return None
+    return Mode(h_active, v_active * (2 if interlaced else 1), round(clock / total, 3),
+                interlaced, source=source)
+
+def parse_standard_timings(edid):
+    modes = []
+    for i in range(38, 54, 2):
+        b1, b2 = edid[i], edid[i + 1]
+        if (b1, b2) == (0x01, 0x01) or b1 == 0:
+            continue
+        width = (b1 + 31) * 8
+        aspect = b2 >> 6
+        if aspect == 0:
+            # 16:10 from EDID 1.3 on, 1:1 before
+            height = width * 10 // 16 if edid[19] >= 3 else width
+        else:
+            height = width * {1: 3, 2: 4, 3: 9}[aspect] // {1: 4, 2: 5, 3: 16}[aspect]
+        modes.append(Mode(width, height, float((b2 & 0x3F) + 60), source="standard"))
+    return modes
+
+def parse_cta_block(block, edid):
+    info = {"type": "CTA-861", "revision": block[1], "vics": [], "native_vics": [], "vendors": []}
+    dtd_offset = block[2]
+    modes = []
+
+    i = 4
+    while 4 <= i < dtd_offset and i < EDID_BLOCK - 1:
+        tag = block[i] >> 5
+        length = block[i] & 0x1F
+        payload = block[i + 1:i + 1 + length]
+        if tag == 2:  # video data block
+            for svd in payload:
+                vic = svd
+                native = False
+                if block[1] >= 3 and svd & 0x80 and (svd & 0x7F) <= 64:
+                    vic = svd & 0x7F
+                    native = True
+                info["vics"].append(vic)
+                if native:
+                    info["native_vics"].append(vic)
+                if vic in CTA_VICS:
+                    w, h, refresh, interlaced = CTA_VICS[vic]
+                    modes.append(Mode(w, h, refresh, interlaced, native=native, source=f"cta-vic{vic}"))
+        elif tag == 3 and length >= 3:  # vendor specific data block
+            info["vendors"].append(f"{payload[2]:02x}{payload[1]:02x}{payload[0]:02x}")
+        elif tag == 7 and length >= 3 and payload[0] == 6:  # HDR static metadata
+            edid.hdr["eotfs"] = [name for bit, name in enumerate(HDR_EOTFS) if payload[1] & (1 << bit)]
+            if length >= 4 and payload[3]:
+                edid.hdr["max_luminance"] = round(50 * 2 ** (payload[3] / 32), 1)
+            if length >= 5 and payload[4]:
+                edid.hdr["max_frame_avg_luminance"] = round(50 * 2 ** (payload[4] / 32), 1)
+            if length >= 6 and "max_luminance" in edid.hdr:
+                edid.hdr["min_luminance"] = round(edid.hdr["max_luminance"] * (payload[5] / 255) ** 2 / 100, 4)
+        i += 1 + length
+
+    if dtd_offset >= 4:
+        for j in range(dtd_offset, EDID_BLOCK - 18, 18):
+            mode = parse_detailed_timing(block[j:j + 18], "cta-dtd")
+            if mode is None:
+                break
+            modes.append(mode)
+
+    return info, modes
+
+def parse_displayid_timing(d, clock_unit, source):
+    clock = (int.from_bytes(d[0:3], "little") + 1) * clock_unit
+    h_active = struct.unpack("<H", d[4:6])[0] + 1
+    h_blank = struct.unpack("<H", d[6:8])[0] + 1
+    v_active = struct.unpack("<H", d[12:14])[0] + 1
+    v_blank = struct.unpack("<H", d[14:16])[0] + 1
+    interlaced = bool(d[3] & 0x10)
+    refresh = round(clock / ((h_active + h_blank) * (v_active + v_blank)), 3)
+    return Mode(h_active, v_active, refresh, interlaced, preferred=bool(d[3] & 0x80), source=source)
+
+def parse_displayid_block(block):
+    info = {"type": "DisplayID", "version": f"{block[1] >> 4}.{block[1] & 0x0F}"}
+    modes = []
+    end = min(5 + block[2], EDID_BLOCK - 1)
+
+    i = 5
+    while i + 3 <= end:
+        tag, length = block[i], block[i + 2]
+        payload = block[i + 3:i + 3 + length]
+        if tag == 0x03:  # type I detailed timings, 10 kHz clock
+            clock_unit, source = 10000, "displayid-type1"
+        elif tag == 0x22:  # type VII detailed timings (DisplayID 2.0), 1 kHz clock
+            clock_unit, source = 1000, "displayid-type7"
+        else:
+            clock_unit = None
+        if clock_unit:
+            for j in range(0, len(payload) - 19, 20):
+                modes.append(parse_displayid_timing(payload[j:j + 20], clock_unit, source))
+        if tag == 0 and length == 0:
+            break  # padding
+        i += 3 + length
+
+    return info, modes
+
+def decode_edid(edid):
+    digest = hashlib.sha256(edid).hexdigest()
+    cached = _decoded.get(digest)
+    if cached is not None:
+        tracing.count("cache.edid.hit")
+        _decoded.move_to_end(digest)
+        return cached
+    tracing.count("cache.edid.miss")
+
+    if len(edid) < EDID_BLOCK or len(edid) % EDID_BLOCK:
+        raise ValueError("Invalid EDID length")
+    if edid[:8] != EDID_HEADER:
+        raise ValueError("Invalid EDID header")
+
+    blocks = [edid[i:i + EDID_BLOCK] for i in range(0, len(edid), EDID_BLOCK)]
+    base = parse_edid(edid)
+    result = Edid(
+        hash=digest,
+        manufacturer_id=base["manufacturer_id"],
+        product_code=base["product_code"],
+        serial_number=base["serial_number"],
+        serial=base["serial"],
+        model_name=base["model_name"],
+        version=f"{edid[18]}.{edid[19]}",
+        width_mm=edid[21] * 10,
+        height_mm=edid[22] * 10,
+        checksums_ok=[sum(block) % 256 == 0 for block in blocks],
+    )
+
+    # The first detailed timing is the preferred (native) mode since EDID 1.3
+    for n, i in enumerate(range(54, 126, 18)):
+        mode = parse_detailed_timing(edid[i:i + 18], "dtd")
+        if mode is None:
+            continue
+        if n == 0:
+            mode.preferred = True
+            mode.native = True
+        result.modes.append(mode)
+    result.modes.extend(parse_standard_timings(edid))
+
+    for block in blocks[1:]:
+        if block[0] == CTA_EXTENSION:
+            info, modes = parse_cta_block(block, result)
+        elif block[0] == DISPLAYID_EXTENSION:
+            info, modes = parse_displayid_block(block)
+        else:
+            info, modes = {"type": f"0x{block[0]:02x}"}, []
+        result.extensions.append(info)
+        result.modes.extend(modes)
+
+    # Keep the first (most specific) entry of every distinct mode
+    seen = {}
+    for mode in result.modes:
+        if mode.key() in seen:
+            other = seen[mode.key()]
+            other.preferred |= mode.preferred
+            other.native |= mode.native
+        else:
+            seen[mode.key()] = mode
+    result.modes = list(seen.values())
+
+    _decoded[digest] = result
+    if len(_decoded) > DECODED_CACHE_SIZE:
+        _decoded.popitem(last=False)
+    return result
+
+def monitor_id(edid):
+    # Same identifiers get-monitors.sh produces: the descriptor serial when
+    # there is one, otherwise a hash of the whole EDID blob
+    serial = None
+    for i in range(54, 126, 18):
+        if edid[i + 3] == 0xFF:
+            serial = decode_text(edid[i + 5:i + 18])
+            break
+
+    if serial:
+        return f"ser:{serial}"
+    return f"hsh:{hashlib.sha256(edid).hexdigest()}"
+
+def connector_name(entry):
+    # card1-DP-3 -> DP-3
+    return re.sub(r"^card[0-9]-", "", entry)
+
+def read_edids(drm_path=DRM_PATH):
+    edids = {}
+    try:
+        entries = sorted(os.listdir(drm_path))
+    except OSError:
+        return edids
+
+    for entry in entries:
+        try:
+            with open(os.path.join(drm_path, entry, "edid"), "rb") as f:
+                edid = f.read()
+        except OSError:
+            continue
+        # Disconnected connectors expose an empty edid file
+        if len(edid) >= EDID_BLOCK:
+            edids[connector_name(entry)] = edid
+    return edids
+
+def read_monitor_ids(drm_path=DRM_PATH):
+    with tracing.span("edid.read"):
+        return {port: monitor_id(edid) for port, edid in read_edids(drm_path).items()}
+
+def read_monitor_edids(drm_path=DRM_PATH):
+    # Connector -> decoded Edid; blobs that fail to decode are left out
+    decoded = {}
+    with tracing.span("edid.decode"):
+        for port, edid in read_edids(drm_path).items():
+            try:
+                decoded[port] = decode_edid(edid)
+            except ValueError:
+                continue
+    return decoded
@@ -1,46 +1,50 @@
 #!/usr/bin/env python3
 
+import os
 import sys
-import struct
 import binascii
 
-def parse_edid(edid_hex):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from edid import decode_edid
+
+def print_edid(edid_hex):
     edid = binascii.unhexlify(edid_hex.strip().replace('\n', '').replace(' ', ''))
-    if len(edid) != 128:
-        print("Invalid EDID length")
+    try:
+        info = decode_edid(edid)
+    except ValueError as e:
+        print(e)
         return
 
-    manufacturer_id = ''.join([
-        chr(((edid[8] >> 2) & 0x1F) + ord('A') - 1),
-        chr((((edid[8] & 0x3) << 3) | (edid[9] >> 5)) + ord('A') - 1),
-        chr((edid[9] & 0x1F) + ord('A') - 1)
-    ])
-
-    product_code = struct.unpack('<H', edid[10:12])[0]
-    serial_number = struct.unpack('<I', edid[12:16])[0]
-
-    # Check descriptor blocks for ASCII serial/model info
-    descriptors = [edid[i:i+18] for i in range(54, 126, 18)]
-    model_name = None
-    ascii_serial = None
-
-    for d in descriptors:
-        if d[3] == 0xFC:  # Model name
-            model_name = d[5:18].decode('ascii', errors='ignore').strip()
-        elif d[3] == 0xFF:  # Serial number
-            ascii_serial = d[5:18].decode('ascii', errors='ignore').strip()
-
-    print(f"Manufacturer ID : {manufacturer_id}")
-    print(f"Product Code    : {product_code}")
-    print(f"Serial (binary) : {serial_number}")
-    if ascii_serial:
-        print(f"Serial (ASCII)  : {ascii_serial}")
-    if model_name:
-        print(f"Model Name      : {model_name}")
+    print(f"Manufacturer ID : {info.manufacturer_id}")
+    print(f"Product Code    : {info.product_code}")
+    print(f"Serial (binary) : {info.serial_number}")
+    if info.serial:
+        print(f"Serial (ASCII)  : {info.serial}")
+    if info.model_name:
+        print(f"Model Name      : {info.model_name}")
+    print(f"EDID Version    : {info.version}")
+    print(f"Screen Size     : {info.width_mm}x{info.height_mm} mm")
+    print(f"Checksums       : {'ok' if info.valid else info.checksums_ok}")
+    for ext in info.extensions:
+        details = ", ".join(f"{k}={v}" for k, v in ext.items() if k != "type" and v)
+        print(f"Extension       : {ext['type']} {details}")
+    if info.hdr:
+        print(f"HDR             : {info.hdr}")
+    for label, mode in (("Native Mode", info.native_mode), ("Preferred Mode", info.preferred_mode)):
+        if mode:
+            print(f"{label:<16}: {mode.width}x{mode.height}@{mode.refresh:g}")
+    print("Modes           :")
+    for mode in info.modes:
+        flags = "".join([
+            "i" if mode.interlaced else "",
+            " preferred" if mode.preferred else "",
+            " native" if mode.native else "",
+        ])
+        print(f"  {mode.width}x{mode.height}@{mode.refresh:g}{flags} ({mode.source})")
 
 if __name__ == "__main__":
     if sys.stdin.isatty():
         print("Paste EDID hex to stdin or pipe from a file.")
         sys.exit(1)
     hex_data = sys.stdin.read()
-    parse_edid(hex_data)
+    print_edid(hex_data)
@@ -1,6 +1,12 @@
-#!/bin/sh
+#!/usr/bin/env bash
+# Reference implementation of read_monitor_ids() (edid/__init__.py), kept so
+# tests/test_edid.py can check both produce the same IDs. Prints
+# <connector>:ser:<serial> or <connector>:hsh:<sha256> for every connected
+# monitor under $1 (default /sys/class/drm).
 
-for edid_path in /sys/class/drm/*/edid; do
+drm_path=${1:-/sys/class/drm}
+
+for edid_path in "$drm_path"/*/edid; do
   if [ -r "$edid_path" ]; then
     hex=$(xxd -p "$edid_path" | tr -d '\n')
     len=$(echo "$hex" | wc -c)
@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import time
+import select
+
+import paths
+from model import Layout
+from apply import apply_layout
+from layouts import atomic_write, file_lock, fingerprint
+
+HISTORY_LIMIT = 20
+
+class History:
+    # Bounded ring of applied configurations, newest last. Each entry keeps the
+    # live configuration it replaced, so undoing it is one batched apply.
+    def __init__(self, path=paths.HISTORY_PATH, limit=HISTORY_LIMIT):
+        self.path = path
+        self.lock_path = os.path.splitext(path)[0] + ".lock"
+        self.limit = limit
+
+    def entries(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def update(self, change):
+        # Read-modify-write under the lock; change edits the list in place
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with file_lock(self.lock_path):
+            try:
+                entries = self.entries()
+            except ValueError:
+                entries = []  # unreadable history is not worth failing an apply over
+            value = change(entries)
+            atomic_write(self.path, json.dumps(entries[-self.limit:], indent=2).encode())
+        return value
+
+    def record(self, result, monitor_ids):
+        entry = {
+            "time": time.time(),
+            "layout": result.layout_name,
+            "fingerprint": list(fingerprint(monitor_ids.values())),
+            "before": Layout.from_monitors(result.before, monitor_ids).to_json(),
+            "applied": result.layout,
+            "confirmed": None,
+        }
+        self.update(lambda entries: entries.append(entry))
+        return entry
+
+    def confirm(self, entry):
+        def change(entries):
+            for e in entries:
+                if e["time"] == entry["time"]:
+                    e["confirmed"] = True
+        self.update(change)
+
+    def remove(self, entry):
+        def change(entries):
+            entries[:] = [e for e in entries if e["time"] != entry["time"]]
+        self.update(change)
+
+    def last_good(self, monitor_ids):
+        # Newest configuration confirmed on this exact set of monitors
+        current = list(fingerprint(monitor_ids.values()))
+        for entry in reversed(self.entries()):
+            if entry["confirmed"] and entry["fingerprint"] == current:
+                return entry
+        return None
+
+def revert(history, entry, dry_run=False):
+    # Put back what entry replaced, as one batched request, and forget entry
+    result = apply_layout(f"{entry['layout']} (reverted)", entry["before"], dry_run=dry_run)
+    if not dry_run:
+        history.remove(entry)
+    return result
+
+def rollback(history, monitor_ids, force=False, dry_run=False):
+    entries = history.entries()
+    if not entries:
+        raise ValueError("No applied layouts to roll back")
+    entry = entries[-1]
+    if not force and entry["fingerprint"] != list(fingerprint(monitor_ids.values())):
+        raise ValueError(f"{entry['layout']} was applied to a different set of monitors (use --force)")
+    return revert(history, entry, dry_run)
+
+def confirm_or_revert(history, entry, timeout):
+    # Like a display settings dialog: anything but an explicit yes reverts
+    print(f"Keep this configuration? [y/N] (reverting in {timeout}s) ", end="", flush=True)
+    readable, _, _ = select.select([sys.stdin], [], [], timeout)
+    line = sys.stdin.readline() if readable else ""
+    if line.strip().lower() in ("y", "yes"):
+        history.confirm(entry)
+        return None
+    if not line.endswith("\n"):
+        print()
+    return revert(history, entry)
+
+def format_entry(entry):
+    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["time"]))
+    state = "confirmed" if entry["confirmed"] else ""
+    return f"{when}  {entry['layout']:<20} {len(entry['applied'])} monitors  {state}"
@@ -1,13 +1,8 @@
 import var
-import os
-import json
+from layouts import LayoutStore
 
-if not os.path.isfile(var.LAYOUT_PATH):
-    with open(var.LAYOUT_PATH, "w") as f:
-        json.dump({}, f)
-
-with open(var.LAYOUT_PATH) as f:
-    var.data = json.load(f)
+# Only reads the index; layouts are parsed when one is loaded
+var.store = LayoutStore().load()
 
 import app
 
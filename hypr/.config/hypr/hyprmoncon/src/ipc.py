@@ -0,0 +1,107 @@
+import os
+import json
+import socket
+from dataclasses import dataclass, field
+
+import tracing
+
+RECV_SIZE = 65536
+
+def socket_dir():
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return None
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(os.path.join(runtime, "hypr", signature)):
+        return os.path.join(runtime, "hypr", signature)
+    # Hyprland before 0.40 kept its sockets in /tmp
+    return os.path.join("/tmp/hypr", signature)
+
+def socket_path(name=".socket.sock"):
+    directory = socket_dir()
+    return os.path.join(directory, name) if directory else None
+
+def hyprctl(args):
+    # Not inside a Hyprland session; let hyprctl report the problem. Only this
+    # path needs subprocess, so socket users don't pay for importing it
+    import subprocess
+    tracing.count("spawn.hyprctl")
+    return subprocess.run(["hyprctl"] + args, capture_output=True, text=True).stdout
+
+def request(command, path=None):
+    path = path or socket_path()
+    if path is None:
+        args = []
+        if command.startswith("j/"):
+            args.append("-j")
+            command = command[2:]
+        return hyprctl(args + command.split())
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(command.encode())
+        chunks = []
+        while True:
+            chunk = sock.recv(RECV_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode(errors="replace")
+
+def batch(commands, path=None):
+    # Every command in one round trip; Hyprland applies them back to back
+    if not commands:
+        return ""
+    path = path or socket_path()
+    if path is None:
+        return hyprctl(["--batch", " ; ".join(commands)])
+    return request("[[BATCH]]" + ";".join(commands), path)
+
+def request_json(command, path=None):
+    return json.loads(request("j/" + command, path))
+
+@dataclass
+class MonitorInfo:
+    id: int
+    name: str
+    description: str
+    make: str
+    model: str
+    serial: str
+    width: int
+    height: int
+    refresh_rate: float
+    x: int
+    y: int
+    scale: float
+    transform: int
+    focused: bool = False
+    disabled: bool = False
+    active_workspace: int = 0
+    available_modes: list = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            id=data.get("id", 0),
+            name=data["name"],
+            description=data.get("description", ""),
+            make=data.get("make", ""),
+            model=data.get("model", ""),
+            serial=data.get("serial", ""),
+            width=data["width"],
+            height=data["height"],
+            refresh_rate=data.get("refreshRate", 60.0),
+            x=data["x"],
+            y=data["y"],
+            scale=data.get("scale", 1.0),
+            transform=data.get("transform", 0),
+            focused=data.get("focused", False),
+            disabled=data.get("disabled", False),
+            active_workspace=data.get("activeWorkspace", {}).get("id", 0),
+            available_modes=data.get("availableModes", []),
+        )
+
+def get_monitors(path=None):
+    with tracing.span("monitor.query"):
+        return [MonitorInfo.from_json(m) for m in request_json("monitors", path)]
@@ -0,0 +1,217 @@
+import os
+import json
+import fcntl
+from collections import Counter
+from contextlib import contextmanager
+
+import paths
+import tracing
+
+def fingerprint(monitor_ids):
+    # Canonical form of a multiset of monitor IDs (two identical panels count twice)
+    return tuple(sorted(monitor_ids))
+
+def atomic_write(path, data):
+    # Readers see either the old file or the new one, never a partial write
+    # (callers hold the file's lock, so the temporary name can't collide)
+    directory = os.path.dirname(path) or "."
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Make the rename itself durable
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return st
+
+@contextmanager
+def file_lock(path):
+    # Serializes writers across processes; readers never take it
+    with open(path, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def file_stamp(st):
+    # os.replace keeps inode, size and mtime, so this identifies one written version
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+class LayoutStore:
+    # layout.json holds every layout; a sidecar index next to it records each
+    # layout's byte span and monitor IDs for the file version it describes, so
+    # matching never parses layouts and get() parses only the one asked for.
+    # Writes replace both files atomically under a lock; readers never lock.
+    def __init__(self, path=paths.LAYOUT_PATH):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".index.json"
+        self.lock_path = os.path.splitext(path)[0] + ".lock"
+        self.raw = b""
+        self.spans = {}
+        self.parsed = {}
+        self.monitors = {}
+        self.index = {}
+        self.by_monitor = {}
+        self.generation = 0
+        self.stamp = None
+
+    def load(self):
+        # Re-read only when the file changed on disk
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self.set_snapshot(b"", {}, {}, {}, 0, None)
+            return self
+        with f:
+            stamp = file_stamp(os.fstat(f.fileno()))
+            if stamp == self.stamp:
+                tracing.count("cache.layouts.hit")
+                return self
+            raw = f.read()
+
+        tracing.count("cache.layouts.miss")
+        sidecar = self.read_sidecar()
+        if sidecar is not None and sidecar.get("stamp") == stamp:
+            tracing.count("cache.sidecar.hit")
+            spans = {name: tuple(entry["span"]) for name, entry in sidecar["layouts"].items()}
+            monitors = {name: entry["monitors"] for name, entry in sidecar["layouts"].items()}
+            self.set_snapshot(raw, spans, {}, monitors, sidecar["generation"], stamp)
+        else:
+            # Edited by hand or not written by this store yet: parse it all once
+            tracing.count("cache.sidecar.miss")
+            parsed = json.loads(raw) if raw.strip() else {}
+            monitors = {name: [m["monitor"] for m in layout] for name, layout in parsed.items()}
+            generation = sidecar["generation"] if sidecar is not None else 0
+            self.set_snapshot(raw, {}, parsed, monitors, generation, stamp)
+        return self
+
+    def read_sidecar(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set_snapshot(self, raw, spans, parsed, monitors, generation, stamp):
+        self.raw = raw
+        self.spans = spans
+        self.parsed = parsed
+        self.monitors = monitors
+        self.generation = generation
+        self.stamp = stamp
+        self.index = {}
+        self.by_monitor = {}
+        # Same tie-break as the old shell matcher: first matching name in sorted order
+        for name in sorted(monitors):
+            ids = monitors[name]
+            self.index.setdefault(fingerprint(ids), name)
+            for monitor_id in set(ids):
+                self.by_monitor.setdefault(monitor_id, []).append(name)
+
+    def names(self):
+        return sorted(self.monitors)
+
+    def monitor_ids(self, name):
+        return self.monitors.get(name)
+
+    def get(self, name):
+        layout = self.parsed.get(name)
+        if layout is None and name in self.spans:
+            start, end = self.spans[name]
+            layout = self.parsed[name] = json.loads(self.raw[start:end])
+        return layout
+
+    def text(self, name):
+        # A layout's JSON as it appears in the file (nested under the top-level object)
+        if name in self.spans:
+            start, end = self.spans[name]
+            return self.raw[start:end]
+        return json.dumps(self.parsed[name], indent=2).replace("\n", "\n  ").encode()
+
+    def save(self, name, layout):
+        self.update({name: layout})
+
+    def delete(self, name):
+        self.update({name: None})
+
+    def update(self, changes):
+        # Rewrite the file with changes applied (None deletes); every other
+        # layout is copied through byte for byte without being parsed
+        with file_lock(self.lock_path):
+            self.load()
+            pieces = {name: self.text(name) for name in self.monitors if name not in changes}
+            for name, layout in changes.items():
+                if layout is not None:
+                    pieces[name] = json.dumps(layout, indent=2).replace("\n", "\n  ").encode()
+
+            # Same shape json.dump(layouts, indent=2) produces
+            chunks = [b"{"]
+            size = 1
+            spans = {}
+            for i, (name, text) in enumerate(pieces.items()):
+                key = (b",\n  " if i else b"\n  ") + json.dumps(name).encode() + b": "
+                spans[name] = (size + len(key), size + len(key) + len(text))
+                chunks += [key, text]
+                size += len(key) + len(text)
+            chunks.append(b"\n}" if pieces else b"}")
+            raw = b"".join(chunks)
+
+            monitors = {name: self.monitors[name] for name in pieces if name not in changes}
+            for name, layout in changes.items():
+                if layout is not None:
+                    monitors[name] = [m["monitor"] for m in layout]
+            generation = self.generation + 1
+
+            stamp = file_stamp(atomic_write(self.path, raw))
+            sidecar = {
+                "generation": generation,
+                "stamp": stamp,
+                "layouts": {name: {"span": spans[name], "monitors": monitors[name]} for name in spans},
+            }
+            atomic_write(self.index_path, json.dumps(sidecar).encode())
+
+            parsed = {name: layout for name, layout in self.parsed.items() if name not in changes}
+            parsed.update((name, layout) for name, layout in changes.items() if layout is not None)
+            self.set_snapshot(raw, spans, parsed, monitors, generation, stamp)
+
+    def match(self, monitor_ids):
+        return self.index.get(fingerprint(monitor_ids))
+
+    def rank(self, monitor_ids):
+        # Layouts sharing at least one connected monitor, best first: most
+        # monitors matched, then fewest saved monitors missing, then fewest
+        # connected monitors the layout doesn't know about
+        connected = Counter(monitor_ids)
+        candidates = set()
+        for monitor_id in connected:
+            candidates.update(self.by_monitor.get(monitor_id, ()))
+
+        ranked = []
+        for name in candidates:
+            saved = Counter(self.monitors[name])
+            matched = sum((saved & connected).values())
+            missing = sum((saved - connected).values())
+            extra = sum((connected - saved).values())
+            ranked.append(((-matched, missing, extra, name), name))
+        ranked.sort()
+        return [name for _, name in ranked]
+
+    def best_match(self, monitor_ids, partial=False):
+        with tracing.span("layout.match"):
+            name = self.match(monitor_ids)
+            if name is None and partial:
+                ranked = self.rank(monitor_ids)
+                name = ranked[0] if ranked else None
+        return name
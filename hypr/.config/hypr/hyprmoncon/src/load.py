@@ -1,26 +1,37 @@
-import json
-import os
-from monitor import create_monitor
-import app
+from monitor import create_monitor, edges
+from edid import read_monitor_ids
+from model import Layout
+from projection import canvas_size
+from viewport import fit
 import var
 
-def load_layout():
-    layout_name = app.name_entry.get().strip()
-    if not layout_name:
-        return
-    
-    if layout_name not in var.data:
-        app.status_label.config(text=f"Layout {layout_name} not found in layout file")
-        return
-    
+def show_layout(canvas, layout):
     # Clear existing monitors
-    for m in var.monitors:
-        app.canvas.delete(m.rect)
-        app.canvas.delete(m.text)
-    var.monitors.clear()
+    for view in var.views.values():
+        canvas.delete(view.rect)
+        canvas.delete(view.text)
+    var.views.clear()
+    var.layout.clear()
+    edges.clear()
+    
+    # Zoom so the whole layout is visible before creating the monitors in place
+    width, height = canvas_size(canvas)
+    var.projection.fit(Layout.from_json(layout).bounding_box(), width, height)
     
     # Create new monitors from layout
-    for index, m_info in enumerate(var.data[layout_name]):
-        create_monitor(app.canvas, m_info, index, True)
+    monitor_ids = read_monitor_ids()
+    for index, m_info in enumerate(layout):
+        create_monitor(canvas, m_info, index, monitor_ids)
+    
+    # Scroll region and view; redraws nothing, the projection already fits
+    fit(canvas)
+
+def load_layout(canvas, layout_name):
+    # Pick up layouts saved by the CLI or another editor meanwhile
+    layout = var.store.load().get(layout_name)
+    if layout is None:
+        return f"Layout {layout_name} not found in layout file"
+    
+    show_layout(canvas, layout)
     
-    app.status_label.config(text=f"Layout {layout_name}.json loaded")
\ No newline at end of file
+    return f"Layout {layout_name}.json loaded"
@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class Output:
+    # One monitor of a layout, in Hyprland's layout coordinates
+    name: str
+    monitor: str
+    width: int
+    height: int
+    x: int = 0
+    y: int = 0
+    scale: float = 1.0
+    refresh_rate: float = None
+    transform: int = 0
+    primary: bool = False
+
+    def logical_size(self):
+        # Positions are in logical pixels: scaled down, and swapped when rotated 90/270
+        width, height = (self.height, self.width) if self.transform % 2 else (self.width, self.height)
+        return round(width / self.scale), round(height / self.scale)
+
+    @property
+    def right(self):
+        return self.x + self.logical_size()[0]
+
+    @property
+    def bottom(self):
+        return self.y + self.logical_size()[1]
+
+    def overlaps(self, other):
+        return (self.x < other.right and other.x < self.right
+                and self.y < other.bottom and other.y < self.bottom)
+
+    def adjacent(self, other):
+        # Touching along an edge (not just a corner) without overlapping
+        if self.right == other.x or other.right == self.x:
+            return self.y < other.bottom and other.y < self.bottom
+        if self.bottom == other.y or other.bottom == self.y:
+            return self.x < other.right and other.x < self.right
+        return False
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(
+            name=entry["name"],
+            monitor=entry.get("monitor", ""),
+            width=entry["width"],
+            height=entry["height"],
+            x=entry.get("x", 0),
+            y=entry.get("y", 0),
+            scale=entry.get("scale", 1.0),
+            refresh_rate=entry.get("refresh_rate"),
+            transform=entry.get("transform", 0),
+            primary=entry.get("primary", False),
+        )
+
+    def to_entry(self):
+        return {
+            "name": self.name,
+            "monitor": self.monitor,
+            "width": self.width,
+            "height": self.height,
+            "x": self.x,
+            "y": self.y,
+            "scale": self.scale,
+            "refresh_rate": self.refresh_rate,
+            "transform": self.transform,
+            "primary": self.primary
+        }
+
+class Layout:
+    # Outputs in layout order, indexed by connector name and by monitor ID
+    # (identical panels can share a hashed ID, so that index holds lists)
+    __slots__ = ("outputs", "by_name", "by_monitor")
+
+    def __init__(self, outputs=()):
+        self.outputs = []
+        self.by_name = {}
+        self.by_monitor = {}
+        for output in outputs:
+            self.add(output)
+
+    def __iter__(self):
+        return iter(self.outputs)
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def add(self, output):
+        self.remove(output.name)
+        self.outputs.append(output)
+        self.by_name[output.name] = output
+        self.by_monitor.setdefault(output.monitor, []).append(output)
+        return output
+
+    def remove(self, name):
+        output = self.by_name.pop(name, None)
+        if output is None:
+            return None
+        self.outputs.remove(output)
+        same = self.by_monitor[output.monitor]
+        same.remove(output)
+        if not same:
+            del self.by_monitor[output.monitor]
+        return output
+
+    def clear(self):
+        self.outputs.clear()
+        self.by_name.clear()
+        self.by_monitor.clear()
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def find(self, monitor_id):
+        return self.by_monitor.get(monitor_id, [])
+
+    def monitor_ids(self):
+        return [output.monitor for output in self.outputs]
+
+    def primary(self):
+        for output in self.outputs:
+            if output.primary:
+                return output
+        return self.outputs[0] if self.outputs else None
+
+    def set_primary(self, name):
+        for output in self.outputs:
+            output.primary = output.name == name
+
+    def bounding_box(self):
+        rects = self.rects()
+        if not rects:
+            return None
+        return (
+            min(r[0] for r in rects),
+            min(r[1] for r in rects),
+            max(r[2] for r in rects),
+            max(r[3] for r in rects),
+        )
+
+    def normalize(self):
+        # Shift everything so the layout starts at 0x0; returns the offset applied
+        box = self.bounding_box()
+        if box is None:
+            return (0, 0)
+        dx, dy = -box[0], -box[1]
+        if dx or dy:
+            for output in self.outputs:
+                output.x += dx
+                output.y += dy
+        return (dx, dy)
+
+    def rects(self):
+        return [(o.x, o.y, o.right, o.bottom, o.name) for o in self.outputs]
+
+    def overlaps(self):
+        # Sweep along x, only comparing outputs whose x ranges are still open
+        pairs = []
+        active = []
+        for x0, y0, x1, y1, name in sorted(self.rects()):
+            active = [r for r in active if r[2] > x0]
+            for other in active:
+                if other[1] < y1 and y0 < other[3]:
+                    pairs.append((other[4], name))
+            active.append((x0, y0, x1, y1, name))
+        return pairs
+
+    def adjacency(self):
+        # Neighbours sharing an edge: bucket outputs on edge coordinates, then
+        # merge the sorted spans on both sides of each shared coordinate
+        rects = self.rects()
+        neighbours = {rect[4]: [] for rect in rects}
+        # (near edge, far edge, span start, span end) as rect indices, for x then y
+        for near, far, start, end in ((2, 0, 1, 3), (3, 1, 0, 2)):
+            ending = {}
+            starting = {}
+            for rect in rects:
+                ending.setdefault(rect[near], []).append(rect)
+                starting.setdefault(rect[far], []).append(rect)
+            for coordinate, before in ending.items():
+                after = starting.get(coordinate)
+                if not after:
+                    continue
+                before.sort(key=lambda r: r[start])
+                after.sort(key=lambda r: r[start])
+                first = 0
+                for rect in before:
+                    while first < len(after) and after[first][end] <= rect[start]:
+                        first += 1
+                    i = first
+                    while i < len(after) and after[i][start] < rect[end]:
+                        other = after[i]
+                        if other is not rect and other[end] > rect[start]:
+                            neighbours[rect[4]].append(other[4])
+                            neighbours[other[4]].append(rect[4])
+                        i += 1
+        return neighbours
+
+    @classmethod
+    def from_json(cls, entries):
+        return cls(Output.from_entry(entry) for entry in entries)
+
+    def to_json(self):
+        return [output.to_entry() for output in self.outputs]
+
+    @classmethod
+    def from_monitors(cls, monitors, monitor_ids):
+        # Live monitors (ipc.MonitorInfo) as a layout, the first one primary
+        layout = cls()
+        for index, m in enumerate(monitors):
+            layout.add(Output(
+                name=m.name,
+                monitor=monitor_ids.get(m.name, f"UNKNOWN_{index}"),
+                width=m.width,
+                height=m.height,
+                x=m.x,
+                y=m.y,
+                scale=m.scale,
+                refresh_rate=m.refresh_rate,
+                transform=m.transform,
+                primary=index == 0,
+            ))
+        return layout
@@ -1,137 +1,157 @@
 import var
-import subprocess
-import os
+from edid import read_monitor_ids
+from snapping import EdgeIndex
+from model import Output
 
-class Monitor:
-    def __init__(self, name, serial, width=1920, height=1080, x=0, y=0, scale=1):
-        self.name = name
-        self.serial = serial
-        self.width = width
-        self.height = height
-        self.x = x
-        self.y = y
-        self.scale = scale
-        self.rect = None
-        self.text = None
+# Layout geometry of every placed monitor, updated when a drag ends
+edges = EdgeIndex()
+
+ROTATIONS = ["", " 90°", " 180°", " 270°", " flipped", " flipped 90°", " flipped 180°", " flipped 270°"]
+# Rough size of a label character in the default canvas font, for level of detail
+CHAR_WIDTH = 7
+LINE_HEIGHT = 15
+
+class MonitorView:
+    # Canvas state of one output; the layout data itself lives in var.layout.
+    # drawn/shown are what the canvas items hold, so redraws skip no-ops.
+    __slots__ = ("output", "rect", "text", "offset_x", "offset_y", "drawn", "shown")
+
+    def __init__(self, output, rect, text, drawn=None, shown=None):
+        self.output = output
+        self.rect = rect
+        self.text = text
         self.offset_x = 0
         self.offset_y = 0
-        self.primary = False
-        
-def create_monitor(canvas, info, index, loaded=False):
-    # Fetch IDs from shell script
-    try:
-        output = subprocess.check_output(["sh", os.path.join(os.path.dirname(__file__), "edid/get-monitors.sh")], text=True).splitlines()
-        monitor_ids = dict(line.split(":", 1) for line in output)
-    except Exception as e:
-        print("Failed to fetch monitor IDs:", e)
-        monitor_ids = {}
+        self.drawn = drawn
+        self.shown = shown
+
+def label(m):
+    width, height = m.logical_size()
+    mode = f"{m.width}x{m.height}"
+    if (width, height) != (m.width, m.height):
+        mode += f" @{m.scale:g}x{ROTATIONS[m.transform % 8]}\n= {width}x{height}"
+    return f"{m.name}\n{mode}\n@{m.x},{m.y}"
 
-    # Determine position
-    if not loaded:
-        if index == 0:
-            x_pos = 0
-            y_pos = 0
-            is_primary = True
-        else:
-            prev_monitor = var.monitors[index - 1]
-            x_pos = prev_monitor.x + prev_monitor.width
-            y_pos = 0
-            is_primary = False
-    else:
-        x_pos = info["x"]
-        y_pos = info["y"]
-        is_primary = info["primary"]
+def fitting_label(m, width, height):
+    # The most detailed label that fits the monitor as drawn: everything, the
+    # name alone, or nothing once zoomed far out
+    for text in (label(m), m.name):
+        lines = text.split("\n")
+        if len(lines) * LINE_HEIGHT <= height and max(map(len, lines)) * CHAR_WIDTH <= width:
+            return text
+    return ""
+
+def draw(canvas, view):
+    rect = var.projection.rect(view.output)
+    x0, y0, x1, y1 = rect
+    if rect != view.drawn:
+        canvas.coords(view.rect, x0, y0, x1, y1)
+        canvas.coords(view.text, (x0 + x1) / 2, (y0 + y1) / 2)
+        view.drawn = rect
+    text = fitting_label(view.output, x1 - x0, y1 - y0)
+    if text != view.shown:
+        canvas.itemconfig(view.text, text=text)
+        view.shown = text
+        
+def create_monitor(canvas, info, index, monitor_ids=None):
+    # Callers creating several monitors read the EDID IDs once and pass them in.
+    # info is a saved layout entry, so it is drawn where it was placed.
+    if monitor_ids is None:
+        monitor_ids = read_monitor_ids()
 
     # Get ID from script or fallback
     name = info["name"]
     id_value = monitor_ids.get(name, f"UNKNOWN_{index}")
 
-    m = Monitor(
+    m = var.layout.add(Output(
         name=name,
-        serial=id_value,
+        monitor=id_value,
         width=info["width"],
         height=info["height"],
-        x=x_pos,
-        y=y_pos
-    )
-    m.primary = is_primary
-    
-    # Scale down for display (keeping proportions)
-    display_width = max(200, min(400, int(m.width / var.SCALE_FACTOR)))
-    display_height = max(120, min(240, int(m.height / var.SCALE_FACTOR)))
+        x=info["x"],
+        y=info["y"],
+        scale=info.get("scale", 1.0),
+        refresh_rate=info.get("refresh_rate"),
+        transform=info.get("transform", 0),
+        primary=info["primary"]
+    ))
     
-    var.monitors.append(m)
     outline = "green" if m.primary else "black"
     width = 3 if m.primary else 1
     
+    # Drawn at its logical size, projected onto the canvas
+    x0, y0, x1, y1 = drawn = var.projection.rect(m)
     rect = canvas.create_rectangle(
-        m.x / var.SCALE_FACTOR, m.y / var.SCALE_FACTOR, 
-        m.x / var.SCALE_FACTOR + display_width, m.y / var.SCALE_FACTOR + display_height,
+        x0, y0, x1, y1,
         fill="lightblue", tags=m.name, outline=outline, width=width
     )
     
+    shown = fitting_label(m, x1 - x0, y1 - y0)
     text = canvas.create_text(
-        m.x / var.SCALE_FACTOR + display_width / 2, m.y / var.SCALE_FACTOR + display_height / 2,
-        text=f"{m.name}\n{m.width}x{m.height}\n@{m.x},{m.y}", 
+        (x0 + x1) / 2, (y0 + y1) / 2,
+        text=shown, 
         tags=m.name
     )
     
-    m.rect = rect
-    m.text = text
+    view = MonitorView(m, rect, text, drawn, shown)
+    var.views[m.name] = view
+    edges.add(m.name, m.x, m.y, m.right, m.bottom)
+    
+    # Whether this drag moved the monitor, and whether a redraw is queued
+    drag = {"moved": False, "job": None}
+    
+    def pointer(event):
+        # Pointer position in layout coordinates, wherever the view is scrolled
+        return var.projection.to_layout(canvas.canvasx(event.x), canvas.canvasy(event.y))
     
     def start_drag(event):
-        m.offset_x = event.x - canvas.coords(m.rect)[0]
-        m.offset_y = event.y - canvas.coords(m.rect)[1]
+        x, y = pointer(event)
+        view.offset_x = x - m.x
+        view.offset_y = y - m.y
+    
+    def redraw():
+        # At most one canvas update per frame, however many motion events arrived
+        drag["job"] = None
+        draw(canvas, view)
     
     def dragging(event):
-        new_x = event.x - m.offset_x
-        new_y = event.y - m.offset_y
-        
-        # Calculate display dimensions
-        display_width = (canvas.coords(m.rect)[2] - canvas.coords(m.rect)[0])
-        display_height = (canvas.coords(m.rect)[3] - canvas.coords(m.rect)[1])
+        x, y = pointer(event)
+        new_x = x - view.offset_x
+        new_y = y - view.offset_y
+        width, height = m.logical_size()
         
-        # Edge collision detection
-        canvas_display_width = canvas.winfo_width()
-        canvas_display_height = canvas.winfo_height()
+        # Monitor snapping, with the threshold measured on screen
+        threshold = var.snap_threshold * var.projection.factor
+        new_x, new_y = edges.snap(m.name, new_x, new_y, width, height, threshold)
         
-        new_x = max(0, min(canvas_display_width - display_width, new_x))
-        new_y = max(0, min(canvas_display_height - display_height, new_y))
+        m.x = round(new_x)
+        m.y = round(new_y)
         
-        # Monitor snapping
-        for other in var.monitors:
-            if other is not m:
-                # Snap to left edge
-                if abs(new_x - (canvas.coords(other.rect)[2])) < var.snap_threshold:
-                    new_x = canvas.coords(other.rect)[2]
-                # Snap to right edge
-                elif abs(new_x + display_width - canvas.coords(other.rect)[0]) < var.snap_threshold:
-                    new_x = canvas.coords(other.rect)[0] - display_width
-                # Snap to top edge
-                if abs(new_y - (canvas.coords(other.rect)[3])) < var.snap_threshold:
-                    new_y = canvas.coords(other.rect)[3]
-                # Snap to bottom edge
-                elif abs(new_y + display_height - canvas.coords(other.rect)[1]) < var.snap_threshold:
-                    new_y = canvas.coords(other.rect)[1] - display_height
-        
-        # Update display position (scaled down)
-        canvas.coords(m.rect, new_x, new_y, new_x + display_width, new_y + display_height)
-        canvas.coords(m.text, new_x + display_width / 2, new_y + display_height / 2)
-        
-        # Update actual position (scaled up)
-        m.x = int(new_x * var.SCALE_FACTOR)
-        m.y = int(new_y * var.SCALE_FACTOR)
-        
-        canvas.itemconfig(m.text, text=f"{m.name}\n{m.width}x{m.height}\n@{m.x},{m.y}")
+        drag["moved"] = True
+        if drag["job"] is None:
+            drag["job"] = canvas.after_idle(redraw)
+        if var.preview is not None:
+            var.preview.changed()
+    
+    def drop(event):
+        if not drag["moved"]:
+            return
+        if drag["job"] is not None:
+            canvas.after_cancel(drag["job"])
+            redraw()
+        drag["moved"] = False
+        edges.add(m.name, m.x, m.y, m.right, m.bottom)
+        if var.preview is not None:
+            var.preview.flush()
     
     def set_primary(event):
-        for other in var.monitors:
-            if other is not m:
-                other.primary = False
+        for other in var.views.values():
+            if other is not view and other.output.primary:
                 canvas.itemconfig(other.rect, outline="black", width=1)
-        m.primary = True
-        canvas.itemconfig(m.rect, outline="green", width=3)
+        var.layout.set_primary(m.name)
+        canvas.itemconfig(view.rect, outline="green", width=3)
     
     canvas.tag_bind(m.name, '<Button-1>', start_drag)
     canvas.tag_bind(m.name, '<B1-Motion>', dragging)
-    canvas.tag_bind(m.name, '<Button-3>', set_primary)
\ No newline at end of file
+    canvas.tag_bind(m.name, '<ButtonRelease-1>', drop)
+    canvas.tag_bind(m.name, '<Button-3>', set_primary)
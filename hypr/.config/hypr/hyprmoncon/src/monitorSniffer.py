@@ -1,30 +1,29 @@
-import subprocess
+from ipc import get_monitors
+from edid import read_monitor_edids
+
+def mode_entry(mode):
+    if mode is None:
+        return None
+    return {"width": mode.width, "height": mode.height, "refresh_rate": mode.refresh}
 
 def get_connected_monitors():
-    result = subprocess.run(["hyprctl", "monitors"], capture_output=True, text=True)
-    lines = result.stdout.splitlines()
+    edids = read_monitor_edids()
     parsed_monitors = []
-    current = {}
-    
-    for line in lines:
-        if "Monitor" in line:
-            if current:
-                parsed_monitors.append(current)
-            current = {}
-            current["name"] = line.split("Monitor")[1].strip().split(" ")[0]
-        elif " at " in line:
-            parts = line.strip().split(" at ")
-            res_part = parts[0].split("@")[0]
-            pos_part = parts[1]
-            width, height = res_part.split("x")
-            x, y = pos_part.split("x")
-            current["width"] = int(width)
-            current["height"] = int(height)
-            current["x"] = int(x)
-            current["y"] = int(y)
-        elif "model" in line:
-            current["serial"] = line.strip().split()[-1]
-    
-    if current:
-        parsed_monitors.append(current)
+    for m in get_monitors():
+        edid = edids.get(m.name)
+        parsed_monitors.append({
+            "name": m.name,
+            "serial": m.serial,
+            "description": m.description,
+            "width": m.width,
+            "height": m.height,
+            "refresh_rate": m.refresh_rate,
+            "x": m.x,
+            "y": m.y,
+            "scale": m.scale,
+            "transform": m.transform,
+            # What the panel reports, which may differ from the mode it runs at
+            "native_mode": mode_entry(edid.native_mode) if edid else None,
+            "preferred_mode": mode_entry(edid.preferred_mode) if edid else None,
+        })
     return parsed_monitors
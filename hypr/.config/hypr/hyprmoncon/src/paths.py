@@ -0,0 +1,10 @@
+import os
+
+# Files shared by the editor and the headless tools; kept apart from var so
+# importing them never loads the editor's state
+LAYOUT_PATH = os.path.expanduser("~/.config/hypr/hyprmoncon/layout.json")
+WORKSPACES_PATH = os.path.expanduser("~/.config/hypr/monitor_workspaces.conf")
+HISTORY_PATH = os.path.join(
+    os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state"),
+    "hyprmoncon", "history.json"
+)
@@ -0,0 +1,104 @@
+import time
+
+import var
+import ipc
+import tracing
+from apply import refresh_for, monitor_rule
+from model import Layout
+from monitor import edges
+from viewport import redraw
+
+# At most one batched request per interval while dragging
+PREVIEW_INTERVAL = 0.1
+
+class LivePreview:
+    # Pushes the edited layout to Hyprland while monitors are dragged. The
+    # first change goes out at once, later ones are coalesced into at most one
+    # request per interval, and dropping a monitor flushes what is pending.
+    # Only outputs whose monitor rule changed since the last request are sent.
+    def __init__(self, canvas, interval=PREVIEW_INTERVAL):
+        self.canvas = canvas
+        self.interval = interval
+        self.job = None
+        self.pending = False
+        self.last = 0.0
+        self.requests = 0
+        self.baseline()
+
+    def baseline(self):
+        # What cancel goes back to: the live configuration and editor positions now
+        self.before = ipc.get_monitors()
+        self.live = {m.name: m for m in self.before}
+        self.sent = self.before_rules()
+        self.positions = {o.name: (o.x, o.y) for o in var.layout}
+
+    def before_rules(self):
+        rules = {}
+        for monitor, output in zip(self.before, Layout.from_monitors(self.before, {})):
+            rules[output.name] = f"{output.name},disable" if monitor.disabled else monitor_rule(output, output.refresh_rate)
+        return rules
+
+    def changed(self):
+        self.pending = True
+        if self.job is not None:
+            return
+        wait = self.last + self.interval - time.monotonic()
+        if wait <= 0:
+            self.push()
+        else:
+            self.job = self.canvas.after(int(wait * 1000) + 1, self.on_timer)
+
+    def on_timer(self):
+        self.job = None
+        if self.pending:
+            self.push()
+
+    def flush(self):
+        # Trailing edge: the final position must not wait for the timer
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+            self.job = None
+        if self.pending:
+            self.push()
+
+    def push(self):
+        self.pending = False
+        self.last = time.monotonic()
+        rules = {o.name: monitor_rule(o, refresh_for(o, self.live.get(o.name))) for o in var.layout}
+        self.send(rules)
+
+    def send(self, rules):
+        commands = [f"keyword monitor {rule}" for name, rule in rules.items() if self.sent.get(name) != rule]
+        if not commands:
+            return
+        try:
+            with tracing.span("preview.push"):
+                ipc.batch(commands)
+        except OSError as e:
+            print(f"⚠️ Live preview failed: {e}")
+            return
+        self.sent.update(rules)
+        self.requests += 1
+
+    def revert(self):
+        # Put Hyprland back to the pre-edit configuration, in one request
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+            self.job = None
+        self.pending = False
+        self.send(self.before_rules())
+
+    def cancel(self):
+        # Undo the edit: the compositor and the monitors on the canvas
+        self.revert()
+        for name, (x, y) in self.positions.items():
+            output = var.layout.get(name)
+            if output is not None:
+                output.x, output.y = x, y
+                edges.add(name, output.x, output.y, output.right, output.bottom)
+        redraw(self.canvas)
+
+    def commit(self):
+        # Keep what is shown; later cancels come back here
+        self.flush()
+        self.baseline()
@@ -0,0 +1,37 @@
+class Projection:
+    # Maps Hyprland layout coordinates (logical pixels) to canvas coordinates.
+    # The layout model is authoritative; the canvas is only ever derived from it.
+    def __init__(self, factor, origin_x=0, origin_y=0):
+        self.factor = factor
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+    def to_canvas(self, x, y):
+        return (x - self.origin_x) / self.factor, (y - self.origin_y) / self.factor
+
+    def to_layout(self, canvas_x, canvas_y):
+        # Unrounded; callers round once the final position is known
+        return canvas_x * self.factor + self.origin_x, canvas_y * self.factor + self.origin_y
+
+    def rect(self, output):
+        x0, y0 = self.to_canvas(output.x, output.y)
+        x1, y1 = self.to_canvas(output.right, output.bottom)
+        return x0, y0, x1, y1
+
+    def fit(self, box, width, height, margin=20):
+        # Zoom so box (x0, y0, x1, y1) fills the canvas, centred, with a margin
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        usable_width = max(1, width - 2 * margin)
+        usable_height = max(1, height - 2 * margin)
+        self.factor = max((x1 - x0) / usable_width, (y1 - y0) / usable_height, 1)
+        self.origin_x = x0 - (width * self.factor - (x1 - x0)) / 2
+        self.origin_y = y0 - (height * self.factor - (y1 - y0)) / 2
+
+def canvas_size(canvas):
+    # Before the window is mapped winfo_* reports 1x1; fall back to the requested size
+    width, height = canvas.winfo_width(), canvas.winfo_height()
+    if width <= 1 or height <= 1:
+        return int(canvas["width"]), int(canvas["height"])
+    return width, height
@@ -0,0 +1,166 @@
+# Config reload in one process: what workspaceCache.sh save, hyprmoncon.sh,
+# initWorkspace.sh and workspaceCache.sh release did as four shell stages,
+# each querying hyprctl again. Here the compositor is read once and the
+# monitor rules and workspace moves go out together in a single batch, so
+# windows never pass through the intermediate arrangements.
+
+import os
+import re
+import time
+
+import paths
+import ipc
+import tracing
+from apply import apply_layout, auto_align
+from edid import read_monitor_ids
+
+WORKSPACES_PER_MONITOR = 10
+# reorganizeWorkspaces.sh holds this file while it moves workspaces around;
+# like workspaceCache.sh release, wait up to the timeout for it to finish
+REORGANIZE_LOCK = "mmws_reorganize.lock"
+REORGANIZE_TIMEOUT = 10
+REORGANIZE_POLL = 0.2
+# workspace = 11, monitor:DP-3, default:true
+WORKSPACE_RULE = re.compile(r"^\s*workspace\s*=\s*(\d+)\s*,(.*)$")
+
+def wait_for_reorganize(timeout=REORGANIZE_TIMEOUT):
+    # Seconds waited and whether the lock was still held when giving up
+    path = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", REORGANIZE_LOCK)
+    waited = 0.0
+    while os.path.exists(path):
+        if waited >= timeout:
+            return waited, True
+        time.sleep(REORGANIZE_POLL)
+        waited += REORGANIZE_POLL
+    return waited, False
+
+class Snapshot:
+    # Live monitors (ipc.MonitorInfo) and workspace -> monitor name
+    def __init__(self, monitors, workspaces):
+        self.monitors = monitors
+        self.workspaces = workspaces
+
+    @classmethod
+    def take(cls, path=None):
+        with tracing.span("snapshot"):
+            monitors = ipc.get_monitors(path)
+            workspaces = {w["id"]: w["monitor"] for w in ipc.request_json("workspaces", path) if w["id"] > 0}
+        return cls(monitors, workspaces)
+
+    def active(self):
+        # The "save" stage: what every enabled monitor shows right now
+        return {m.name: m.active_workspace for m in self.monitors if not m.disabled}
+
+    def focused(self):
+        return next((m.name for m in self.monitors if m.focused), None)
+
+def read_workspace_rules(path=paths.WORKSPACES_PATH):
+    # workspace -> (monitor, default) from the uncommented rules in path
+    rules = {}
+    try:
+        with open(path) as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return rules
+    for line in lines:
+        match = WORKSPACE_RULE.match(line)
+        if match is None:
+            continue
+        options = dict(option.strip().partition(":")[::2] for option in match.group(2).split(","))
+        if options.get("monitor"):
+            rules[int(match.group(1))] = (options["monitor"], options.get("default") == "true")
+    return rules
+
+def assign_workspaces(monitor_names, rules):
+    # monitor -> (workspaces, default workspace). Monitors the rules name keep
+    # their rules; the others get initWorkspace.sh's blocks of ten by position.
+    assigned = {}
+    for workspace, (monitor, default) in sorted(rules.items()):
+        if monitor in monitor_names:
+            workspaces, first = assigned.get(monitor, ([], None))
+            workspaces.append(workspace)
+            assigned[monitor] = (workspaces, workspace if default or first is None else first)
+
+    for index, monitor in enumerate(monitor_names):
+        if monitor in assigned:
+            continue
+        block = range(index * WORKSPACES_PER_MONITOR + 1, (index + 1) * WORKSPACES_PER_MONITOR + 1)
+        workspaces = [w for w in block if w not in rules]
+        if workspaces:
+            assigned[monitor] = (workspaces, workspaces[0])
+    return assigned
+
+def workspace_commands(snapshot, assigned):
+    # Move existing workspaces onto their monitors, then bring every monitor
+    # back to the workspace it showed before (the "release" stage) or to its
+    # default when that one now belongs elsewhere
+    owner = {w: monitor for monitor, (workspaces, _) in assigned.items() for w in workspaces}
+    commands = []
+    for workspace, monitor in sorted(snapshot.workspaces.items()):
+        target = owner.get(workspace)
+        if target is not None and target != monitor:
+            commands.append(f"dispatch moveworkspacetomonitor {workspace} {target}")
+
+    switched = False
+    for monitor, active in snapshot.active().items():
+        if monitor not in assigned:
+            continue
+        workspaces, default = assigned[monitor]
+        target = active if active in workspaces else default
+        if target != active:
+            commands.append(f"dispatch focusmonitor {monitor}")
+            commands.append(f"dispatch workspace {target}")
+            switched = True
+
+    focused = snapshot.focused()
+    if switched and focused is not None:
+        commands.append(f"dispatch focusmonitor {focused}")
+    return commands
+
+class ReconfigureResult:
+    def __init__(self, snapshot, apply_result, commands):
+        self.snapshot = snapshot
+        self.apply_result = apply_result
+        self.commands = commands
+        self.total_ms = 0.0
+        # Time spent waiting for reorganizeWorkspaces.sh, and whether it timed out
+        self.lock_wait_ms = 0.0
+        self.lock_timed_out = False
+
+    def report(self):
+        lines = []
+        if self.lock_timed_out:
+            lines.append(f"⚠️ reorganizeWorkspaces.sh still running after {self.lock_wait_ms / 1000:.0f} s, continuing anyway")
+        elif self.lock_wait_ms:
+            lines.append(f"⏳ Waited {self.lock_wait_ms:.0f} ms for reorganizeWorkspaces.sh")
+        lines.append(self.apply_result.report())
+        moves = sum(1 for c in self.commands if c.startswith("dispatch moveworkspacetomonitor"))
+        switches = sum(1 for c in self.commands if c.startswith("dispatch workspace"))
+        sent = ", dry run" if self.apply_result.dry_run else ""
+        lines.append(f"✅ Workspaces: {moves} moved, {switches} switched "
+                     f"({len(self.commands)} commands{sent}, {self.total_ms:.1f} ms total)")
+        return "\n".join(lines)
+
+def reconfigure(store, monitor_ids=None, rules_path=paths.WORKSPACES_PATH, dry_run=False):
+    start = time.perf_counter()
+    # The snapshot drives the workspace moves, so it must not be taken mid-reorganize
+    waited, timed_out = wait_for_reorganize()
+    snapshot = Snapshot.take()
+    if monitor_ids is None:
+        monitor_ids = read_monitor_ids()
+
+    names = [m.name for m in sorted(snapshot.monitors, key=lambda m: m.id) if not m.disabled]
+    commands = workspace_commands(snapshot, assign_workspaces(names, read_workspace_rules(rules_path)))
+
+    layout_name = store.best_match(monitor_ids.values())
+    if layout_name is None:
+        apply_result = auto_align(snapshot.monitors, dry_run=dry_run, then=commands)
+    else:
+        apply_result = apply_layout(layout_name, store.get(layout_name), snapshot.monitors,
+                                    dry_run=dry_run, then=commands)
+
+    result = ReconfigureResult(snapshot, apply_result, apply_result.commands)
+    result.lock_wait_ms = waited * 1000
+    result.lock_timed_out = timed_out
+    result.total_ms = (time.perf_counter() - start) * 1000
+    return result
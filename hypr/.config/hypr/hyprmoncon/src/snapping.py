@@ -0,0 +1,65 @@
+import bisect
+
+class EdgeIndex:
+    # Layout rectangles of the placed monitors with each edge kept in a sorted
+    # list, so snapping a dragged monitor is a bisect instead of a scan (and no
+    # Tcl round-trips for coords)
+    def __init__(self):
+        self.rects = {}
+        self.lefts = []
+        self.tops = []
+        self.rights = []
+        self.bottoms = []
+
+    def edge_lists(self):
+        return (self.lefts, self.tops, self.rights, self.bottoms)
+
+    def add(self, key, x0, y0, x1, y1):
+        self.remove(key)
+        self.rects[key] = (x0, y0, x1, y1)
+        for edges, value in zip(self.edge_lists(), (x0, y0, x1, y1)):
+            bisect.insort(edges, (value, key))
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        for edges, value in zip(self.edge_lists(), rect):
+            del edges[bisect.bisect_left(edges, (value, key))]
+
+    def clear(self):
+        self.rects.clear()
+        for edges in self.edge_lists():
+            edges.clear()
+
+    def nearest(self, edges, value, threshold, exclude):
+        # Closest edge strictly within threshold of value, ignoring the dragged monitor
+        best = None
+        i = bisect.bisect_left(edges, (value - threshold,))
+        while i < len(edges) and edges[i][0] < value + threshold:
+            edge, key = edges[i]
+            if key != exclude and abs(edge - value) < threshold:
+                if best is None or abs(edge - value) < abs(best - value):
+                    best = edge
+            i += 1
+        return best
+
+    def snap(self, key, x, y, width, height, threshold):
+        # Left edge onto another monitor's right edge, else right edge onto a left edge
+        edge = self.nearest(self.rights, x, threshold, key)
+        if edge is not None:
+            x = edge
+        else:
+            edge = self.nearest(self.lefts, x + width, threshold, key)
+            if edge is not None:
+                x = edge - width
+
+        # Top edge onto a bottom edge, else bottom edge onto a top edge
+        edge = self.nearest(self.bottoms, y, threshold, key)
+        if edge is not None:
+            y = edge
+        else:
+            edge = self.nearest(self.tops, y + height, threshold, key)
+            if edge is not None:
+                y = edge - height
+        return x, y
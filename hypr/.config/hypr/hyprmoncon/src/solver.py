@@ -0,0 +1,200 @@
+import heapq
+import bisect
+from collections import deque
+from dataclasses import dataclass
+
+# Relation -> (axis the monitors touch on, whether a and b swap)
+RELATIONS = {
+    "left-of": ("x", False),
+    "right-of": ("x", True),
+    "above": ("y", False),
+    "below": ("y", True),
+}
+# Cross-axis alignment allowed for each axis; the first one is the default
+ALIGNMENTS = {
+    "x": ("top", "bottom", "center"),
+    "y": ("left", "right", "center"),
+}
+
+@dataclass(slots=True)
+class Constraint:
+    # "a left-of b bottom": a sits directly left of b, bottom edges aligned
+    relation: str
+    a: str
+    b: str
+    align: str = None
+
+    def __post_init__(self):
+        if self.relation not in RELATIONS:
+            raise ValueError(f"Unknown relation {self.relation!r}")
+        axis, _ = RELATIONS[self.relation]
+        if self.align is None:
+            self.align = ALIGNMENTS[axis][0]
+        elif self.align not in ALIGNMENTS[axis]:
+            raise ValueError(f"{self.relation} aligns {'/'.join(ALIGNMENTS[axis])}, not {self.align!r}")
+
+    def __str__(self):
+        return f"{self.a} {self.relation} {self.b} {self.align}"
+
+def parse_constraint(text):
+    words = text.split()
+    if len(words) not in (3, 4):
+        raise ValueError(f"Expected 'A RELATION B [ALIGN]', got {text!r}")
+    a, relation, b = words[:3]
+    return Constraint(relation, a, b, words[3] if len(words) == 4 else None)
+
+def chain(names, relation="left-of"):
+    # Outputs side by side in the given order
+    return [Constraint(relation, a, b) for a, b in zip(names, names[1:])]
+
+def cross_offset(align, size_a, size_b):
+    if align in ("top", "left"):
+        return 0
+    if align in ("bottom", "right"):
+        return size_a - size_b
+    return (size_a - size_b) // 2
+
+def offset(constraint, sizes):
+    # Position of b relative to a, in logical pixels
+    axis, swapped = RELATIONS[constraint.relation]
+    a, b = (constraint.b, constraint.a) if swapped else (constraint.a, constraint.b)
+    (wa, ha), (wb, hb) = sizes[a], sizes[b]
+    if axis == "x":
+        delta = (wa, cross_offset(constraint.align, ha, hb))
+    else:
+        delta = (cross_offset(constraint.align, wa, wb), ha)
+    return a, b, delta
+
+def solve(layout, constraints=()):
+    # Every constraint fixes b's position relative to a, so each connected group
+    # of outputs is placed by one walk over the constraint graph. The primary
+    # output's group is placed first with the primary at 0x0; unconstrained
+    # groups follow to the right, top-aligned with the rightmost output.
+    sizes = {o.name: o.logical_size() for o in layout}
+    graph = {name: [] for name in sizes}
+    for constraint in constraints:
+        for name in (constraint.a, constraint.b):
+            if name not in graph:
+                raise ValueError(f"Constraint {constraint} names unknown output {name}")
+        a, b, (dx, dy) = offset(constraint, sizes)
+        graph[a].append((b, dx, dy, constraint))
+        graph[b].append((a, -dx, -dy, constraint))
+
+    primary = layout.primary()
+    order = [o.name for o in layout]
+    if primary is not None:
+        order.remove(primary.name)
+        order.insert(0, primary.name)
+
+    positions = {}
+    right_edge = None  # (right, top) of the output reaching furthest right
+    for root in order:
+        if root in positions:
+            continue
+        group = {root: (0, 0)}
+        queue = deque([root])
+        while queue:
+            name = queue.popleft()
+            x, y = group[name]
+            for other, dx, dy, constraint in graph[name]:
+                position = (x + dx, y + dy)
+                if other not in group:
+                    group[other] = position
+                    queue.append(other)
+                elif group[other] != position:
+                    raise ValueError(f"Constraint {constraint} conflicts with the others")
+
+        if right_edge is not None:
+            left = min(x for x, _ in group.values())
+            top = min(y for name, (_, y) in group.items() if group[name][0] == left)
+            shift_x, shift_y = right_edge[0] - left, right_edge[1] - top
+            group = {name: (x + shift_x, y + shift_y) for name, (x, y) in group.items()}
+        positions.update(group)
+        for name, (x, y) in group.items():
+            if right_edge is None or x + sizes[name][0] > right_edge[0]:
+                right_edge = (x + sizes[name][0], y)
+
+    for output in layout:
+        output.x, output.y = positions[output.name]
+
+    overlapping = layout.overlaps()
+    if overlapping:
+        pairs = ", ".join(f"{a}/{b}" for a, b in overlapping)
+        raise ValueError(f"Constraints make outputs overlap: {pairs}")
+    return layout
+
+def closest_alignment(axis, a, b):
+    # Alignment of b against a that moves b the least
+    (wa, ha), (wb, hb) = a.logical_size(), b.logical_size()
+    if axis == "x":
+        size_a, size_b, delta = ha, hb, b.y - a.y
+    else:
+        size_a, size_b, delta = wa, wb, b.x - a.x
+    return min(ALIGNMENTS[axis], key=lambda align: abs(cross_offset(align, size_a, size_b) - delta))
+
+def nearest_first(edges, value):
+    # (distance, name) from a sorted [(edge, name)] list, closest edge first
+    after = bisect.bisect_left(edges, (value,))
+    before = after - 1
+    while before >= 0 or after < len(edges):
+        if after == len(edges) or (before >= 0 and value - edges[before][0] <= edges[after][0] - value):
+            yield value - edges[before][0], edges[before][1]
+            before -= 1
+        else:
+            yield edges[after][0] - value, edges[after][1]
+            after += 1
+
+def attachments(other, output):
+    # Ways to attach output to an earlier output: beside it, and above or below it
+    yield Constraint("left-of", other.name, output.name, closest_alignment("x", other, output))
+    upper, lower = (other, output) if other.y < output.y else (output, other)
+    yield Constraint("above", upper.name, lower.name, closest_alignment("y", upper, lower))
+
+def collides(slot, size, placed, sizes):
+    x, y = slot
+    return any(x < px + sizes[name][0] and px < x + size[0] and y < py + sizes[name][1] and py < y + size[1]
+               for name, (px, py) in placed.items())
+
+def infer_constraints(layout):
+    # Turn a hand-made arrangement into constraints: every output attaches to
+    # whichever earlier output (left to right) it needs to move least to touch,
+    # so the constraints form a tree and can never conflict. Candidates come
+    # nearest edge first, which bounds how far the search has to go. Slots that
+    # an already placed output occupies are skipped; the slot right of whichever
+    # placed output reaches furthest right is always free, so one is found.
+    outputs = sorted(layout, key=lambda o: (o.x, o.y))
+    rank = {o.name: index for index, o in enumerate(outputs)}
+    sizes = {o.name: o.logical_size() for o in outputs}
+    rights = sorted((o.right, o.name) for o in outputs)
+    bottoms = sorted((o.bottom, o.name) for o in outputs)
+    tops = sorted((o.y, o.name) for o in outputs)
+    placed = {outputs[0].name: (outputs[0].x, outputs[0].y)}  # where solve will put each output
+
+    constraints = []
+    for output in outputs[1:]:
+        best = None
+        seen = set()
+        candidates = heapq.merge(
+            nearest_first(rights, output.x),
+            nearest_first(bottoms, output.y),
+            nearest_first(tops, output.bottom),
+        )
+        for gap, name in candidates:
+            if best is not None and gap >= best[0]:
+                break
+            if name in seen or rank[name] >= rank[output.name]:
+                continue
+            seen.add(name)
+            for constraint in attachments(layout.get(name), output):
+                a, b, (dx, dy) = offset(constraint, sizes)
+                ax, ay = placed[name]
+                slot = (ax + dx, ay + dy) if b == output.name else (ax - dx, ay - dy)
+                if collides(slot, sizes[output.name], placed, sizes):
+                    continue
+                a, b = layout.get(a), layout.get(b)
+                distance = abs(b.x - a.x - dx) + abs(b.y - a.y - dy)
+                if best is None or (distance, rank[name]) < best[:2]:
+                    best = (distance, rank[name], constraint, slot)
+        constraints.append(best[2])
+        placed[output.name] = best[3]
+    return constraints
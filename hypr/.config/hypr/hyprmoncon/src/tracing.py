@@ -0,0 +1,150 @@
+# Opt-in timing spans and counters. HYPR_TRACE=FILE appends one JSON record
+# per process (the daemon writes one per hotplug) to FILE, HYPR_TRACE=- to
+# stderr; unset, span() hands out a shared no-op and nothing is recorded.
+# The music widget links this same file (music/tracing.py), so one trace file
+# and `hyprmoncon stats` cover both; its entry points set TOOL.
+
+import os
+import sys
+import json
+import time
+import atexit
+from collections import Counter, deque
+
+TRACE_PATH = os.environ.get("HYPR_TRACE")
+# Which program a record comes from; `stats` groups records by it
+TOOL = "hyprmoncon"
+# Individual timings kept per record, for percentiles in `stats`
+RECENT = 256
+
+enabled = bool(TRACE_PATH)
+spans = {}  # name -> [count, total ms, max ms]
+counters = Counter()
+recent = deque(maxlen=RECENT)  # (name, wall clock start, ms)
+started = time.time()
+
+class Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        add(self.name, (time.perf_counter() - self.start) * 1000)
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+NULL_SPAN = NullSpan()
+
+def span(name):
+    return Span(name) if enabled else NULL_SPAN
+
+def add(name, ms):
+    # Record a duration measured elsewhere (e.g. across event loop iterations)
+    if not enabled:
+        return
+    stats = spans.get(name)
+    if stats is None:
+        spans[name] = [1, ms, ms]
+    else:
+        stats[0] += 1
+        stats[1] += ms
+        stats[2] = max(stats[2], ms)
+    recent.append((name, round(time.time() - ms / 1000, 3), round(ms, 3)))
+
+def count(name, n=1):
+    if enabled:
+        counters[name] += n
+
+def snapshot():
+    return {
+        "tool": TOOL,
+        "pid": os.getpid(),
+        "argv": sys.argv,
+        "started": round(started, 3),
+        "time": round(time.time(), 3),
+        "enabled": enabled,
+        "spans": {name: {"count": c, "total_ms": round(total, 3), "max_ms": round(peak, 3)}
+                  for name, (c, total, peak) in spans.items()},
+        "counters": dict(counters),
+        "recent": list(recent),
+    }
+
+def reset():
+    global started
+    spans.clear()
+    counters.clear()
+    recent.clear()
+    started = time.time()
+
+def dump():
+    if not enabled or not (spans or counters):
+        return
+    line = json.dumps(snapshot()) + "\n"
+    reset()
+    if TRACE_PATH == "-":
+        sys.stderr.write(line)
+        return
+    # A single O_APPEND write, so concurrent processes never interleave records
+    try:
+        fd = os.open(TRACE_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print(f"⚠️ Failed to write trace: {e}", file=sys.stderr)
+
+def read_records(path):
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # cut short by a crash
+    return records
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def summarize(records):
+    # Spans and counters merged across records, split by tool
+    tools = {}
+    for record in records:
+        tool = tools.setdefault(record.get("tool", "?"), {"records": 0, "spans": {}, "counters": Counter()})
+        tool["records"] += 1
+        tool["counters"].update(record.get("counters", {}))
+        for name, stats in record.get("spans", {}).items():
+            merged = tool["spans"].setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": []})
+            merged["count"] += stats["count"]
+            merged["total_ms"] += stats["total_ms"]
+            merged["max_ms"] = max(merged["max_ms"], stats["max_ms"])
+        for name, _, ms in record.get("recent", ()):
+            if name in tool["spans"]:
+                tool["spans"][name]["samples"].append(ms)
+
+    for tool in tools.values():
+        tool["counters"] = dict(tool["counters"])
+        for stats in tool["spans"].values():
+            samples = stats.pop("samples")
+            stats["total_ms"] = round(stats["total_ms"], 3)
+            stats["mean_ms"] = round(stats["total_ms"] / stats["count"], 3)
+            stats["p50_ms"] = percentile(samples, 0.5) if samples else None
+            stats["p95_ms"] = percentile(samples, 0.95) if samples else None
+    return tools
+
+if enabled:
+    atexit.register(dump)
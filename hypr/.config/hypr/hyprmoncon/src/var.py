@@ -1,9 +1,15 @@
-import os
+from model import Layout
+from projection import Projection
 
-monitors = []
-canvas_width = 1920
-canvas_height = 1080
+# Layout being edited and the canvas view of each of its outputs, by name
+layout = Layout()
+views = {}
 snap_threshold = 15
 SCALE_FACTOR = 8
-LAYOUT_PATH = os.path.expanduser("~/.config/hypr/hyprmoncon/layout.json")
-data = None
\ No newline at end of file
+# Layout -> canvas mapping; refitted whenever a layout is shown
+projection = Projection(SCALE_FACTOR)
+# Refit the view to the layout on window resizes until the user zooms or pans
+auto_fit = True
+# preview.LivePreview while the editor pushes changes to Hyprland, else None
+preview = None
+store = None
\ No newline at end of file
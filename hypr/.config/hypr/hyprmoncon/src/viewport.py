@@ -0,0 +1,118 @@
+import var
+from monitor import draw
+from projection import canvas_size
+
+ZOOM_STEP = 1.25
+# Layout pixels per canvas pixel, from 2x magnified out to a whole video wall
+MIN_FACTOR = 0.5
+MAX_FACTOR = 200
+CONTROL = 0x4
+SHIFT = 0x1
+
+def redraw(canvas):
+    # draw() skips items whose coordinates and label didn't change
+    for view in var.views.values():
+        draw(canvas, view)
+
+def update_scrollregion(canvas, keep_view=True):
+    # The layout plus half a viewport of room around it, so monitors can be
+    # dragged past its edges, and the part currently shown (or, right after a
+    # fit, the part about to be), so changing the region never makes the view jump
+    width, height = canvas_size(canvas)
+    left, top = (canvas.canvasx(0), canvas.canvasy(0)) if keep_view else (0, 0)
+    x0, y0, x1, y1 = left, top, left + width, top + height
+    box = var.layout.bounding_box()
+    if box is not None:
+        bx0, by0 = var.projection.to_canvas(box[0], box[1])
+        bx1, by1 = var.projection.to_canvas(box[2], box[3])
+        x0, y0 = min(x0, bx0 - width / 2), min(y0, by0 - height / 2)
+        x1, y1 = max(x1, bx1 + width / 2), max(y1, by1 + height / 2)
+    canvas.config(scrollregion=(x0, y0, x1, y1))
+    return x0, y0, x1, y1
+
+def fit(canvas):
+    # Zoom and scroll so the whole layout is visible; resizing the window
+    # refits until the user zooms or pans
+    width, height = canvas_size(canvas)
+    var.projection.fit(var.layout.bounding_box(), width, height)
+    var.auto_fit = True
+    redraw(canvas)
+    # Projection.fit centres the layout in canvas coordinates 0..width, 0..height
+    x0, y0, x1, y1 = update_scrollregion(canvas, keep_view=False)
+    canvas.xview_moveto((0 - x0) / (x1 - x0))
+    canvas.yview_moveto((0 - y0) / (y1 - y0))
+
+def zoom(canvas, step, x=None, y=None):
+    # Zoom by step (> 1 is in) keeping window point x, y (default: the
+    # centre) in place. Tk rescales every item itself in one call; only
+    # labels whose level of detail changed are touched afterwards.
+    width, height = canvas_size(canvas)
+    if x is None:
+        x, y = width / 2, height / 2
+    projection = var.projection
+    factor = min(MAX_FACTOR, max(MIN_FACTOR, projection.factor / step))
+    step = projection.factor / factor
+    if step == 1:
+        return
+    cx, cy = canvas.canvasx(x), canvas.canvasy(y)
+    canvas.scale("all", cx, cy, step, step)
+    projection.origin_x -= cx * (1 - step) * projection.factor / step
+    projection.origin_y -= cy * (1 - step) * projection.factor / step
+    projection.factor = factor
+    var.auto_fit = False
+
+    for view in var.views.values():
+        view.drawn = projection.rect(view.output)
+        draw(canvas, view)
+    update_scrollregion(canvas)
+
+def pan(canvas, dx, dy):
+    # Scroll by whole canvas units, as the scrollbars do
+    var.auto_fit = False
+    if dx:
+        canvas.xview_scroll(dx, "units")
+    if dy:
+        canvas.yview_scroll(dy, "units")
+
+def bind(canvas):
+    fit_job = None
+
+    def refit():
+        nonlocal fit_job
+        fit_job = None
+        if var.auto_fit:
+            fit(canvas)
+        else:
+            update_scrollregion(canvas)
+
+    def on_resize(event):
+        # Window managers resize in bursts; refit once they settle
+        nonlocal fit_job
+        if fit_job is None:
+            fit_job = canvas.after_idle(refit)
+
+    def on_wheel(event, delta):
+        if event.state & CONTROL:
+            zoom(canvas, ZOOM_STEP if delta > 0 else 1 / ZOOM_STEP, event.x, event.y)
+        elif event.state & SHIFT:
+            pan(canvas, -delta, 0)
+        else:
+            pan(canvas, 0, -delta)
+
+    def start_pan(event):
+        var.auto_fit = False
+        canvas.scan_mark(event.x, event.y)
+
+    canvas.bind("<Configure>", on_resize)
+    # X11 reports wheel steps as buttons 4 and 5, everything else as <MouseWheel>
+    canvas.bind("<Button-4>", lambda event: on_wheel(event, 1))
+    canvas.bind("<Button-5>", lambda event: on_wheel(event, -1))
+    canvas.bind("<MouseWheel>", lambda event: on_wheel(event, 1 if event.delta > 0 else -1))
+    canvas.bind("<ButtonPress-2>", start_pan)
+    canvas.bind("<B2-Motion>", lambda event: canvas.scan_dragto(event.x, event.y, gain=1))
+    # Dropped monitors may lie outside the region; item bindings have run by now
+    canvas.bind("<ButtonRelease-1>", lambda event: update_scrollregion(canvas), add="+")
+    canvas.bind_all("<Control-plus>", lambda event: zoom(canvas, ZOOM_STEP))
+    canvas.bind_all("<Control-equal>", lambda event: zoom(canvas, ZOOM_STEP))
+    canvas.bind_all("<Control-minus>", lambda event: zoom(canvas, 1 / ZOOM_STEP))
+    canvas.bind_all("<Control-0>", lambda event: fit(canvas))
@@ -0,0 +1,80 @@
+# Fake Hyprland instance for the tests: a temporary XDG_RUNTIME_DIR holding
+# hypr/<signature>/ with Unix sockets served from background threads, and a
+# stub hyprctl that logs its arguments.
+
+import os
+import sys
+import socket
+import shutil
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+HYPRCTL = """#!/bin/sh
+echo "$*" >> "{log}"
+echo '{reply}'
+"""
+
+class Instance:
+    def __init__(self, signature="test"):
+        self.root = tempfile.mkdtemp(prefix="hyprmoncon-test-")
+        self.signature = signature
+        self.dir = os.path.join(self.root, "hypr", signature)
+        os.makedirs(self.dir)
+        self.env = {"XDG_RUNTIME_DIR": self.root, "HYPRLAND_INSTANCE_SIGNATURE": signature}
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def hyprctl(self, reply=""):
+        # Stub hyprctl in its own bin directory; returns (bin dir, argument log)
+        bin_dir = os.path.join(self.root, "bin")
+        os.makedirs(bin_dir, exist_ok=True)
+        log = os.path.join(self.root, "hyprctl.log")
+        path = os.path.join(bin_dir, "hyprctl")
+        with open(path, "w") as f:
+            f.write(HYPRCTL.format(log=log, reply=reply))
+        os.chmod(path, 0o755)
+        return bin_dir, log
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+class Server:
+    # Accepts connections on path one at a time and runs handler(conn, n)
+    # for the n-th (from 0) of them
+    def __init__(self, path, handler):
+        self.handler = handler
+        self.connections = 0
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen(8)
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            n = self.connections
+            self.connections += 1
+            with conn:
+                try:
+                    self.handler(conn, n)
+                except OSError:
+                    pass
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self.thread.join(1)
+
+def read_request(conn):
+    # Hyprland reads a request in one go; the client then waits for the reply
+    return conn.recv(65536).decode()
@@ -0,0 +1,49 @@
+import os
+import unittest
+from unittest import mock
+
+import fakes
+from ipc import MonitorInfo
+from apply import apply_layout
+
+LIVE = [MonitorInfo(id=0, name="DP-1", description="", make="", model="", serial="", width=1920,
+                    height=1080, refresh_rate=60.0, x=0, y=0, scale=1.0, transform=0)]
+LAYOUT = [{"name": "DP-1", "monitor": "ser:1", "width": 1920, "height": 1080, "refresh_rate": 60.0}]
+
+class ApplyReportTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = fakes.Instance()
+        self.addCleanup(self.instance.close)
+        env = mock.patch.dict(os.environ, self.instance.env)
+        env.start()
+        self.addCleanup(env.stop)
+        self.requests = []
+        def handler(conn, n):
+            self.requests.append(fakes.read_request(conn))
+            conn.sendall(b"ok")
+        server = fakes.Server(self.instance.path(".socket.sock"), handler)
+        self.addCleanup(server.close)
+
+    def moved(self):
+        return [dict(LAYOUT[0], x=100)]
+
+    def test_sent_batch_is_reported(self):
+        result = apply_layout("desk", self.moved(), LIVE)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(result.requests, 1)
+        self.assertIn("1 changed, 1 request in", result.report())
+
+    def test_unchanged_layout_sends_nothing(self):
+        result = apply_layout("desk", LAYOUT, LIVE)
+        self.assertEqual(self.requests, [])
+        self.assertFalse(result.applied)
+        self.assertIn("0 changed, 0 requests)", result.report())
+
+    def test_dry_run_sends_nothing(self):
+        result = apply_layout("desk", self.moved(), LIVE, dry_run=True)
+        self.assertEqual(self.requests, [])
+        self.assertEqual(result.commands, ["keyword monitor DP-1,1920x1080@60,100x0,1,transform,0"])
+        self.assertIn("1 changed, dry run)", result.report())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import shutil
+import threading
+import unittest
+from unittest import mock
+
+import fakes
+import daemon
+from history import History
+
+DEBOUNCE = 0.1
+MONITOR = {"id": 0, "name": "DP-3", "description": "", "make": "", "model": "", "serial": "",
+           "width": 2560, "height": 1440, "refreshRate": 144.0, "x": 100, "y": 0,
+           "scale": 1.0, "transform": 0, "disabled": False}
+
+class RecordingDaemon(daemon.Daemon):
+    # Records when it would have applied instead of touching layouts or Hyprland
+    def __init__(self, root):
+        super().__init__(layout_path=os.path.join(root, "layout.json"), drm_path=root, debounce=DEBOUNCE)
+        self.applied = []
+
+    def apply(self):
+        self.applied.append(time.monotonic())
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = fakes.Instance()
+        self.addCleanup(self.instance.close)
+        env = mock.patch.dict(os.environ, self.instance.env)
+        env.start()
+        self.addCleanup(env.stop)
+        self.path = self.instance.path(".socket2.sock")
+        self.daemon = RecordingDaemon(self.instance.root)
+        self.sent = []
+
+    def events(self, *connections):
+        # One script per connection: event lines or pauses (seconds) in order;
+        # the connection is closed (EOF) when its script ends
+        def handler(conn, n):
+            if n >= len(connections):
+                time.sleep(10)
+                return
+            for step in connections[n]:
+                if isinstance(step, (int, float)):
+                    time.sleep(step)
+                else:
+                    conn.sendall(step.encode())
+                    self.sent.append(time.monotonic())
+        server = fakes.Server(self.path, handler)
+        self.addCleanup(server.close)
+        return server
+
+    def listen(self):
+        thread = threading.Thread(target=self.daemon.listen, args=(self.path,), daemon=True)
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def run_daemon(self):
+        thread = threading.Thread(target=self.daemon.run, args=(self.path,), daemon=True)
+        thread.start()
+        return thread
+
+    def test_hotplug_events_apply(self):
+        self.events(["monitoradded>>DP-3\n", 0.3, "monitorremovedv2>>1,DP-3,HP X27q\n", 0.3])
+        self.listen()
+        self.assertEqual(len(self.daemon.applied), 2)
+        for sent, applied in zip(self.sent, self.daemon.applied):
+            self.assertGreaterEqual(applied - sent, DEBOUNCE)
+
+    def test_other_events_ignored(self):
+        self.events(["workspace>>2\nactivewindow>>kitty,~\nfocusedmon>>DP-3,2\n", 0.3])
+        self.listen()
+        self.assertEqual(self.daemon.applied, [])
+
+    def test_burst_is_debounced(self):
+        # A dock: several outputs and unrelated events within the window
+        self.events(["monitoradded>>DP-3\n", 0.03, "workspace>>11\n", 0.03,
+                     "monitoraddedv2>>2,DP-4,Dell\n", 0.03, "monitoradded>>DP-5\n", 0.4])
+        self.listen()
+        self.assertEqual(len(self.daemon.applied), 1)
+        self.assertGreaterEqual(self.daemon.applied[0] - self.sent[-1], DEBOUNCE)
+
+    def test_event_split_across_reads(self):
+        self.events(["monitorad", 0.02, "ded>>DP-3", 0.02, "\n", 0.3])
+        self.listen()
+        self.assertEqual(len(self.daemon.applied), 1)
+
+    def test_reconnects_on_eof(self):
+        with mock.patch.object(daemon, "RECONNECT_DELAY", 0.01):
+            server = self.events(["monitoradded>>DP-3\n", 0.3], ["monitorremoved>>DP-3\n", 0.3])
+            thread = self.run_daemon()
+            deadline = time.monotonic() + 5
+            while len(self.daemon.applied) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # One per connection; startup is left to hyprland.conf's exec
+            self.assertEqual(len(self.daemon.applied), 2)
+            self.assertGreaterEqual(server.connections, 2)
+            shutil.rmtree(self.instance.dir)
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+    def test_stops_when_hyprland_exits(self):
+        with mock.patch.object(daemon, "RECONNECT_DELAY", 0.01):
+            # Hyprland closes the event socket and removes its instance directory
+            def handler(conn, n):
+                shutil.rmtree(self.instance.dir)
+            server = fakes.Server(self.path, handler)
+            self.addCleanup(server.close)
+            thread = self.run_daemon()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(server.connections, 1)
+
+    def test_gives_up_on_unreachable_socket(self):
+        with mock.patch.object(daemon, "RECONNECT_DELAY", 0), \
+             mock.patch.object(daemon, "MAX_RECONNECTS", 3), \
+             mock.patch.object(self.daemon, "listen", side_effect=ConnectionRefusedError) as listen:
+            with self.assertRaises(SystemExit):
+                self.daemon.run(self.path)
+        self.assertEqual(listen.call_count, 3)
+
+class ApplyTest(unittest.TestCase):
+    # The daemon's own apply against a fake compositor socket and an empty sysfs
+    def setUp(self):
+        self.instance = fakes.Instance()
+        self.addCleanup(self.instance.close)
+        env = mock.patch.dict(os.environ, self.instance.env)
+        env.start()
+        self.addCleanup(env.stop)
+        root = self.instance.root
+        self.daemon = daemon.Daemon(layout_path=os.path.join(root, "layout.json"), drm_path=root)
+        self.daemon.history = History(os.path.join(root, "history.json"))
+        self.requests = []
+
+    def serve(self, *monitors):
+        # One j/monitors reply per query, in order
+        replies = list(monitors)
+        def handler(conn, n):
+            request = fakes.read_request(conn)
+            self.requests.append(request)
+            conn.sendall(replies.pop(0) if request == "j/monitors" else b"ok")
+        server = fakes.Server(self.instance.path(".socket.sock"), handler)
+        self.addCleanup(server.close)
+
+    def test_auto_align_is_recorded(self):
+        # No saved layout matches: the auto-aligned result can be rolled back too
+        self.serve(json.dumps([MONITOR]).encode())
+        with mock.patch.object(daemon, "read_monitor_edids", return_value={}) as read_edids:
+            result = self.daemon.apply()
+        read_edids.assert_called_once_with(self.instance.root)
+        self.assertTrue(result.auto_aligned)
+        self.assertIn("keyword monitor DP-3,2560x1440@144,0x0,1,transform,0", self.requests[-1])
+        entries = self.daemon.history.entries()
+        self.assertEqual([e["layout"] for e in entries], ["auto-aligned"])
+        self.assertEqual(entries[0]["before"][0]["x"], 100)
+
+    def test_bad_reply_is_survived(self):
+        # A truncated j/monitors reply must not take the daemon down
+        self.serve(b"", json.dumps([MONITOR]).encode()[:40])
+        with mock.patch("sys.stderr"):
+            self.assertIsNone(self.daemon.apply())
+            self.assertIsNone(self.daemon.apply())
+        self.assertEqual(self.requests, ["j/monitors", "j/monitors"])
+        self.assertEqual(self.daemon.history.entries(), [])
+
+    def test_keeps_listening_after_failed_apply(self):
+        self.serve(b"", b"")
+        path = self.instance.path(".socket2.sock")
+        def handler(conn, n):
+            conn.sendall(b"monitoradded>>DP-3\n")
+            time.sleep(0.3)
+            conn.sendall(b"monitorremoved>>DP-3\n")
+            time.sleep(0.3)
+        server = fakes.Server(path, handler)
+        self.addCleanup(server.close)
+        with mock.patch("sys.stderr"):
+            self.daemon.listen(path)
+        self.assertEqual(self.requests, ["j/monitors", "j/monitors"])
+
+if __name__ == "__main__":
+    unittest.main()
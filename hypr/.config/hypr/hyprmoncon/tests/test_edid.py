@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+import fakes
+from edid import EDID_BLOCK, EDID_HEADER, read_monitor_ids
+
+GET_MONITORS = os.path.join(os.path.dirname(fakes.__file__), "..", "src", "edid", "get-monitors.sh")
+
+def descriptor(tag, text):
+    # Display descriptor: 13 bytes of text, 0x0A-terminated and space-padded
+    data = text.encode() + (b"\n" if len(text) < 13 else b"")
+    return b"\0\0\0" + bytes([tag, 0]) + data.ljust(13, b" ")
+
+def make_edid(serial=None, product=0x1234, extensions=0):
+    edid = bytearray(EDID_HEADER + b"\x22\xf0" + product.to_bytes(2, "little") + bytes(EDID_BLOCK - 12))
+    edid[18:20] = b"\x01\x04"
+    descriptors = [descriptor(0xFC, "Desk Monitor")]
+    if serial is not None:
+        descriptors.append(descriptor(0xFF, serial))
+    for i, d in enumerate(descriptors):
+        edid[72 + 18 * i:90 + 18 * i] = d
+    edid[126] = extensions
+    edid[127] = -sum(edid[:127]) % 256
+    for _ in range(extensions):
+        block = bytearray([0x02, 0x03] + [0] * (EDID_BLOCK - 2))
+        block[127] = -sum(block[:127]) % 256
+        edid += block
+    return bytes(edid)
+
+@unittest.skipUnless(shutil.which("bash") and shutil.which("xxd") and shutil.which("sha256sum"),
+                     "get-monitors.sh needs bash, xxd and sha256sum")
+class MonitorIdParityTest(unittest.TestCase):
+    # read_monitor_ids() replaced get-monitors.sh; layouts saved with either
+    # must keep matching, so both run against the same fake sysfs
+    def setUp(self):
+        self.drm = tempfile.mkdtemp(prefix="hyprmoncon-drm-")
+        self.addCleanup(shutil.rmtree, self.drm)
+
+    def connector(self, name, edid=None):
+        os.makedirs(os.path.join(self.drm, name))
+        if edid is not None:
+            with open(os.path.join(self.drm, name, "edid"), "wb") as f:
+                f.write(edid)
+
+    def script_ids(self):
+        output = subprocess.run(["bash", GET_MONITORS, self.drm], capture_output=True, text=True, check=True).stdout
+        return dict(line.split(":", 1) for line in output.splitlines())
+
+    def test_ids_match_get_monitors(self):
+        self.connector("card0-eDP-1", make_edid())  # no serial: hashed
+        self.connector("card1-DP-3", make_edid("3CQ1170C5P"))
+        self.connector("card1-DP-4", make_edid("ABCDEFGHIJKLM"))  # fills the descriptor
+        self.connector("card1-DP-5", make_edid("  7 padded", extensions=1))
+        self.connector("card1-HDMI-A-1", b"")  # disconnected
+        self.connector("card1-Writeback-1")  # no edid file
+        self.connector("card1-DP-6", make_edid(product=0x4321, extensions=2)[:EDID_BLOCK - 1])  # truncated
+
+        ids = read_monitor_ids(self.drm)
+        self.assertEqual(ids, self.script_ids())
+        self.assertEqual(sorted(ids), ["DP-3", "DP-4", "DP-5", "eDP-1"])
+        self.assertEqual(ids["DP-3"], "ser:3CQ1170C5P")
+        self.assertEqual(ids["DP-4"], "ser:ABCDEFGHIJKLM")
+        self.assertTrue(ids["eDP-1"].startswith("hsh:"))
+
+    def test_identical_panels_share_a_hash(self):
+        self.connector("card1-DP-1", make_edid())
+        self.connector("card1-DP-2", make_edid())
+        ids = read_monitor_ids(self.drm)
+        self.assertEqual(ids, self.script_ids())
+        self.assertEqual(ids["DP-1"], ids["DP-2"])
+
+if __name__ == "__main__":
+    unittest.main()
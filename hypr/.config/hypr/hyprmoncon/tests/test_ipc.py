@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import unittest
+from unittest import mock
+
+import fakes
+import ipc
+
+MONITORS = [
+    {"id": 0, "name": "eDP-1", "description": "Laptop", "make": "BOE", "model": "0x0BCA",
+     "serial": "", "width": 2880, "height": 1800, "refreshRate": 90.0, "x": 0, "y": 0,
+     "scale": 2.0, "transform": 0, "focused": True, "disabled": False,
+     "activeWorkspace": {"id": 1, "name": "1"}, "availableModes": ["2880x1800@90.00Hz"]},
+    {"id": 1, "name": "DP-3", "description": "Desk", "make": "HP", "model": "X27q",
+     "serial": "3CQ1170C5P", "width": 2560, "height": 1440, "refreshRate": 143.9, "x": 1440,
+     "y": 0, "scale": 1.25, "transform": 1, "disabled": False,
+     "activeWorkspace": {"id": 11, "name": "11"}},
+]
+
+class IpcTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = fakes.Instance()
+        self.addCleanup(self.instance.close)
+        env = mock.patch.dict(os.environ, self.instance.env)
+        env.start()
+        self.addCleanup(env.stop)
+        self.requests = []
+
+    def serve(self, replies, chunk=None, delay=0):
+        # Replies by request; chunk splits a reply into several sends
+        def handler(conn, n):
+            request = fakes.read_request(conn)
+            self.requests.append(request)
+            reply = replies.get(request, b"ok")
+            step = chunk or len(reply) or 1
+            for i in range(0, len(reply), step):
+                conn.sendall(reply[i:i + step])
+                time.sleep(delay)
+        server = fakes.Server(self.instance.path(".socket.sock"), handler)
+        self.addCleanup(server.close)
+        return server
+
+    def test_socket_path_in_runtime_dir(self):
+        self.assertEqual(ipc.socket_path(), self.instance.path(".socket.sock"))
+        self.assertEqual(ipc.socket_path(".socket2.sock"), self.instance.path(".socket2.sock"))
+
+    def test_socket_path_falls_back_to_tmp(self):
+        with mock.patch.dict(os.environ, {"HYPRLAND_INSTANCE_SIGNATURE": "elsewhere"}):
+            self.assertEqual(ipc.socket_path(), "/tmp/hypr/elsewhere/.socket.sock")
+
+    def test_no_instance_means_no_socket(self):
+        with mock.patch.dict(os.environ):
+            del os.environ["HYPRLAND_INSTANCE_SIGNATURE"]
+            self.assertIsNone(ipc.socket_path())
+
+    def test_monitors_round_trip(self):
+        self.serve({"j/monitors": json.dumps(MONITORS).encode()})
+        monitors = ipc.get_monitors()
+        self.assertEqual(self.requests, ["j/monitors"])
+        self.assertEqual([m.name for m in monitors], ["eDP-1", "DP-3"])
+        laptop, desk = monitors
+        self.assertEqual((laptop.width, laptop.height, laptop.scale), (2880, 1800, 2.0))
+        self.assertTrue(laptop.focused)
+        self.assertEqual(laptop.active_workspace, 1)
+        self.assertEqual(laptop.available_modes, ["2880x1800@90.00Hz"])
+        self.assertEqual((desk.x, desk.transform, desk.serial), (1440, 1, "3CQ1170C5P"))
+        self.assertEqual(desk.refresh_rate, 143.9)
+        self.assertEqual(desk.available_modes, [])
+
+    def test_reply_in_partial_reads(self):
+        # Larger than one recv and trickled out in small pieces
+        monitors = [dict(MONITORS[0], id=i, name=f"DP-{i}") for i in range(300)]
+        reply = json.dumps(monitors).encode()
+        self.assertGreater(len(reply), ipc.RECV_SIZE)
+        self.serve({"j/monitors": reply}, chunk=4096, delay=0.001)
+        self.assertEqual([m.name for m in ipc.get_monitors()], [f"DP-{i}" for i in range(300)])
+
+    def test_batch_framing(self):
+        self.serve({})
+        self.assertEqual(ipc.batch(["keyword monitor DP-3,2560x1440@144,0x0,1", "dispatch dpms on"]), "ok")
+        self.assertEqual(self.requests, ["[[BATCH]]keyword monitor DP-3,2560x1440@144,0x0,1;dispatch dpms on"])
+
+    def test_empty_batch_sends_nothing(self):
+        server = self.serve({})
+        self.assertEqual(ipc.batch([]), "")
+        self.assertEqual(server.connections, 0)
+
+    def test_explicit_path(self):
+        path = os.path.join(self.instance.root, "other.sock")
+        server = fakes.Server(path, lambda conn, n: conn.sendall(fakes.read_request(conn).encode()))
+        self.addCleanup(server.close)
+        self.assertEqual(ipc.request("dispatch dpms on", path), "dispatch dpms on")
+
+    def test_missing_socket_raises(self):
+        with self.assertRaises(OSError):
+            ipc.request("j/monitors")
+
+    def test_falls_back_to_hyprctl(self):
+        bin_dir, log = self.instance.hyprctl(reply=json.dumps(MONITORS))
+        env = {"PATH": bin_dir + os.pathsep + os.environ.get("PATH", "")}
+        with mock.patch.dict(os.environ, env):
+            del os.environ["HYPRLAND_INSTANCE_SIGNATURE"]
+            monitors = ipc.get_monitors()
+            ipc.batch(["keyword monitor DP-3,preferred,auto,1", "dispatch dpms on"])
+        self.assertEqual([m.name for m in monitors], ["eDP-1", "DP-3"])
+        with open(log) as f:
+            calls = f.read().splitlines()
+        self.assertEqual(calls, ["-j monitors", "--batch keyword monitor DP-3,preferred,auto,1 ; dispatch dpms on"])
+
+if __name__ == "__main__":
+    unittest.main()
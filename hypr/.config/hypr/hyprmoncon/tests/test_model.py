@@ -0,0 +1,124 @@
+import unittest
+
+import fakes  # noqa: F401 (puts src on sys.path)
+from ipc import MonitorInfo
+from model import Layout, Output
+
+def output(name, x, y, width=1920, height=1080, monitor=None, **extra):
+    return Output(name=name, monitor=monitor or f"ser:{name}", width=width, height=height, x=x, y=y, **extra)
+
+class OutputTest(unittest.TestCase):
+    def test_logical_size_applies_scale_and_rotation(self):
+        self.assertEqual(output("A", 0, 0, 2880, 1800, scale=2).logical_size(), (1440, 900))
+        self.assertEqual(output("A", 0, 0, transform=1).logical_size(), (1080, 1920))
+        self.assertEqual(output("A", 100, 50, scale=1.5).bottom, 50 + 720)
+
+    def test_overlaps(self):
+        a = output("A", 0, 0)
+        self.assertTrue(a.overlaps(output("B", 1919, 1079)))
+        self.assertFalse(a.overlaps(output("B", 1920, 0)))  # touching edges
+        self.assertFalse(a.overlaps(output("B", 0, 1080)))
+
+    def test_adjacent(self):
+        a = output("A", 0, 0)
+        self.assertTrue(a.adjacent(output("B", 1920, 500)))
+        self.assertTrue(a.adjacent(output("B", -1000, 1080)))
+        self.assertFalse(a.adjacent(output("B", 1920, 1080)))  # corner only
+        self.assertFalse(a.adjacent(output("B", 1921, 0)))
+
+class LayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.layout = Layout([
+            output("A", 0, 0, primary=True),
+            output("B", 1920, 0, 2560, 1440),
+            output("C", 0, 1080),
+        ])
+
+    def test_overlaps(self):
+        self.assertEqual(self.layout.overlaps(), [])
+        self.layout.add(output("D", 1000, 500))
+        self.assertEqual(sorted(self.layout.overlaps()), [("A", "D"), ("C", "D"), ("D", "B")])
+
+    def test_adjacency(self):
+        neighbours = self.layout.adjacency()
+        self.assertEqual(sorted(neighbours["A"]), ["B", "C"])
+        self.assertEqual(sorted(neighbours["B"]), ["A", "C"])
+        self.assertEqual(sorted(neighbours["C"]), ["A", "B"])
+
+    def test_adjacency_matches_pairwise_check(self):
+        self.layout.add(output("D", 1920, 1440))
+        self.layout.add(output("E", 4480, 1440))
+        neighbours = self.layout.adjacency()
+        for a in self.layout:
+            expected = sorted(b.name for b in self.layout if b is not a and a.adjacent(b))
+            self.assertEqual(sorted(neighbours[a.name]), expected, a.name)
+
+    def test_bounding_box(self):
+        self.assertEqual(self.layout.bounding_box(), (0, 0, 4480, 2160))
+        self.assertIsNone(Layout().bounding_box())
+
+    def test_normalize(self):
+        for o in self.layout:
+            o.x -= 300
+            o.y += 200
+        self.assertEqual(self.layout.normalize(), (300, -200))
+        self.assertEqual([(o.x, o.y) for o in self.layout], [(0, 0), (1920, 0), (0, 1080)])
+        self.assertEqual(self.layout.normalize(), (0, 0))
+        self.assertEqual(Layout().normalize(), (0, 0))
+
+    def test_by_monitor_registry(self):
+        # Identical panels share a hashed ID
+        self.layout.add(output("D", 4480, 0, monitor="hsh:same"))
+        self.layout.add(output("E", 6400, 0, monitor="hsh:same"))
+        self.assertEqual([o.name for o in self.layout.find("hsh:same")], ["D", "E"])
+        self.assertEqual(self.layout.find("ser:missing"), [])
+
+        self.layout.remove("D")
+        self.assertEqual([o.name for o in self.layout.find("hsh:same")], ["E"])
+        self.layout.remove("E")
+        self.assertNotIn("hsh:same", self.layout.by_monitor)
+        self.assertIsNone(self.layout.remove("E"))
+
+    def test_add_replaces_same_name(self):
+        self.layout.add(output("A", 0, 0, monitor="ser:other"))
+        self.assertEqual(len(self.layout), 3)
+        self.assertEqual(self.layout.find("ser:A"), [])
+        self.assertEqual(self.layout.get("A").monitor, "ser:other")
+        self.assertEqual(self.layout.monitor_ids(), ["ser:B", "ser:C", "ser:other"])
+
+    def test_primary(self):
+        self.assertEqual(self.layout.primary().name, "A")
+        self.layout.set_primary("C")
+        self.assertEqual([o.name for o in self.layout if o.primary], ["C"])
+        self.assertIsNone(Layout().primary())
+
+    def test_json_round_trip(self):
+        self.layout.get("B").refresh_rate = 143.97
+        self.layout.get("C").transform = 1
+        entries = self.layout.to_json()
+        copy = Layout.from_json(entries)
+        self.assertEqual(copy.outputs, self.layout.outputs)
+        self.assertEqual(copy.to_json(), entries)
+
+    def test_from_entry_defaults(self):
+        o = Output.from_entry({"name": "A", "width": 1920, "height": 1080})
+        self.assertEqual((o.monitor, o.x, o.y, o.scale, o.transform, o.primary), ("", 0, 0, 1.0, 0, False))
+
+    def test_from_monitors_round_trip(self):
+        monitors = [
+            MonitorInfo(id=0, name="eDP-1", description="", make="", model="", serial="",
+                        width=2880, height=1800, refresh_rate=90.0, x=0, y=0, scale=2.0, transform=0),
+            MonitorInfo(id=1, name="DP-1", description="", make="", model="", serial="",
+                        width=2560, height=1440, refresh_rate=144.0, x=1440, y=0, scale=1.0, transform=1),
+        ]
+        layout = Layout.from_monitors(monitors, {"eDP-1": "ser:LAPTOP"})
+        self.assertEqual(layout.monitor_ids(), ["ser:LAPTOP", "UNKNOWN_1"])
+        self.assertEqual(layout.primary().name, "eDP-1")
+        copy = Layout.from_json(layout.to_json())
+        self.assertEqual(copy.outputs, layout.outputs)
+        for m, o in zip(monitors, copy):
+            self.assertEqual((o.name, o.width, o.height, o.x, o.y, o.scale, o.refresh_rate, o.transform),
+                             (m.name, m.width, m.height, m.x, m.y, m.scale, m.refresh_rate, m.transform))
+
+if __name__ == "__main__":
+    unittest.main()
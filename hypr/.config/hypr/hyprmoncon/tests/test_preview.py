@@ -0,0 +1,141 @@
+import os
+import json
+import unittest
+from unittest import mock
+
+import fakes
+import var
+import preview
+from model import Layout
+from snapping import EdgeIndex
+
+MONITORS = [
+    {"id": 0, "name": "DP-1", "description": "", "make": "", "model": "", "serial": "",
+     "width": 1920, "height": 1080, "refreshRate": 60.0, "x": 0, "y": 0,
+     "scale": 1.0, "transform": 0, "disabled": False},
+    {"id": 1, "name": "DP-2", "description": "", "make": "", "model": "", "serial": "",
+     "width": 2560, "height": 1440, "refreshRate": 144.0, "x": 1920, "y": 0,
+     "scale": 1.0, "transform": 0, "disabled": False},
+]
+INTERVAL = 0.1
+
+class Clock:
+    # Stands in for both time.monotonic and the canvas's after() queue
+    def __init__(self):
+        self.now = 100.0
+        self.jobs = {}
+        self.next_id = 0
+
+    def monotonic(self):
+        return self.now
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = (self.now + ms / 1000, callback)
+        return self.next_id
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def advance(self, seconds):
+        self.now += seconds
+        for job, (due, callback) in sorted(self.jobs.items(), key=lambda item: item[1][0]):
+            if due <= self.now and job in self.jobs:
+                del self.jobs[job]
+                callback()
+
+class LivePreviewTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = fakes.Instance()
+        self.addCleanup(self.instance.close)
+        env = mock.patch.dict(os.environ, self.instance.env)
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.batches = []
+        def handler(conn, n):
+            request = fakes.read_request(conn)
+            if request == "j/monitors":
+                conn.sendall(json.dumps(MONITORS).encode())
+            else:
+                self.batches.append(request.removeprefix("[[BATCH]]").split(";"))
+                conn.sendall(b"ok")
+        server = fakes.Server(self.instance.path(".socket.sock"), handler)
+        self.addCleanup(server.close)
+
+        layout = Layout.from_json([
+            {"name": "DP-1", "monitor": "ser:1", "width": 1920, "height": 1080, "refresh_rate": 60.0},
+            {"name": "DP-2", "monitor": "ser:2", "width": 2560, "height": 1440, "x": 1920,
+             "refresh_rate": 144.0},
+        ])
+        self.clock = Clock()
+        for patch in (mock.patch.object(var, "layout", layout),
+                      mock.patch.object(var, "views", {}),
+                      mock.patch.object(preview, "edges", EdgeIndex()),
+                      mock.patch.object(preview, "time", self.clock)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.preview = preview.LivePreview(self.clock, INTERVAL)
+
+    def drag(self, name, positions, step):
+        # Motion events every step seconds, then the drop
+        output = var.layout.get(name)
+        for x, y in positions:
+            output.x, output.y = x, y
+            self.preview.changed()
+            self.clock.advance(step)
+        self.preview.flush()
+
+    def test_unchanged_layout_sends_nothing(self):
+        self.preview.changed()
+        self.preview.flush()
+        self.assertEqual(self.batches, [])
+
+    def test_burst_is_batched(self):
+        # 200 motion events over one second
+        self.drag("DP-2", [(1920 + i, i // 2) for i in range(1, 201)], 0.005)
+        self.assertLessEqual(len(self.batches), 1 / INTERVAL + 2)
+        self.assertEqual(self.preview.requests, len(self.batches))
+        for batch in self.batches:
+            # Only the dragged output is resent
+            self.assertEqual(len(batch), 1)
+            self.assertTrue(batch[0].startswith("keyword monitor DP-2,"))
+
+    def test_last_position_is_flushed(self):
+        # The drop lands inside the interval: it goes out without waiting
+        self.drag("DP-2", [(1930, 0), (1940, 5), (1950, 10)], 0.01)
+        self.assertEqual(self.batches[-1], ["keyword monitor DP-2,2560x1440@144,1950x10,1,transform,0"])
+        self.assertEqual(self.clock.jobs, {})
+
+    def test_pending_change_goes_out_on_the_timer(self):
+        self.drag("DP-2", [(1930, 0)], 0)
+        var.layout.get("DP-2").x = 1940
+        self.preview.changed()
+        self.assertEqual(len(self.batches), 1)
+        self.clock.advance(INTERVAL)
+        self.assertEqual(self.batches[-1], ["keyword monitor DP-2,2560x1440@144,1940x0,1,transform,0"])
+
+    def test_cancel_restores_original_rules(self):
+        self.drag("DP-1", [(-100, 0), (-200, 50)], 0.01)
+        self.drag("DP-2", [(2000, 0), (2100, 70)], 0.01)
+        self.preview.cancel()
+        self.assertEqual(sorted(self.batches[-1]), [
+            "keyword monitor DP-1,1920x1080@60,0x0,1,transform,0",
+            "keyword monitor DP-2,2560x1440@144,1920x0,1,transform,0",
+        ])
+        self.assertEqual([(o.x, o.y) for o in var.layout], [(0, 0), (1920, 0)])
+        self.assertEqual(self.clock.jobs, {})
+
+        # Nothing left to undo
+        count = len(self.batches)
+        self.preview.cancel()
+        self.assertEqual(len(self.batches), count)
+
+    def test_commit_moves_the_baseline(self):
+        self.drag("DP-2", [(2000, 0)], 0)
+        self.preview.commit()
+        self.preview.cancel()
+        self.assertEqual(var.layout.get("DP-2").x, 2000)
+
+if __name__ == "__main__":
+    unittest.main()
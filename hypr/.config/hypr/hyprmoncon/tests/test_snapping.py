@@ -0,0 +1,58 @@
+import unittest
+
+import fakes  # noqa: F401 (puts src on sys.path)
+from snapping import EdgeIndex
+
+THRESHOLD = 15
+
+class EdgeIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.edges = EdgeIndex()
+        self.edges.add("A", 0, 0, 1920, 1080)
+        self.edges.add("B", 1920, 0, 4480, 1440)
+
+    def test_threshold_is_exclusive(self):
+        rights = self.edges.rights
+        self.assertEqual(self.edges.nearest(rights, 1920 + THRESHOLD - 1, THRESHOLD, "X"), 1920)
+        self.assertEqual(self.edges.nearest(rights, 1920 - THRESHOLD + 1, THRESHOLD, "X"), 1920)
+        self.assertIsNone(self.edges.nearest(rights, 1920 + THRESHOLD, THRESHOLD, "X"))
+        self.assertIsNone(self.edges.nearest(rights, 1920 - THRESHOLD, THRESHOLD, "X"))
+        self.assertEqual(self.edges.nearest(rights, 1920.5 + THRESHOLD - 1, THRESHOLD, "X"), 1920)
+
+    def test_matches_linear_scan(self):
+        self.edges.add("C", 1925, 1440, 3845, 2520)
+        self.edges.add("D", 1910, -1080, 3830, 0)
+        for edges in self.edges.edge_lists():
+            for value in range(-1200, 4600, 5):
+                within = [e for e, _ in edges if abs(e - value) < THRESHOLD]
+                expected = min(within, key=lambda e: abs(e - value)) if within else None
+                found = self.edges.nearest(edges, value, THRESHOLD, "X")
+                if expected is None:
+                    self.assertIsNone(found, value)
+                else:
+                    self.assertEqual(abs(found - value), abs(expected - value), value)
+
+    def test_dragged_monitor_is_ignored(self):
+        self.assertIsNone(self.edges.nearest(self.edges.lefts, 1925, THRESHOLD, "B"))
+        self.assertEqual(self.edges.nearest(self.edges.lefts, 1925, THRESHOLD, "A"), 1920)
+
+    def test_snap(self):
+        # Left edge onto A's right edge, top edge onto A's bottom edge
+        self.assertEqual(self.edges.snap("C", 1930, 1090, 1920, 1080, THRESHOLD), (1920, 1080))
+        # Exactly the threshold away stays put
+        self.assertEqual(self.edges.snap("C", 1920 + THRESHOLD, 1080 + THRESHOLD, 1920, 1080, THRESHOLD),
+                         (1920 + THRESHOLD, 1080 + THRESHOLD))
+
+    def test_add_and_remove_keep_lists_sorted(self):
+        self.edges.add("A", 100, 100, 2020, 1180)  # moved
+        self.assertEqual(self.edges.lefts, [(100, "A"), (1920, "B")])
+        self.assertEqual(self.edges.rights, [(2020, "A"), (4480, "B")])
+        self.edges.remove("B")
+        self.edges.remove("missing")
+        self.assertEqual(self.edges.rects, {"A": (100, 100, 2020, 1180)})
+        self.assertEqual(self.edges.tops, [(100, "A")])
+        self.edges.clear()
+        self.assertEqual(self.edges.edge_lists(), ([], [], [], []))
+
+if __name__ == "__main__":
+    unittest.main()
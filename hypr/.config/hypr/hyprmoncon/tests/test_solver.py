@@ -0,0 +1,32 @@
+import unittest
+
+import fakes  # noqa: F401 (puts src on sys.path)
+from model import Layout
+from solver import Constraint, infer_constraints, solve
+
+def output(name, x, y, primary=False):
+    return {"name": name, "monitor": f"ser:{name}", "width": 1920, "height": 1080,
+            "x": x, "y": y, "primary": primary}
+
+class InferConstraintsTest(unittest.TestCase):
+    def arrange(self, *outputs):
+        layout = Layout.from_json(outputs)
+        constraints = infer_constraints(layout)
+        solve(layout, constraints)
+        return layout, constraints
+
+    def test_side_by_side_keeps_its_order(self):
+        layout, constraints = self.arrange(output("A", 0, 0, True), output("B", 1900, 30))
+        self.assertEqual([str(c) for c in constraints], ["A left-of B top"])
+        self.assertEqual((layout.get("B").x, layout.get("B").y), (1920, 0))
+
+    def test_skips_slots_taken_by_placed_outputs(self):
+        # C was dropped onto B: attaching it right of A would put it on top of B
+        layout, constraints = self.arrange(
+            output("A", 0, 0, True), output("B", 1920, 0), output("C", 1920, 500))
+        self.assertIn(Constraint("above", "B", "C", "left"), constraints)
+        self.assertEqual(layout.overlaps(), [])
+        self.assertEqual((layout.get("C").x, layout.get("C").y), (1920, 1080))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+
+import fakes  # noqa: F401 (puts src on sys.path)
+import var
+import viewport
+from model import Layout
+from projection import Projection
+
+WIDTH, HEIGHT = 800, 600
+UNIT = 10
+
+class Canvas:
+    # The scrolling and item scaling Tk does for the viewport
+    def __init__(self):
+        self.scroll_x = self.scroll_y = 0
+        self.scaled = []
+
+    def winfo_width(self):
+        return WIDTH
+
+    def winfo_height(self):
+        return HEIGHT
+
+    def canvasx(self, x):
+        return x + self.scroll_x
+
+    def canvasy(self, y):
+        return y + self.scroll_y
+
+    def xview_scroll(self, n, what):
+        self.scroll_x += n * UNIT
+
+    def yview_scroll(self, n, what):
+        self.scroll_y += n * UNIT
+
+    def scale(self, tag, x, y, sx, sy):
+        self.scaled.append((x, y, sx, sy))
+
+    def config(self, **options):
+        self.options = options
+
+class ViewportTest(unittest.TestCase):
+    def setUp(self):
+        layout = Layout.from_json([
+            {"name": "DP-1", "monitor": "ser:1", "width": 1920, "height": 1080},
+            {"name": "DP-2", "monitor": "ser:2", "width": 2560, "height": 1440, "x": 1920},
+        ])
+        self.projection = Projection(8)
+        self.projection.fit(layout.bounding_box(), WIDTH, HEIGHT)
+        for patch in (mock.patch.object(var, "layout", layout),
+                      mock.patch.object(var, "views", {}),
+                      mock.patch.object(var, "projection", self.projection),
+                      mock.patch.object(var, "auto_fit", True)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.canvas = Canvas()
+
+    def under(self, x, y):
+        # Layout point shown at window point x, y
+        return self.projection.to_layout(self.canvas.canvasx(x), self.canvas.canvasy(y))
+
+    def assertPointEqual(self, a, b):
+        self.assertAlmostEqual(a[0], b[0], places=6)
+        self.assertAlmostEqual(a[1], b[1], places=6)
+
+    def test_projection_round_trip(self):
+        for point in [(0, 0), (1920, 1080), (4480, 1440), (-317.5, 2210.25)]:
+            self.assertPointEqual(self.projection.to_layout(*self.projection.to_canvas(*point)), point)
+
+    def test_zoom_keeps_point_under_cursor(self):
+        for step, x, y in [(1.25, 100, 80), (1.25, 700, 500), (1 / 1.25, 0, 0), (2, 400, 300)]:
+            before = self.under(x, y)
+            viewport.zoom(self.canvas, step, x, y)
+            self.assertPointEqual(self.under(x, y), before)
+        self.assertFalse(var.auto_fit)
+
+    def test_zoom_matches_tk_item_scaling(self):
+        # Tk moves items about the zoom centre; the projection must agree
+        point = (1920, 1080)
+        old = self.projection.to_canvas(*point)
+        viewport.zoom(self.canvas, 1.25, 200, 150)
+        cx, cy, sx, sy = self.canvas.scaled[-1]
+        self.assertPointEqual(self.projection.to_canvas(*point), (cx + (old[0] - cx) * sx, cy + (old[1] - cy) * sy))
+
+    def test_zoom_in_then_out_restores_projection(self):
+        state = (self.projection.factor, self.projection.origin_x, self.projection.origin_y)
+        viewport.zoom(self.canvas, 1.25, 123, 456)
+        viewport.zoom(self.canvas, 1 / 1.25, 123, 456)
+        for a, b in zip((self.projection.factor, self.projection.origin_x, self.projection.origin_y), state):
+            self.assertAlmostEqual(a, b, places=6)
+
+    def test_pan_moves_view_not_projection(self):
+        origin = (self.projection.origin_x, self.projection.origin_y)
+        before = self.under(0, 0)
+        viewport.pan(self.canvas, 2, 1)
+        self.assertEqual((self.projection.origin_x, self.projection.origin_y), origin)
+        self.assertPointEqual(self.under(0, 0), (before[0] + 2 * UNIT * self.projection.factor,
+                                                 before[1] + UNIT * self.projection.factor))
+        viewport.pan(self.canvas, -2, -1)
+        self.assertPointEqual(self.under(0, 0), before)
+
+    def test_zoom_is_clamped(self):
+        for _ in range(100):
+            viewport.zoom(self.canvas, 1.25)
+        self.assertEqual(self.projection.factor, viewport.MIN_FACTOR)
+        count = len(self.canvas.scaled)
+        viewport.zoom(self.canvas, 1.25)
+        self.assertEqual(len(self.canvas.scaled), count)
+        for _ in range(100):
+            viewport.zoom(self.canvas, 1 / 1.25)
+        self.assertEqual(self.projection.factor, viewport.MAX_FACTOR)
+
+if __name__ == "__main__":
+    unittest.main()
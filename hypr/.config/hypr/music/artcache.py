@@ -0,0 +1,181 @@
+import os
+import io
+import sys
+import base64
+import time
+import hashlib
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "hypr-music", "art"
+)
+MEMORY_ENTRIES = 32
+DISK_LIMIT = 16 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 5
+# Seconds before a failed art URL is tried again, doubling up to the maximum
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 3600
+
+class ArtCache:
+    # Two tiers of rendered thumbnails: an in-memory LRU of (path, base64) and
+    # a size-bounded directory of encoded files shared between processes.
+    # Remote art is downloaded on a worker thread unless the caller blocks;
+    # until it lands lookups miss, and on_ready is called (from the worker)
+    # so the caller can render again. Failures are retried with backoff.
+    def __init__(self, render, cache_dir=CACHE_DIR, max_entries=MEMORY_ENTRIES,
+                 max_disk_bytes=DISK_LIMIT, suffix=".png", on_ready=None):
+        self.render = render
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.suffix = suffix
+        self.on_ready = on_ready
+        self.memory = OrderedDict()
+        self.failed = {}  # key -> (monotonic time of next attempt, delay)
+        self.pending = set()
+        self.executor = None
+
+    def key(self, art_url):
+        if art_url.startswith("file://"):
+            try:
+                st = os.stat(art_url[7:])
+            except OSError:
+                return None
+            ident = f"{art_url}\0{st.st_mtime_ns}\0{st.st_size}"
+        elif art_url.startswith("http://") or art_url.startswith("https://"):
+            # Remote art URLs are content-addressed by the service already
+            ident = art_url
+        else:
+            return None
+        return hashlib.sha256(ident.encode()).hexdigest()
+
+    def lookup(self, art_url, block=False):
+        key = self.key(art_url)
+        if key is None:
+            return None
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            tracing.count("cache.art.memory")
+            self.memory.move_to_end(key)
+            return entry
+
+        path = os.path.join(self.cache_dir, key + self.suffix)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Bump mtime so disk eviction stays least-recently-used
+            os.utime(path)
+            tracing.count("cache.art.disk")
+        except OSError:
+            if key in self.pending:
+                return None
+            retry = self.failed.get(key)
+            if retry is not None and time.monotonic() < retry[0]:
+                tracing.count("cache.art.failed")
+                return None
+            tracing.count("cache.art.miss")
+            if not block and not art_url.startswith("file://"):
+                self.pending.add(key)
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="art")
+                self.executor.submit(self.download, art_url, key, path)
+                return None
+            data = self.fetch(art_url, key)
+            if data is None:
+                return None
+            self.store(path, data)
+
+        entry = (path, base64.b64encode(data).decode("utf-8"))
+        self.memory[key] = entry
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+        return entry
+
+    def lookup_file(self, art_url, block=False):
+        # Like lookup, but the thumbnail file must still exist
+        entry = self.lookup(art_url, block)
+        if entry and not os.path.exists(entry[0]):
+            # Evicted from disk by another process; render it again
+            self.memory.pop(self.key(art_url), None)
+            entry = self.lookup(art_url, block)
+        return entry
+
+    def get(self, art_url, block=False):
+        entry = self.lookup(art_url, block)
+        return entry[1] if entry else None
+
+    def get_path(self, art_url, block=False):
+        entry = self.lookup_file(art_url, block)
+        return entry[0] if entry else None
+
+    def download(self, art_url, key, path):
+        # Worker thread: only the disk tier is written here, the next lookup
+        # on the caller's thread picks the file up
+        try:
+            data = self.fetch(art_url, key)
+            if data is not None:
+                self.store(path, data)
+        finally:
+            self.pending.discard(key)
+        if data is not None and self.on_ready is not None:
+            self.on_ready()
+
+    def fetch(self, art_url, key):
+        try:
+            if art_url.startswith("file://"):
+                with tracing.span("art.encode"):
+                    data = self.render(art_url[7:])
+            else:
+                with tracing.span("art.download"):
+                    with urllib.request.urlopen(art_url, timeout=DOWNLOAD_TIMEOUT) as response:
+                        data = response.read()
+                with tracing.span("art.encode"):
+                    data = self.render(io.BytesIO(data))
+        except Exception as e:
+            print(f"Art error: {e}", file=sys.stderr)
+            retry = self.failed.get(key)
+            delay = min(MAX_RETRY_DELAY, retry[1] * 2) if retry else RETRY_DELAY
+            self.failed[key] = (time.monotonic() + delay, delay)
+            return None
+        self.failed.pop(key, None)
+        return data
+
+    def store(self, path, data):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.evict(keep=path)
+        except OSError as e:
+            print(f"Art cache error: {e}", file=sys.stderr)
+
+    def evict(self, keep=None):
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(self.suffix):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
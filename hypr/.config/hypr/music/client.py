@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# Thin client for the music widget server. Kept free of PIL/D-Bus imports so
+# waybar modules start fast:
+#   client.py MODULE          stream pre-rendered JSON lines for MODULE
+#   client.py MODULE --once   print the current value and exit
+#   client.py cmd COMMAND     send a player command (play-pause, next, ...),
+#                             running it in widget.py when no server is up
+#   client.py stats           print the server's HYPR_TRACE timings as JSON
+
+import os
+import sys
+import time
+import socket
+import subprocess
+
+import tracing
+
+SOCKET_PATH = os.environ.get("MUSIC_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or "/tmp", "hypr-music.sock"
+)
+WIDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "widget.py")
+START_TIMEOUT = 3
+RECONNECT_DELAY = 1
+
+def start_server():
+    tracing.count("spawn.widget")
+    subprocess.Popen(
+        [sys.executable, WIDGET, "--serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def connect(path=SOCKET_PATH, autostart=True):
+    deadline = time.monotonic() + START_TIMEOUT
+    started = False
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+            return sock
+        except OSError:
+            sock.close()
+            if not autostart or time.monotonic() > deadline:
+                raise
+        if not started:
+            start_server()
+            started = True
+        time.sleep(0.05)
+
+def request(line, path=SOCKET_PATH, autostart=True):
+    sock = connect(path, autostart)
+    sock.sendall(line.encode() + b"\n")
+    return sock.makefile("r", encoding="utf-8")
+
+def send_command(command, path=SOCKET_PATH):
+    # Returns False when no server is running so callers can fall back
+    try:
+        with request(f"cmd {command}", path, autostart=False) as f:
+            f.read()
+        return True
+    except OSError:
+        return False
+
+def print_stats(path=SOCKET_PATH):
+    # The server's live record; without a server there is nothing to report
+    try:
+        with request("get stats", path, autostart=False) as f:
+            print(f.read(), end="")
+        return 0
+    except OSError as e:
+        print(f"Error: no music widget server: {e}", file=sys.stderr)
+        return 1
+
+def stream(module, once=False, path=SOCKET_PATH):
+    while True:
+        printed = False
+        try:
+            with request(f"{'get' if once else 'watch'} {module}", path) as f:
+                for line in f:
+                    if line.strip() or not once:
+                        print(line, end="", flush=True)
+                        printed = True
+        except OSError as e:
+            if once:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+        if once:
+            # Nothing to show (e.g. no art) is a failure for waybar's image module
+            return 0 if printed else 1
+        # Server went away; start a new one and resubscribe
+        time.sleep(RECONNECT_DELAY)
+
+if __name__ == "__main__":
+    tracing.TOOL = "music"
+    args = sys.argv[1:]
+    if not args:
+        print(f"usage: {sys.argv[0]} MODULE [--once] | cmd COMMAND | stats", file=sys.stderr)
+        sys.exit(2)
+    try:
+        if args[0] == "cmd":
+            if send_command(args[1]):
+                sys.exit(0)
+            os.execv(sys.executable, [sys.executable, WIDGET, args[1]])
+        if args[0] == "stats":
+            sys.exit(print_stats())
+        sys.exit(stream(args[0], once="--once" in args[1:]))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,224 @@
+import time
+import asyncio
+
+from dbus_next import Message, MessageType, Variant
+from dbus_next.aio import MessageBus
+
+import tracing
+from players import RESYNC_INTERVAL, current_position, make_info
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_IFACE = "org.mpris.MediaPlayer2.Player"
+PROPS_IFACE = "org.freedesktop.DBus.Properties"
+
+MATCH_RULES = [
+    f"type='signal',interface='{PROPS_IFACE}',member='PropertiesChanged',path='{MPRIS_PATH}'",
+    "type='signal',sender='org.freedesktop.DBus',interface='org.freedesktop.DBus',"
+    "member='NameOwnerChanged',arg0namespace='org.mpris.MediaPlayer2'",
+    f"type='signal',interface='{PLAYER_IFACE}',member='Seeked',path='{MPRIS_PATH}'",
+]
+# Changes that invalidate the extrapolated position
+RESYNC_PROPS = ("PlaybackStatus", "Metadata", "Rate")
+
+# playerctl command names -> MPRIS methods
+COMMANDS = {
+    "play": "Play",
+    "pause": "Pause",
+    "play-pause": "PlayPause",
+    "stop": "Stop",
+    "next": "Next",
+    "previous": "Previous",
+}
+
+def unpack(value):
+    if isinstance(value, Variant):
+        return unpack(value.value)
+    if isinstance(value, dict):
+        return {k: unpack(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [unpack(v) for v in value]
+    return value
+
+class MprisBackend:
+    name = "mpris"
+
+    def __init__(self, bus_address=None):
+        self.bus_address = bus_address
+        self.bus = None
+        # player name -> {"owner": unique bus name, "props": Player properties,
+        #                 "position_time": monotonic time Position was read}
+        self.players = {}
+        self.owners = {}
+        self.listeners = []
+
+    async def connect(self):
+        # bus_address=None uses $DBUS_SESSION_BUS_ADDRESS
+        self.bus = await MessageBus(bus_address=self.bus_address).connect()
+        for rule in MATCH_RULES:
+            await self.call_bus("AddMatch", "s", [rule])
+        self.bus.add_message_handler(self.on_message)
+
+        names = (await self.call_bus("ListNames")).body[0]
+        for name in names:
+            if name.startswith(MPRIS_PREFIX):
+                try:
+                    owner = (await self.call_bus("GetNameOwner", "s", [name])).body[0]
+                    await self.add_player(name, owner)
+                except RuntimeError:
+                    pass
+
+    async def close(self):
+        if self.bus:
+            self.bus.disconnect()
+            self.bus = None
+
+    async def call(self, message):
+        reply = await self.bus.call(message)
+        if reply.message_type == MessageType.ERROR:
+            raise RuntimeError(f"{reply.error_name}: {reply.body}")
+        return reply
+
+    async def call_bus(self, member, signature="", body=None):
+        return await self.call(Message(
+            destination="org.freedesktop.DBus",
+            path="/org/freedesktop/DBus",
+            interface="org.freedesktop.DBus",
+            member=member,
+            signature=signature,
+            body=body or []
+        ))
+
+    async def get_all(self, bus_name):
+        with tracing.span("player.query"):
+            reply = await self.call(Message(
+                destination=bus_name,
+                path=MPRIS_PATH,
+                interface=PROPS_IFACE,
+                member="GetAll",
+                signature="s",
+                body=[PLAYER_IFACE]
+            ))
+        return unpack(reply.body[0])
+
+    async def add_player(self, bus_name, owner):
+        props = await self.get_all(bus_name)
+        name = bus_name[len(MPRIS_PREFIX):]
+        self.players[name] = {"owner": owner, "props": props, "position_time": time.monotonic()}
+        self.owners[owner] = name
+        self.notify(name)
+
+    def remove_player(self, bus_name):
+        name = bus_name[len(MPRIS_PREFIX):]
+        player = self.players.pop(name, None)
+        if player:
+            self.owners.pop(player["owner"], None)
+            self.notify(name)
+
+    def on_message(self, message):
+        if message.message_type != MessageType.SIGNAL:
+            return
+
+        if message.member == "NameOwnerChanged":
+            bus_name, old_owner, new_owner = message.body
+            if old_owner:
+                self.remove_player(bus_name)
+            if new_owner:
+                asyncio.ensure_future(self.add_player_safe(bus_name, new_owner))
+        elif message.member == "PropertiesChanged":
+            iface, changed, _ = message.body
+            name = self.owners.get(message.sender)
+            if iface != PLAYER_IFACE or name is None:
+                return
+            changed = unpack(changed)
+            if any(prop in changed for prop in RESYNC_PROPS):
+                # Freeze the extrapolated position under the old status until
+                # the player reports the real one
+                self.set_position(name, current_position(self.info(name)) * 1e6)
+                asyncio.ensure_future(self.refresh_position(name))
+            self.players[name]["props"].update(changed)
+            self.notify(name)
+        elif message.member == "Seeked":
+            name = self.owners.get(message.sender)
+            if name is not None:
+                self.set_position(name, message.body[0])
+                self.notify(name)
+
+    def set_position(self, name, position):
+        player = self.players[name]
+        player["props"]["Position"] = position
+        player["position_time"] = time.monotonic()
+
+    async def add_player_safe(self, bus_name, owner):
+        try:
+            await self.add_player(bus_name, owner)
+        except RuntimeError:
+            pass
+
+    async def refresh_position(self, name):
+        # Position is never broadcast by PropertiesChanged, so read it back once
+        if name not in self.players:
+            return
+        try:
+            reply = await self.call(Message(
+                destination=MPRIS_PREFIX + name,
+                path=MPRIS_PATH,
+                interface=PROPS_IFACE,
+                member="Get",
+                signature="ss",
+                body=[PLAYER_IFACE, "Position"]
+            ))
+        except RuntimeError:
+            return
+        if name in self.players:
+            self.set_position(name, unpack(reply.body[0]))
+            self.notify(name)
+
+    def notify(self, name):
+        for listener in self.listeners:
+            listener(name, self.info(name))
+
+    def info(self, name):
+        player = self.players.get(name)
+        if player is None:
+            return None
+        props = player["props"]
+        status = str(props.get("PlaybackStatus", "Stopped")).lower()
+        position = props.get("Position", 0) / 1e6
+        return make_info(name, status, props.get("Metadata", {}), position,
+                         rate=props.get("Rate", 1.0), position_time=player["position_time"])
+
+    async def snapshot(self):
+        return {name: self.info(name) for name in self.players}
+
+    async def follow(self, on_update):
+        for name, info in (await self.snapshot()).items():
+            on_update(name, info)
+
+        self.listeners.append(on_update)
+        try:
+            # Periodically compare the extrapolation with the player's own Position
+            while True:
+                if RESYNC_INTERVAL > 0:
+                    await asyncio.sleep(RESYNC_INTERVAL)
+                    for name, player in list(self.players.items()):
+                        if player["props"].get("PlaybackStatus") == "Playing":
+                            await self.refresh_position(name)
+                else:
+                    await asyncio.Future()
+        finally:
+            self.listeners.remove(on_update)
+
+    async def command(self, player, command):
+        method = COMMANDS.get(command)
+        if method is None or player not in self.players:
+            return
+        try:
+            await self.call(Message(
+                destination=MPRIS_PREFIX + player,
+                path=MPRIS_PATH,
+                interface=PLAYER_IFACE,
+                member=method
+            ))
+        except RuntimeError:
+            pass
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import asyncio
+
+import tracing
+
+# Fields requested from `playerctl --follow`, one record per line.
+FOLLOW_FIELDS = [
+    "playerName", "lc(status)", "mpris:length", "position",
+    "xesam:artist", "xesam:title", "xesam:album", "mpris:artUrl",
+]
+FIELD_SEP = "\x1f"
+FOLLOW_FORMAT = FIELD_SEP.join("{{%s}}" % field for field in FOLLOW_FIELDS)
+FOLLOW_RESTART_DELAY = 2
+# Seconds between position re-reads that correct extrapolation drift (0 = never)
+RESYNC_INTERVAL = float(os.environ.get("MUSIC_POSITION_RESYNC", "30"))
+
+def make_info(player, status, metadata, position, rate=1.0, position_time=None):
+    artist = metadata.get('xesam:artist') or ['Unknown Artist']
+    if isinstance(artist, str):
+        artist = [artist]
+
+    try:
+        duration = float(metadata.get('mpris:length', 0)) / 1e6
+    except (TypeError, ValueError):
+        duration = 0
+
+    return {
+        'artist': artist[0],
+        'title': metadata.get('xesam:title') or 'Unknown Track',
+        'album': metadata.get('xesam:album') or 'Unknown Album',
+        'status': status,
+        'position': position,
+        'position_time': time.monotonic() if position_time is None else position_time,
+        'rate': rate,
+        'duration': duration,
+        'art_url': metadata.get('mpris:artUrl', ''),
+        'player': player
+    }
+
+def current_position(info, now=None):
+    # Extrapolate from the last reported (position, timestamp, rate, status)
+    position = info['position']
+    if info['status'] == 'playing':
+        if now is None:
+            now = time.monotonic()
+        position += (now - info['position_time']) * info['rate']
+    if info['duration'] > 0:
+        position = min(position, info['duration'])
+    return max(position, 0)
+
+def parse_follow_line(line):
+    # playerctl prints an empty line once the followed player goes away
+    fields = line.rstrip('\n').split(FIELD_SEP)
+    if len(fields) != len(FOLLOW_FIELDS) or not fields[0]:
+        return None
+
+    player, status, length, position, artist, title, album, art_url = fields
+    try:
+        position = float(position) / 1e6
+    except ValueError:
+        position = 0
+
+    metadata = {
+        'mpris:length': length or 0,
+        'xesam:artist': artist,
+        'xesam:title': title,
+        'xesam:album': album,
+        'mpris:artUrl': art_url,
+    }
+    return make_info(player, status, metadata, position)
+
+async def run_playerctl(*args):
+    tracing.count("spawn.playerctl")
+    proc = await asyncio.create_subprocess_exec(
+        "playerctl", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"playerctl {' '.join(args)} failed")
+    return stdout.decode().strip()
+
+class PlayerctlBackend:
+    name = "playerctl"
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def snapshot(self):
+        # One playerctl call reports every player at once
+        try:
+            with tracing.span("player.query"):
+                output = await run_playerctl("-a", "metadata", "--format", FOLLOW_FORMAT)
+        except (OSError, RuntimeError):
+            return {}
+
+        players = {}
+        for line in output.split('\n'):
+            info = parse_follow_line(line)
+            if info:
+                players[info['player']] = info
+        return players
+
+    async def resync(self, on_update):
+        # playerctl --follow never reports seeks; re-read every position at once
+        while RESYNC_INTERVAL > 0:
+            await asyncio.sleep(RESYNC_INTERVAL)
+            for player, info in (await self.snapshot()).items():
+                on_update(player, info)
+
+    async def follow(self, on_update):
+        resync = asyncio.ensure_future(self.resync(on_update))
+        try:
+            await self.follow_players(on_update)
+        finally:
+            resync.cancel()
+
+    async def follow_players(self, on_update):
+        while True:
+            known = set()
+            tracing.count("spawn.playerctl")
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "playerctl", "-a", "metadata", "--follow", "--format", FOLLOW_FORMAT,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+            except OSError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                await asyncio.sleep(FOLLOW_RESTART_DELAY)
+                continue
+
+            while True:
+                line = await proc.stdout.readline()
+                if not line:
+                    break
+                info = parse_follow_line(line.decode(errors='replace'))
+                if info:
+                    known.add(info['player'])
+                    on_update(info['player'], info)
+                    continue
+
+                # An empty record means some player went away; find out which
+                current = set(await self.snapshot())
+                for player in known - current:
+                    on_update(player, None)
+                known &= current
+
+            # playerctl exits when no player can be followed; retry later
+            await proc.wait()
+            for player in known:
+                on_update(player, None)
+            await asyncio.sleep(FOLLOW_RESTART_DELAY)
+
+    async def command(self, player, command):
+        try:
+            await run_playerctl("-p", player, command)
+        except (OSError, RuntimeError):
+            pass
+
+async def get_backend(name=None):
+    # MUSIC_BACKEND=auto|mpris|playerctl; auto prefers the in-process D-Bus client
+    name = name or os.environ.get("MUSIC_BACKEND", "auto")
+    if name in ("auto", "mpris"):
+        try:
+            from mpris import MprisBackend
+            backend = MprisBackend()
+            await backend.connect()
+            return backend
+        except ImportError:
+            if name == "mpris":
+                raise
+        except Exception as e:
+            if name == "mpris":
+                raise
+            print(f"MPRIS backend unavailable, using playerctl: {e}", file=sys.stderr)
+
+    backend = PlayerctlBackend()
+    await backend.connect()
+    return backend
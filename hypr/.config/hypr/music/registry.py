@@ -0,0 +1,79 @@
+import os
+import time
+import itertools
+
+# MUSIC_PLAYER_POLICY orders the criteria used to pick the displayed player,
+# MUSIC_PLAYER_PRIORITY lists preferred player names (e.g. "spotify,mpv").
+DEFAULT_POLICY = "status,preferred,recent"
+STATUS_RANK = {"playing": 0, "paused": 1}
+
+class PlayerRegistry:
+    def __init__(self, policy=DEFAULT_POLICY, preferred=()):
+        self.policy = [c.strip() for c in policy.split(",") if c.strip()]
+        self.preferred = list(preferred)
+        # player name -> last known info, shared by every module rendering it
+        self.states = {}
+        self.last_active = {}
+        self.order = {}
+        self.sequence = itertools.count()
+
+    @classmethod
+    def from_env(cls):
+        preferred = os.environ.get("MUSIC_PLAYER_PRIORITY", "")
+        return cls(
+            policy=os.environ.get("MUSIC_PLAYER_POLICY", DEFAULT_POLICY),
+            preferred=[p.strip() for p in preferred.split(",") if p.strip()]
+        )
+
+    def update(self, player, info):
+        if info is None:
+            self.remove(player)
+            return
+
+        old = self.states.get(player)
+        self.states[player] = info
+        if player not in self.order:
+            self.order[player] = next(self.sequence)
+        if old is None or info['status'] == "playing" and (
+                old['status'] != "playing" or old['title'] != info['title']):
+            self.last_active[player] = time.monotonic()
+
+    def remove(self, player):
+        self.states.pop(player, None)
+        self.last_active.pop(player, None)
+        self.order.pop(player, None)
+
+    def load(self, snapshot):
+        for player in list(self.states):
+            if player not in snapshot:
+                self.remove(player)
+        for player, info in snapshot.items():
+            self.update(player, info)
+
+    def preferred_rank(self, player):
+        # "firefox" also matches instance names like "firefox.instance1234"
+        for rank, name in enumerate(self.preferred):
+            if player == name or player.startswith(name + "."):
+                return rank
+        return len(self.preferred)
+
+    def rank(self, player):
+        key = []
+        for criterion in self.policy:
+            if criterion == "status":
+                key.append(STATUS_RANK.get(self.states[player]['status'], len(STATUS_RANK)))
+            elif criterion == "preferred":
+                key.append(self.preferred_rank(player))
+            elif criterion == "recent":
+                key.append(-self.last_active.get(player, 0))
+        key.append(self.order.get(player, 0))
+        return key
+
+    def select(self):
+        if not self.states:
+            return None
+        return min(self.states, key=self.rank)
+
+    def current(self):
+        player = self.select()
+        return self.states[player] if player else None
@@ -0,0 +1,103 @@
+import os
+import sys
+import fcntl
+import json
+import asyncio
+
+import tracing
+
+from client import SOCKET_PATH
+
+# Drop subscribers that stop reading instead of buffering for them forever
+MAX_PENDING = 64 * 1024
+
+class WidgetServer:
+    # Owns the single authoritative player state and fans pre-rendered module
+    # output out to every connected client.
+    def __init__(self, backend, registry, render, path=SOCKET_PATH):
+        self.backend = backend
+        self.registry = registry
+        self.render = render
+        self.path = path
+        self.outputs = render(None)
+        self.subscribers = {}
+
+    def on_update(self, player, info):
+        self.registry.update(player, info)
+        self.publish(self.registry.current())
+
+    def refresh(self):
+        self.publish(self.registry.current())
+
+    def publish(self, info):
+        with tracing.span("render"):
+            outputs = self.render(info)
+        for module, line in outputs.items():
+            if self.outputs.get(module) == line:
+                continue
+            self.outputs[module] = line
+            for writer in list(self.subscribers.get(module, ())):
+                self.send(module, writer, line)
+
+    def send(self, module, writer, line):
+        if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_PENDING:
+            self.subscribers[module].discard(writer)
+            writer.close()
+            return
+        writer.write(line.encode() + b"\n")
+
+    async def handle(self, reader, writer):
+        try:
+            request = (await reader.readline()).decode().split()
+            if len(request) != 2:
+                return
+            action, arg = request
+
+            if action == "cmd":
+                player = self.registry.select()
+                if player:
+                    await self.backend.command(player, arg)
+            elif action == "get":
+                if arg == "stats":
+                    line = json.dumps(tracing.snapshot())
+                else:
+                    line = self.outputs.get(arg, "")
+                writer.write(line.encode() + b"\n")
+                await writer.drain()
+            elif action == "watch":
+                subscribers = self.subscribers.setdefault(arg, set())
+                subscribers.add(writer)
+                try:
+                    writer.write(self.outputs.get(arg, "").encode() + b"\n")
+                    # Nothing more is read; EOF means the client went away
+                    await reader.read()
+                finally:
+                    subscribers.discard(writer)
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            writer.close()
+
+    def acquire_lock(self):
+        # Several bars may start a server at once; only one keeps running
+        self.lock = open(self.path + ".lock", "w")
+        try:
+            fcntl.flock(self.lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    async def run(self):
+        if not self.acquire_lock():
+            print("Music widget server already running", file=sys.stderr)
+            return
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        try:
+            async with server:
+                await self.backend.follow(self.on_update)
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
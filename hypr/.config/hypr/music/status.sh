@@ -1,14 +1,4 @@
 #!/bin/bash
 
-PLAYER="spotify"
-status=$(playerctl -p "$PLAYER" status 2>/dev/null | tr '[:upper:]' '[:lower:]')
-
-if [[ "$status" == "playing" ]]; then
-    icon="⏸"
-elif [[ "$status" == "paused" ]]; then
-    icon="▶"
-else
-    icon=""
-fi
-
-echo "{\"text\":\"$icon\",\"tooltip\":\"Toggle Play/Pause\"}"
+# Play/pause icon, streamed from the shared music widget server
+exec python3 "$(dirname "$0")/client.py" status
@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import shutil
+import asyncio
+import unittest
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dbus_next import Variant
+from dbus_next.aio import MessageBus
+from dbus_next.service import PropertyAccess, ServiceInterface, dbus_property, method, signal
+
+from mpris import MPRIS_PATH, PLAYER_IFACE, MprisBackend
+
+BUS_NAME = "org.mpris.MediaPlayer2.fake"
+TIMEOUT = 5
+
+class Player(ServiceInterface):
+    # The parts of org.mpris.MediaPlayer2.Player the backend reads
+    def __init__(self):
+        super().__init__(PLAYER_IFACE)
+        self.status = "Playing"
+        self.position = 5_000_000
+        self.calls = []
+
+    @dbus_property(access=PropertyAccess.READ)
+    def PlaybackStatus(self) -> "s":
+        return self.status
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Metadata(self) -> "a{sv}":
+        return {
+            "xesam:title": Variant("s", "Song"),
+            "xesam:artist": Variant("as", ["Artist"]),
+            "mpris:length": Variant("x", 300_000_000),
+        }
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Position(self) -> "x":
+        return self.position
+
+    @dbus_property(access=PropertyAccess.READ)
+    def Rate(self) -> "d":
+        return 1.0
+
+    @method()
+    def Next(self):
+        self.calls.append("Next")
+
+    @method()
+    def PlayPause(self):
+        self.calls.append("PlayPause")
+
+    @signal()
+    def Seeked(self) -> "x":
+        return self.position
+
+def start_bus():
+    # A private session bus, so the test never sees (or drives) real players
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return daemon, daemon.stdout.readline().strip()
+
+@unittest.skipUnless(shutil.which("dbus-daemon"), "needs dbus-daemon")
+class MprisBackendTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.daemon, address = start_bus()
+        self.addCleanup(self.daemon.wait)
+        self.addCleanup(self.daemon.terminate)
+
+        self.player = Player()
+        self.player_bus = await MessageBus(bus_address=address).connect()
+        self.player_bus.export(MPRIS_PATH, self.player)
+        await self.player_bus.request_name(BUS_NAME)
+
+        self.backend = MprisBackend(bus_address=address)
+        await self.backend.connect()
+        self.updates = []
+        self.backend.listeners.append(lambda name, info: self.updates.append((name, info)))
+
+    async def asyncTearDown(self):
+        await self.backend.close()
+        self.player_bus.disconnect()
+
+    async def wait_for(self, predicate):
+        deadline = time.monotonic() + TIMEOUT
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("timed out waiting for the backend")
+            await asyncio.sleep(0.01)
+
+    async def test_snapshot_from_get_all(self):
+        snapshot = await self.backend.snapshot()
+        self.assertEqual(list(snapshot), ["fake"])
+        info = snapshot["fake"]
+        self.assertEqual((info["title"], info["artist"], info["status"]), ("Song", "Artist", "playing"))
+        self.assertEqual(info["duration"], 300)
+        self.assertEqual(info["position"], 5)
+        self.assertEqual(self.backend.owners, {self.player_bus.unique_name: "fake"})
+
+    async def test_properties_changed_resyncs_position(self):
+        # Position is not part of the signal; the backend has to read it back
+        self.player.status = "Paused"
+        self.player.position = 42_000_000
+        self.player.emit_properties_changed({"PlaybackStatus": "Paused"})
+
+        await self.wait_for(lambda: self.backend.info("fake")["position"] == 42)
+        self.assertEqual(self.backend.info("fake")["status"], "paused")
+        self.assertEqual(self.updates[-1][0], "fake")
+
+    async def test_seeked_sets_position(self):
+        self.player.position = 120_000_000
+        self.player.Seeked()
+
+        await self.wait_for(lambda: self.backend.info("fake")["position"] == 120)
+        self.assertEqual(self.updates[-1][1]["position"], 120)
+
+    async def test_owner_leaving_removes_player(self):
+        self.player_bus.disconnect()
+
+        await self.wait_for(lambda: "fake" not in self.backend.players)
+        self.assertEqual(self.backend.owners, {})
+        self.assertEqual(self.updates[-1], ("fake", None))
+
+    async def test_command_dispatch(self):
+        await self.backend.command("fake", "next")
+        await self.backend.command("fake", "play-pause")
+        await self.backend.command("fake", "unknown")
+        await self.backend.command("missing", "next")
+        self.assertEqual(self.player.calls, ["Next", "PlayPause"])
+
+if __name__ == "__main__":
+    unittest.main()
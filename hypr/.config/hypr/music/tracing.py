@@ -0,0 +1 @@
+../hyprmoncon/src/tracing.py
\ No newline at end of file
@@ -1,93 +1,61 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import sys
 import json
-import subprocess
-from time import sleep
+import asyncio
 from PIL import Image
-import base64
-import tempfile
 
-def get_active_player():
-    try:
-        # Try multiple times to find the player
-        for _ in range(5):
-            players = subprocess.check_output(
-                ["playerctl", "-l"],
-                stderr=subprocess.PIPE
-            ).decode().strip().split('\n')
-            
-            if players and players[0]:
-                return players[0]
-            
-            sleep(0.5)
-        
-        return None
-    except:
-        return None
-
-def get_player_info(player):
-    try:
-        if not player:
-            return None
-
-        metadata = subprocess.check_output(
-            ["playerctl", "-p", player, "metadata", "--format", "json"],
-            stderr=subprocess.PIPE
-        ).decode().strip()
-        
-        if not metadata:
-            return None
-
-        metadata = json.loads(metadata)
-        status = subprocess.check_output(
-            ["playerctl", "-p", player, "status"],
-            stderr=subprocess.PIPE
-        ).decode().strip().lower()
-
-        # Get position and duration
-        try:
-            position = float(subprocess.check_output(
-                ["playerctl", "-p", player, "position"],
-                stderr=subprocess.PIPE
-            ))
-            duration = float(metadata.get('mpris:length', 0)) / 1e6
-        except:
-            position = 0
-            duration = 0
-
-        # Get album art
-        art_url = metadata.get('mpris:artUrl', '')
-        art_data = None
-
-        if art_url.startswith('file://'):
-            art_path = art_url[7:]
-            if os.path.exists(art_path):
-                try:
-                    with Image.open(art_path) as img:
-                        img.thumbnail((64, 64))
-                        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                            img.save(temp_file.name, 'PNG')
-                            with open(temp_file.name, 'rb') as f:
-                                art_data = base64.b64encode(f.read()).decode('utf-8')
-                            os.unlink(temp_file.name)
-                except Exception as e:
-                    print(f"Art error: {e}", file=sys.stderr)
-
-        return {
-            'artist': metadata.get('xesam:artist', ['Unknown Artist'])[0],
-            'title': metadata.get('xesam:title', 'Unknown Track'),
-            'album': metadata.get('xesam:album', 'Unknown Album'),
-            'status': status,
-            'position': position,
-            'duration': duration,
-            'art': art_data,
-            'player': player
-        }
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        return None
+import tracing
+from artcache import ArtCache
+from client import send_command
+from players import current_position, get_backend
+from registry import PlayerRegistry
+from server import WidgetServer
+
+# Seconds between progress re-renders in --follow/--serve mode
+PROGRESS_INTERVAL = float(os.environ.get("MUSIC_PROGRESS_INTERVAL", "1"))
+ART_SIZE = (64, 64)
+# MUSIC_ART_FORMAT=png|webp emits base64 image data, path emits a cached PNG file
+ART_FORMAT = os.environ.get("MUSIC_ART_FORMAT", "png")
+ART_ENCODINGS = {
+    "png": ("PNG", ".png"),
+    "webp": ("WEBP", ".webp"),
+    "path": ("PNG", ".png"),
+}
+
+def render_thumbnail(source, encoding="PNG"):
+    with Image.open(source) as img:
+        # Let the JPEG decoder downscale while decoding instead of after
+        img.draft("RGB", ART_SIZE)
+        img.thumbnail(ART_SIZE)
+        buffer = io.BytesIO()
+        img.save(buffer, encoding)
+    return buffer.getvalue()
+
+def make_art_cache(art_format):
+    encoding, suffix = ART_ENCODINGS.get(art_format, ART_ENCODINGS["png"])
+    return ArtCache(lambda source: render_thumbnail(source, encoding), suffix=suffix)
+
+art_cache = make_art_cache(ART_FORMAT)
+
+def get_art(art_url, block=False):
+    if ART_FORMAT == "path":
+        return art_cache.get_path(art_url, block)
+    return art_cache.get(art_url, block)
+
+def lookup_art(art_url):
+    # The widget's art field and the art module's file from one cache lookup
+    entry = art_cache.lookup_file(art_url)
+    if entry is None:
+        return None, ''
+    path, data = entry
+    return (path if ART_FORMAT == "path" else data), path
+
+def on_art_ready(loop, callback):
+    # Downloads finish on the cache's worker thread; re-render on the loop
+    art_cache.on_ready = lambda: loop.call_soon_threadsafe(callback)
 
 def format_output(info):
     if not info:
@@ -98,7 +66,9 @@ def format_output(info):
             'percentage': 0
         })
 
-    progress = (info['position'] / info['duration']) * 100 if info['duration'] > 0 else 0
+    progress = (current_position(info) / info['duration']) * 100 if info['duration'] > 0 else 0
+    # Rounded so extrapolated ticks only emit when the bar visibly moves
+    progress = round(progress, 1)
     text = f"{info['artist']} - {info['title']}"
 
     output = {
@@ -114,18 +84,145 @@ def format_output(info):
 
     return json.dumps(output)
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        # Handle control commands
-        command = sys.argv[1]
-        player = get_active_player()
-        if player:
-            try:
-                subprocess.run(["playerctl", "-p", player, command], check=True)
-            except:
-                pass
+def format_text(info):
+    if not info or info['status'] not in ("playing", "paused"):
+        return json.dumps({'text': 'No music', 'tooltip': 'No music playing'})
+    text = f"{info['artist']} - {info['title']}"
+    return json.dumps({'text': text, 'tooltip': text})
+
+def format_status(info):
+    icons = {'playing': '⏸', 'paused': '▶'}
+    icon = icons.get(info['status'], '') if info else ''
+    return json.dumps({'text': icon, 'tooltip': 'Toggle Play/Pause'})
+
+def format_buttons(info):
+    if not info or info['status'] not in ("playing", "paused"):
+        text = 'No music'
+        return json.dumps({'text': text, 'alt': 'stopped', 'class': 'stopped', 'tooltip': text})
+
+    text = f"{info['artist']} - {info['title']}"
+    play_pause_icon = '⏸' if info['status'] == 'playing' else '▶'
+    return json.dumps({
+        'text': text,
+        'alt': info['status'],
+        'class': info['status'],
+        'tooltip': text,
+        'buttons': [
+            {'identifier': 'prev', 'label': '⏮'},
+            {'identifier': 'play', 'label': play_pause_icon},
+            {'identifier': 'next', 'label': '⏭'}
+        ]
+    })
+
+def format_progress(info):
+    if not info or info['status'] not in ("playing", "paused"):
+        return json.dumps({'text': 'No music', 'class': 'stopped'})
+
+    pos_s = round(current_position(info))
+    len_s = int(info['duration'])
+    return json.dumps({
+        'text': f"{info['artist']} - {info['title']}",
+        'alt': info['status'].capitalize(),
+        'tooltip': f"{pos_s}s / {len_s}s",
+        'class': info['status'].capitalize(),
+        'progress': 100 * pos_s // len_s if len_s else 0
+    })
+
+def render_modules(info):
+    # Every waybar module's output for one player state, rendered once
+    if info:
+        art, art_path = lookup_art(info['art_url'])
+        info = dict(info, art=art)
     else:
-        # Output current status
-        player = get_active_player()
-        info = get_player_info(player)
-        print(format_output(info))
\ No newline at end of file
+        art_path = ''
+
+    return {
+        'widget': format_output(info),
+        'text': format_text(info),
+        'status': format_status(info),
+        'buttons': format_buttons(info),
+        'progress': format_progress(info),
+        'art': art_path,
+    }
+
+async def tick(publish):
+    # Progress is extrapolated locally, so re-rendering costs no player queries
+    while PROGRESS_INTERVAL > 0:
+        await asyncio.sleep(PROGRESS_INTERVAL)
+        publish()
+
+async def follow(backend, registry):
+    last_output = None
+
+    def publish():
+        nonlocal last_output
+        info = registry.current()
+        if info:
+            info['art'] = get_art(info['art_url'])
+
+        output = format_output(info)
+        if output != last_output:
+            print(output, flush=True)
+            last_output = output
+
+    def on_update(player, info):
+        registry.update(player, info)
+        publish()
+
+    on_art_ready(asyncio.get_running_loop(), publish)
+    ticker = asyncio.ensure_future(tick(publish))
+    try:
+        await backend.follow(on_update)
+    finally:
+        ticker.cancel()
+
+async def main(args):
+    # Let a running server execute control commands on its open connection
+    if args and not args[0].startswith("--") and send_command(args[0]):
+        return
+
+    backend = await get_backend()
+    registry = PlayerRegistry.from_env()
+    try:
+        if args and args[0] == "--follow":
+            await follow(backend, registry)
+            return
+        if args and args[0] == "--serve":
+            server = WidgetServer(backend, registry, render_modules)
+            on_art_ready(asyncio.get_running_loop(), server.refresh)
+            ticker = asyncio.ensure_future(tick(server.refresh))
+            try:
+                await server.run()
+            finally:
+                ticker.cancel()
+            return
+
+        registry.load(await backend.snapshot())
+        if args and args[0] == "--art-path":
+            # Thumbnail path for consumers that take files (waybar image module)
+            info = registry.current()
+            path = art_cache.get_path(info['art_url'], block=True) if info else None
+            if not path:
+                sys.exit(1)
+            print(path)
+        elif args:
+            # Handle control commands
+            player = registry.select()
+            if player:
+                await backend.command(player, args[0])
+        else:
+            # Output current status
+            info = registry.current()
+            if info:
+                # A one-shot run has nothing to re-render later, so it waits
+                info['art'] = get_art(info['art_url'], block=True)
+            print(format_output(info))
+    finally:
+        await backend.close()
+
+if __name__ == "__main__":
+    tracing.TOOL = "music"
+    try:
+        asyncio.run(main(sys.argv[1:]))
+    except KeyboardInterrupt:
+        pass